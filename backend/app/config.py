@@ -9,6 +9,20 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = "sqlite:///./myvco.db"
+    async_database_url: str = ""  # Empty = database_url with its async driver (aiosqlite / asyncpg)
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    
+    # SQLite profile (see database.py); applied to every new connection
+    sqlite_tuning: bool = True  # False = bare engine with SQLite defaults
+    sqlite_wal: bool = True
+    sqlite_synchronous: str = "NORMAL"  # Durable with WAL except on power loss; FULL syncs every commit
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size_mb: int = 256
+    sqlite_cache_size_mb: int = 64
+    sqlite_foreign_keys: bool = True
+    # Commits from streaming generators go through one writer thread (see services/db_writer.py)
+    db_single_writer: bool = True
     
     # CORS - will be parsed from comma-separated string
     cors_origins: str = "http://localhost:5173,http://localhost:3000"
@@ -19,6 +33,116 @@ class Settings(BaseSettings):
     default_llm_provider: str = "gemini"
     default_model: str = "gemini-2.0-flash"
     
+    # Ollama HTTP connection pool (shared client, see services/http_pool.py)
+    ollama_http2: bool = True
+    ollama_max_connections: int = 20
+    ollama_max_keepalive_connections: int = 10
+    ollama_keepalive_expiry: float = 60.0
+    ollama_connect_timeout: float = 10.0
+    ollama_read_timeout: float = 120.0
+    ollama_pool_timeout: float = 30.0
+    ollama_client_retire_grace: float = 600.0  # Max wait for in-flight streams before closing a swapped-out client
+    
+    # Cached Ollama model catalog (see services/model_catalog.py)
+    ollama_catalog_ttl: int = 60
+    ollama_catalog_refresh_interval: int = 60
+    ollama_catalog_cold_wait: float = 3.0
+    ollama_catalog_timeout: float = 10.0
+
+    # LLM concurrency scheduler (see services/llm_scheduler.py); 0 = unlimited
+    llm_concurrency_default: int = 4
+    llm_concurrency_gemini: int = 8
+    llm_concurrency_ollama: int = 2  # A single GPU slows down once oversubscribed
+    llm_concurrency_mock: int = 0
+    llm_model_concurrency: str = ""  # e.g. "ollama/llama3:70b=1,gemini/gemini-2.5-pro=4"
+    llm_scheduler_background_max_wait: float = 30.0  # Then background work competes as interactive
+    llm_scheduler_poll_interval: float = 1.0
+
+    # Retries, failover, hedging and circuit breakers (see services/llm_resilience.py)
+    llm_retry_attempts: int = 2  # Extra attempts per provider, only before the first token
+    llm_retry_base_delay: float = 0.5
+    llm_retry_max_delay: float = 8.0
+    llm_fallback_provider: str = ""  # Global fallback when a participant has none
+    llm_fallback_model: str = ""
+    llm_hedge_after_ms: int = 0  # 0 disables hedged requests
+    llm_breaker_failure_threshold: int = 5
+    llm_breaker_cooldown: float = 30.0
+
+    # Streaming telemetry (see services/stream_telemetry.py)
+    stream_stall_seconds: float = 15.0  # A gap this long between chunks marks the stream as stalled
+    stream_telemetry_window: int = 500  # Samples kept per provider/model for percentiles
+    stream_telemetry_recent: int = 200
+
+    # Background generation jobs (see services/generation_jobs.py)
+    generation_job_ttl: int = 900  # Seconds a finished job stays available for re-attaching
+    generation_job_buffer_chars: int = 1_000_000  # Per job; older events are dropped beyond this
+    generation_job_buffer_events: int = 20000
+
+    # Server-Sent Events / WebSocket transport (see services/sse.py)
+    sse_heartbeat_seconds: float = 15.0  # Below common proxy idle timeouts
+    sse_retry_ms: int = 3000
+
+    # Live meeting updates (see services/meeting_events.py)
+    meeting_events_queue_size: int = 1000  # Per subscriber; overflowing clients get a fresh snapshot
+    meeting_events_replay: int = 500  # Durable events kept for reconnecting clients
+    meeting_events_snapshot_messages: int = 50
+    meeting_events_idle_seconds: int = 300  # Channels nobody listens to are dropped after this long without events
+
+    # Exact-match LLM response cache (see services/response_cache.py)
+    llm_cache_enabled: bool = True
+    llm_cache_max_entries: int = 256
+    llm_cache_disk_dir: str = ""  # Empty disables the on-disk tier
+    llm_cache_disk_size_mb: int = 256
+    llm_cache_ttl_default: int = 3600
+    llm_cache_ttl_gemini: int = 3600
+    llm_cache_ttl_ollama: int = 3600
+    llm_cache_ttl_mock: int = 0  # Never cache mock replies, load tests must exercise the full path
+    
+    # Image preprocessing for LLM requests (see services/image_pipeline.py)
+    image_max_dim_gemini: int = 2048
+    image_max_dim_ollama: int = 1024
+    image_jpeg_quality: int = 85
+    image_cache_max_mb: int = 128
+    image_pipeline_workers: int = 4
+    
+    # Token counting (see services/token_counter.py)
+    token_counter_use_tiktoken: bool = True
+    token_counter_cache_size: int = 4096
+    image_tokens_ollama: int = 576
+    
+    # Offline mock LLM provider for load and latency tests (see services/mock_provider.py)
+    mock_llm_enabled: bool = False
+    mock_llm_ttft_ms: float = 300.0
+    mock_llm_tokens_per_second: float = 40.0
+    mock_llm_chunk_tokens: int = 4
+    mock_llm_reply_tokens: int = 120
+    mock_llm_error_rate: float = 0.0
+    mock_llm_seed: int = 0
+    mock_llm_script_path: str = ""  # JSON list of replies and/or {"match": regex, "reply": text}
+    mock_llm_autonomous_turns: int = 4
+    autonomous_llm_provider: str = "gemini"  # "mock" runs autonomous sessions offline
+
+    # Model context limit memo (see services/model_limits.py)
+    model_limit_refresh_seconds: int = 86400
+    model_limit_warmup: bool = True
+
+    # Token-budgeted context packing (see services/context_packer.py)
+    context_reserved_output_tokens: int = 2048
+    context_block_priority: str = "personality,personal_instructions,expertise,company_context,meeting_context,knowledge_base"
+    context_history_max_messages: int = 200
+
+    # Per-meeting ring buffer of the newest context_history_max_messages (see services/meeting_context.py)
+    meeting_context_cache_enabled: bool = True
+    meeting_context_cache_max_meetings: int = 256
+    meeting_context_cache_max_mb: int = 64
+
+    # Resolved static prompt blocks per staff member (see services/prompt_cache.py)
+    prompt_cache_enabled: bool = True
+    prompt_cache_max_entries: int = 1000
+    # Preview results reusable by the confirmed send (see services/prompt_assembly.py)
+    prompt_handle_ttl_seconds: int = 300
+    prompt_handle_max_entries: int = 500
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -1,17 +1,77 @@
 # backend\app\database.py
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from .config import settings
 
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record=None):
+    """Per-connection SQLite profile (see the SQLite group in config.py)"""
+    cursor = dbapi_connection.cursor()
+    try:
+        if settings.sqlite_wal:
+            cursor.execute("PRAGMA journal_mode=WAL")  # Readers no longer block the writer
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size_mb) * 1024 * 1024}")
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.sqlite_cache_size_mb) * 1024}")  # Negative = KiB
+        cursor.execute(f"PRAGMA foreign_keys={'ON' if settings.sqlite_foreign_keys else 'OFF'}")
+    finally:
+        cursor.close()
+
+
+def make_engine(url: str, tuned: bool = True) -> Engine:
+    """Engine for `url`; file-based SQLite gets the tuned pragmas and pool sizes"""
+    if not url.startswith("sqlite"):
+        return create_engine(url, pool_size=settings.db_pool_size, max_overflow=settings.db_max_overflow)
+
+    options = {"connect_args": {"check_same_thread": False}}  # Needed for SQLite
+    in_memory = url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in url
+    if tuned and not in_memory:
+        options.update(pool_size=settings.db_pool_size, max_overflow=settings.db_max_overflow)
+    engine = create_engine(url, **options)
+    if tuned:
+        event.listen(engine, "connect", apply_sqlite_pragmas)
+    return engine
+
+
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def async_url(url: str) -> str:
+    """Async driver URL for a sync one: sqlite -> aiosqlite, postgresql -> asyncpg"""
+    scheme, sep, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme.split('+')[0], scheme)}{sep}{rest}"
+
+
+def make_async_engine(url: str, tuned: bool = True) -> AsyncEngine:
+    """Async counterpart of make_engine, same pragmas and pool sizes"""
+    if not url.startswith("sqlite"):
+        return create_async_engine(url, pool_size=settings.db_pool_size, max_overflow=settings.db_max_overflow)
+    options = {}
+    if tuned and url not in ("sqlite+aiosqlite://", "sqlite+aiosqlite:///:memory:"):
+        # aiosqlite defaults to NullPool; keep connections (and their pragmas) around instead
+        options.update(
+            poolclass=AsyncAdaptedQueuePool, pool_size=settings.db_pool_size, max_overflow=settings.db_max_overflow
+        )
+    async_engine = create_async_engine(url, **options)
+    if tuned:
+        event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+    return async_engine
+
+
 # Create SQLite engine
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False}  # Needed for SQLite
+engine = make_engine(settings.database_url, tuned=settings.sqlite_tuning)
+async_engine = make_async_engine(
+    settings.async_database_url or async_url(settings.database_url), tuned=settings.sqlite_tuning
 )
 
-# Create session factory
+# Create session factories; async sessions keep attributes after commit (no implicit IO on access)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 # Base class for models
 Base = declarative_base()
@@ -26,7 +86,15 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """Dependency for async routes: queries await the driver instead of blocking the event loop"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db():
-    """Initialize database tables"""
-    Base.metadata.create_all(bind=engine)
+    """Initialize database tables and apply pending migrations"""
+    from .migrations import run_migrations
 
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
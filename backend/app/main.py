@@ -1,10 +1,19 @@
 # backend\app\main.py
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 from .config import settings
-from .database import init_db
+from .database import init_db, async_engine
+from .services.http_pool import http_client_pool
+from .services.llm_service import llm_service
+from .services.model_catalog import ollama_model_catalog
+from .services.generation_jobs import generation_jobs
+from .services.db_writer import db_writer
+from .services.meeting_events import meeting_events
+from .services.token_counter import token_counter
 from .routers import (
     companies_router,
     departments_router,
@@ -16,13 +25,39 @@ from .routers import (
     assets_router,
     library as library_router,
     system as system_router,
+    jobs_router,
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize database and shared HTTP clients on startup, release them on shutdown"""
+    init_db()
+    await http_client_pool.startup()
+    ollama_model_catalog.start()
+    meeting_events.start()
+    # Load tokenizer vocabularies off the event loop; counts use the estimator until they are ready
+    tokenizer_warmup = asyncio.create_task(asyncio.to_thread(token_counter.warm))
+    # Prefetch model context limits in the background so the first preview does not wait on providers
+    warmup = asyncio.create_task(llm_service.warmup_model_limits()) if settings.model_limit_warmup else None
+    yield
+    if warmup is not None and not warmup.done():
+        warmup.cancel()
+    if not tokenizer_warmup.done():
+        tokenizer_warmup.cancel()
+    await generation_jobs.aclose()
+    db_writer.shutdown()
+    await ollama_model_catalog.aclose()
+    await http_client_pool.aclose()
+    await async_engine.dispose()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="MyVCO API",
     description="My Virtual Company - AI-powered virtual company management",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -32,6 +67,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Has-More", "X-Total-Count"],
 )
 
 # Create uploads directory if it doesn't exist
@@ -52,12 +88,7 @@ app.include_router(settings_router.router)
 app.include_router(assets_router)
 app.include_router(library_router.router)
 app.include_router(system_router.router)
-
-
-@app.on_event("startup")
-def startup_event():
-    """Initialize database on startup"""
-    init_db()
+app.include_router(jobs_router)
 
 
 @app.get("/")
@@ -0,0 +1,167 @@
+# backend\app\migrations.py
+"""
+Versioned schema migrations, applied at startup after create_all.
+
+New databases get every table, column and index from the models, so the steps only
+matter for databases created by older versions. Each step is idempotent (guarded by
+PRAGMA checks / IF NOT EXISTS) and recorded in schema_migrations; PRAGMA user_version
+holds the latest applied version so the startup check is a single pragma read.
+"""
+from datetime import datetime
+from typing import Callable, List, Tuple
+from sqlalchemy.engine import Connection, Engine
+
+
+def _columns(conn: Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})")]
+
+
+def _add_column(conn: Connection, table: str, column: str, ddl: str):
+    if column not in _columns(conn, table):
+        conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+
+
+def participant_fallback(conn: Connection):
+    _add_column(conn, "meeting_participants", "fallback_provider", "VARCHAR(50)")
+    _add_column(conn, "meeting_participants", "fallback_model", "VARCHAR(100)")
+
+
+def library_category_and_staff_knowledge(conn: Connection):
+    _add_column(conn, "library_items", "category", "VARCHAR(50) DEFAULT 'manifesto'")
+    _add_column(conn, "staff", "knowledge_base", "TEXT")
+
+
+def message_truncated_and_updated_at(conn: Connection):
+    _add_column(conn, "meeting_messages", "truncated", "BOOLEAN DEFAULT 0")
+    _add_column(conn, "meeting_messages", "updated_at", "DATETIME")
+
+
+def composite_indexes(conn: Connection):
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_meeting_messages_meeting_created ON meeting_messages (meeting_id, created_at)"
+    )
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_meeting_images_meeting_order ON meeting_images (meeting_id, display_order)"
+    )
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_company_assets_company_name ON company_assets (company_id, asset_name)"
+    )
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_knowledge_company_created ON knowledge (company_id, created_at)"
+    )
+
+
+def unique_model_limits(conn: Connection):
+    # Keep the most recently written row of any duplicates before enforcing uniqueness
+    conn.exec_driver_sql(
+        "DELETE FROM llm_model_limits WHERE id NOT IN "
+        "(SELECT MAX(id) FROM llm_model_limits GROUP BY provider, model_name)"
+    )
+    conn.exec_driver_sql(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_llm_model_limits_provider_model "
+        "ON llm_model_limits (provider, model_name)"
+    )
+
+
+def staff_companies(conn: Connection):
+    # Staff used to belong to one company via staff.company_id; move those links into
+    # company_staff (create_all made it empty) and rebuild staff without the column
+    conn.exec_driver_sql(
+        "CREATE TABLE IF NOT EXISTS company_staff (company_id INTEGER NOT NULL, staff_id INTEGER NOT NULL, "
+        "PRIMARY KEY (company_id, staff_id), "
+        "FOREIGN KEY(company_id) REFERENCES companies (id), FOREIGN KEY(staff_id) REFERENCES staff (id))"
+    )
+    columns = list(conn.exec_driver_sql("PRAGMA table_info(staff)"))
+    if "company_id" not in [row[1] for row in columns]:
+        return
+    conn.exec_driver_sql(
+        "INSERT OR IGNORE INTO company_staff (company_id, staff_id) "
+        "SELECT company_id, id FROM staff WHERE company_id IS NOT NULL"
+    )
+
+    # SQLite cannot drop a column used by a foreign key, so copy into a table built from
+    # the current definition (keeping columns added by earlier steps) minus company_id
+    definitions, kept = [], []
+    for _, name, type_, notnull, default, pk in columns:
+        if name == "company_id":
+            continue
+        kept.append(name)
+        definition = f"{name} {type_}".strip()
+        if pk:
+            definition += " NOT NULL PRIMARY KEY"
+        elif notnull:
+            definition += " NOT NULL"
+        if default is not None:
+            definition += f" DEFAULT {default}"
+        definitions.append(definition)
+    for _, _, table, column, target, *_ in conn.exec_driver_sql("PRAGMA foreign_key_list(staff)"):
+        if column != "company_id":
+            definitions.append(f"FOREIGN KEY({column}) REFERENCES {table} ({target})")
+    indexes = [
+        row[0] for row in conn.exec_driver_sql(
+            "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'staff' AND sql IS NOT NULL"
+        )
+        if "company_id" not in row[0]
+    ]
+
+    names = ", ".join(kept)
+    conn.exec_driver_sql(f"CREATE TABLE staff_new ({', '.join(definitions)})")
+    conn.exec_driver_sql(f"INSERT INTO staff_new ({names}) SELECT {names} FROM staff")
+    conn.exec_driver_sql("DROP TABLE staff")
+    conn.exec_driver_sql("ALTER TABLE staff_new RENAME TO staff")
+    for index in indexes:
+        conn.exec_driver_sql(index)
+
+
+# (version, name, step) - append only; never renumber released steps
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "participant_fallback", participant_fallback),
+    (2, "library_category_and_staff_knowledge", library_category_and_staff_knowledge),
+    (3, "message_truncated_and_updated_at", message_truncated_and_updated_at),
+    (4, "composite_indexes", composite_indexes),
+    (5, "unique_model_limits", unique_model_limits),
+    (6, "staff_companies", staff_companies),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def run_migrations(engine: Engine) -> List[int]:
+    """Apply pending steps in order; returns the versions applied"""
+    with engine.connect() as conn:
+        if conn.exec_driver_sql("PRAGMA user_version").scalar() >= LATEST_VERSION:
+            return []
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE IF NOT EXISTS schema_migrations "
+            "(version INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL, applied_at DATETIME NOT NULL)"
+        )
+        done = {row[0] for row in conn.exec_driver_sql("SELECT version FROM schema_migrations")}
+
+    applied = []
+    with engine.connect() as conn:
+        # Table rebuilds drop tables other rows point at; SQLite only lets foreign key
+        # enforcement be switched off outside a transaction, so do it before the steps
+        foreign_keys = conn.exec_driver_sql("PRAGMA foreign_keys").scalar()
+        conn.exec_driver_sql("PRAGMA foreign_keys = OFF")
+        conn.commit()
+        try:
+            for version, name, step in MIGRATIONS:
+                if version in done:
+                    continue
+                with conn.begin():
+                    step(conn)
+                    conn.exec_driver_sql(
+                        "INSERT INTO schema_migrations (version, name, applied_at) VALUES (?, ?, ?)",
+                        (version, name, datetime.utcnow()),
+                    )
+                applied.append(version)
+                print(f"Applied migration {version}: {name}")
+        finally:
+            conn.exec_driver_sql(f"PRAGMA foreign_keys = {foreign_keys}")
+            conn.commit()
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"PRAGMA user_version = {LATEST_VERSION}")
+    return applied
@@ -1,5 +1,5 @@
 # backend\app\models\company_asset.py
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..database import Base
@@ -8,6 +8,7 @@ from ..database import Base
 class CompanyAsset(Base):
     """CompanyAsset model - stores company-wide reusable assets (images, files, etc.)"""
     __tablename__ = "company_assets"
+    __table_args__ = (Index("ix_company_assets_company_name", "company_id", "asset_name"),)
     
     id = Column(Integer, primary_key=True, index=True)
     company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
@@ -1,5 +1,5 @@
 # backend\app\models\knowledge.py
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..database import Base
@@ -8,6 +8,7 @@ from ..database import Base
 class Knowledge(Base):
     """Knowledge model - stores company knowledge base entries"""
     __tablename__ = "knowledge"
+    __table_args__ = (Index("ix_knowledge_company_created", "company_id", "created_at"),)
     
     id = Column(Integer, primary_key=True, index=True)
     company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
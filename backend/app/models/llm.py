@@ -1,9 +1,10 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index
 from sqlalchemy.sql import func
 from ..database import Base
 
 class LlmModelLimit(Base):
     __tablename__ = "llm_model_limits"
+    __table_args__ = (Index("uq_llm_model_limits_provider_model", "provider", "model_name", unique=True),)
 
     id = Column(Integer, primary_key=True, index=True)
     provider = Column(String(50), index=True, nullable=False)
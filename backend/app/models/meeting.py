@@ -1,5 +1,5 @@
 # backend\app\models\meeting.py
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..database import Base
@@ -37,6 +37,9 @@ class MeetingParticipant(Base):
     # Dynamic LLM Configuration for this specific meeting
     llm_provider = Column(String(50), default="gemini")
     llm_model = Column(String(100), nullable=True)
+    # Used when the primary provider fails before answering
+    fallback_provider = Column(String(50), nullable=True)
+    fallback_model = Column(String(100), nullable=True)
     
     # Context settings (personality, knowledge, history, etc.)
     # Default: everything enabled
@@ -58,6 +61,7 @@ class MeetingParticipant(Base):
 class MeetingMessage(Base):
     """MeetingMessage model - stores conversation messages"""
     __tablename__ = "meeting_messages"
+    __table_args__ = (Index("ix_meeting_messages_meeting_created", "meeting_id", "created_at"),)
     
     id = Column(Integer, primary_key=True, index=True)
     meeting_id = Column(Integer, ForeignKey("meetings.id"), nullable=False)
@@ -66,7 +70,9 @@ class MeetingMessage(Base):
     sender_name = Column(String(255))
     content = Column(Text, nullable=False)
     image_url = Column(String(500))
+    truncated = Column(Boolean, default=False)  # Generation stopped early (client disconnected)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=True, onupdate=datetime.utcnow)  # NULL until edited
     
     meeting = relationship("Meeting", back_populates="messages")
 
@@ -74,6 +80,7 @@ class MeetingMessage(Base):
 class MeetingImage(Base):
     """MeetingImage model - stores images uploaded in meetings"""
     __tablename__ = "meeting_images"
+    __table_args__ = (Index("ix_meeting_images_meeting_order", "meeting_id", "display_order"),)
     
     id = Column(Integer, primary_key=True, index=True)
     meeting_id = Column(Integer, ForeignKey("meetings.id"), nullable=False)
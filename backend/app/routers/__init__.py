@@ -9,6 +9,7 @@ from .llm import router as llm_router
 from .assets import router as assets_router
 from .library import router as library_router
 from .system import router as system_router
+from .jobs import router as jobs_router
 
 __all__ = [
     "companies_router",
@@ -19,5 +20,6 @@ __all__ = [
     "llm_router",
     "assets_router",
     "library_router",
-    "system_router"
+    "system_router",
+    "jobs_router",
 ]
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List
 from ..database import get_db
-from ..models import Company
+from ..models import Company, Department, MeetingMessage, MeetingParticipant, Staff
 from .. import schemas
 
 router = APIRouter(prefix="/companies", tags=["companies"])
@@ -66,6 +66,25 @@ def delete_company(company_id: int, db: Session = Depends(get_db)):
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
     
+    # Departments cascade to their staff. Staff who also work for another company only lose
+    # the department; the rest go, and their rows in other companies' meetings are unlinked
+    department_staff = db.query(Staff.id).filter(
+        Staff.department_id.in_(db.query(Department.id).filter(Department.company_id == company_id))
+    )
+    shared_ids = [row[0] for row in department_staff.filter(Staff.companies.any(Company.id != company_id))]
+    removed_ids = [row[0] for row in department_staff if row[0] not in shared_ids]
+    if shared_ids:
+        db.query(Staff).filter(Staff.id.in_(shared_ids)).update(
+            {Staff.department_id: None}, synchronize_session=False
+        )
+    if removed_ids:
+        db.query(MeetingMessage).filter(MeetingMessage.staff_id.in_(removed_ids)).update(
+            {MeetingMessage.staff_id: None}, synchronize_session=False
+        )
+        db.query(MeetingParticipant).filter(MeetingParticipant.staff_id.in_(removed_ids)).delete(
+            synchronize_session=False
+        )
+
     db.delete(company)
     db.commit()
     return {"message": "Company deleted successfully"}
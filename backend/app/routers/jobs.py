@@ -0,0 +1,103 @@
+# backend\app\routers\jobs.py
+import json
+from contextlib import aclosing
+from fastapi import APIRouter, Header, HTTPException, WebSocket, WebSocketDisconnect
+from typing import Optional
+from ..config import settings
+from ..services.generation_jobs import generation_jobs, JobBufferExpired
+from ..services.stream_guard import DisconnectAwareStreamingResponse
+from ..services.sse import HEARTBEAT, event_name, job_sse_response, parse_last_event_id, with_heartbeats
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+def get_job_or_404(job_id: str):
+    job = generation_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
+
+
+def check_resumable(job, after: int):
+    if after + 1 < job.first_seq:
+        raise HTTPException(
+            status_code=410,
+            detail=f"Events before seq {job.first_seq} are no longer buffered; saved messages: {job.message_ids}",
+        )
+
+
+@router.get("")
+def list_jobs(meeting_id: Optional[int] = None):
+    return [job.to_dict() for job in generation_jobs.list(meeting_id)]
+
+
+@router.get("/{job_id}")
+def get_job(job_id: str):
+    return get_job_or_404(job_id).to_dict()
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(job_id: str, after: int = 0):
+    """
+    NDJSON events with seq > after, live until the job finishes. Re-attach with the last
+    seq you saw; disconnecting only ends this subscription, never the job.
+    """
+    job = get_job_or_404(job_id)
+    check_resumable(job, after)
+
+    async def generate_events():
+        try:
+            async for event in job.events(after):
+                yield json.dumps(event) + "\n"
+        except JobBufferExpired as e:
+            # This subscriber fell behind the bounded buffer
+            yield json.dumps({"type": "expired", "first_seq": e.first_seq}) + "\n"
+
+    return DisconnectAwareStreamingResponse(generate_events(), media_type="application/x-ndjson")
+
+
+@router.get("/{job_id}/sse")
+async def stream_job_sse(
+    job_id: str,
+    last_event_id: Optional[str] = None,
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
+    """
+    Server-Sent Events for a job: speaker_start, token, speaker_end, usage, queue and error
+    events whose id is the job seq. EventSource reconnects resume from Last-Event-ID;
+    comment heartbeats keep idle proxies from closing slow streams.
+    """
+    job = get_job_or_404(job_id)
+    after = parse_last_event_id(last_event_id_header or last_event_id)
+    check_resumable(job, after)
+    return job_sse_response(job, after)
+
+
+@router.websocket("/{job_id}/ws")
+async def stream_job_websocket(websocket: WebSocket, job_id: str, last_event_id: int = 0):
+    """Same events as /sse as JSON messages ({"id", "event", "data"}); resume with ?last_event_id="""
+    await websocket.accept()
+    job = generation_jobs.get(job_id)
+    if job is None or last_event_id + 1 < job.first_seq:
+        await websocket.send_json({"event": "error", "data": {"type": "expired", "job_id": job_id}})
+        await websocket.close(code=4404 if job is None else 4410)
+        return
+    try:
+        async with aclosing(with_heartbeats(job.events(last_event_id), settings.sse_heartbeat_seconds)) as events:
+            async for event in events:
+                if event is HEARTBEAT:
+                    await websocket.send_json({"event": "heartbeat"})
+                else:
+                    await websocket.send_json({"id": event["seq"], "event": event_name(event), "data": event})
+    except JobBufferExpired as e:
+        await websocket.send_json({"event": "error", "data": {"type": "expired", "first_seq": e.first_seq}})
+    except WebSocketDisconnect:
+        return
+    await websocket.close()
+
+
+@router.delete("/{job_id}")
+def cancel_job(job_id: str):
+    """Stop a running job; partial answers are saved as truncated"""
+    job = get_job_or_404(job_id)
+    return {"cancelled": generation_jobs.cancel(job), "job": job.to_dict()}
@@ -1,16 +1,26 @@
 # backend\app\routers\knowledge.py
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
+import asyncio
 import io
 from pypdf import PdfReader
-from ..database import get_db
+from ..database import get_db, get_async_db
 from ..models import Knowledge, Company
 from .. import schemas
 
 router = APIRouter(prefix="/knowledge", tags=["knowledge"])
 
 
+def extract_pdf_text(pdf_bytes: bytes) -> str:
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+    extracted_text = ""
+    for page in reader.pages:
+        extracted_text += page.extract_text() + "\n"
+    return extracted_text
+
+
 @router.post("/companies/{company_id}/knowledge", response_model=schemas.Knowledge)
 async def add_knowledge(
     company_id: int,
@@ -18,12 +28,12 @@ async def add_knowledge(
     content: Optional[str] = Form(None),
     source: Optional[str] = Form(None),
     file: Optional[UploadFile] = File(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Add knowledge entry (Supports Manual Text OR PDF File)"""
     
     # Verify company exists
-    company = db.query(Company).filter(Company.id == company_id).first()
+    company = await db.get(Company, company_id)
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
     
@@ -35,11 +45,8 @@ async def add_knowledge(
             try:
                 # Read PDF content
                 pdf_bytes = await file.read()
-                reader = PdfReader(io.BytesIO(pdf_bytes))
-                
-                extracted_text = ""
-                for page in reader.pages:
-                    extracted_text += page.extract_text() + "\n"
+                # Parsing is CPU-bound; keep it off the event loop
+                extracted_text = await asyncio.to_thread(extract_pdf_text, pdf_bytes)
                 
                 # Append extracted text to content
                 if final_content:
@@ -65,8 +72,8 @@ async def add_knowledge(
         source=source
     )
     db.add(db_knowledge)
-    db.commit()
-    db.refresh(db_knowledge)
+    await db.commit()
+    await db.refresh(db_knowledge)
     return db_knowledge
 
 
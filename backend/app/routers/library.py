@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from typing import List
 from ..database import get_db
 from ..models import LibraryItem
+from ..services.library_resolver import library_resolver
 from .. import schemas
 
 router = APIRouter(prefix="/library", tags=["library"])
@@ -30,6 +31,7 @@ def create_library_item(item: schemas.LibraryItemCreate, db: Session = Depends(g
     )
     db.add(db_item)
     db.commit()
+    library_resolver.invalidate()
     db.refresh(db_item)
     return db_item
 
@@ -59,6 +61,7 @@ def update_library_item(id: int, item_update: schemas.LibraryItemUpdate, db: Ses
     
     db.add(db_item)
     db.commit()
+    library_resolver.invalidate()
     db.refresh(db_item)
     return db_item
 
@@ -71,4 +74,5 @@ def delete_library_item(id: int, db: Session = Depends(get_db)):
     
     db.delete(db_item)
     db.commit()
+    library_resolver.invalidate()
     return {"message": "Library item deleted successfully"}
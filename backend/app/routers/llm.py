@@ -1,6 +1,23 @@
 # backend\app\routers\llm.py
 from fastapi import APIRouter
+from typing import Optional
 from ..services import llm_service
+from ..services.http_pool import http_client_pool
+from ..services.response_cache import response_cache
+from ..services.image_pipeline import image_pipeline
+from ..services.token_counter import token_counter
+from ..services.model_limits import model_limit_cache
+from ..services.model_catalog import ollama_model_catalog
+from ..services.llm_scheduler import llm_scheduler
+from ..services.llm_resilience import llm_resilience
+from ..services.stream_telemetry import stream_telemetry
+from ..services.generation_jobs import generation_jobs
+from ..services.meeting_events import meeting_events
+from ..services.db_writer import db_writer
+from ..services.library_resolver import library_resolver
+from ..services.prompt_cache import prompt_cache
+from ..services.prompt_assembly import prompt_assemblies
+from ..services.meeting_context import meeting_context_cache
 from ..config import settings
 from .. import schemas
 
@@ -13,7 +30,7 @@ async def get_llm_providers():
     ollama_models = await llm_service.get_ollama_models()
     
     return {
-        "providers": ["gemini", "ollama"],
+        "providers": ["gemini", "ollama"] + (["mock"] if settings.mock_llm_enabled else []),
         "default_provider": settings.default_llm_provider,
         "gemini_available": bool(settings.gemini_api_key),
         "ollama_available": bool(settings.ollama_base_url),
@@ -30,3 +47,113 @@ async def get_ollama_models():
         "base_url": settings.ollama_base_url
     }
 
+
+@router.get("/ollama/catalog")
+async def get_ollama_catalog(refresh: bool = False):
+    """Cached Ollama models with metadata, freshness and endpoint health"""
+    if refresh and settings.ollama_base_url:
+        await ollama_model_catalog.refresh()
+    elif settings.ollama_base_url:
+        await ollama_model_catalog.get_models()
+    return ollama_model_catalog.snapshot()
+
+
+
+@router.get("/stats/http")
+def get_http_pool_stats():
+    """Connection pool statistics for the shared Ollama HTTP client"""
+    return http_client_pool.stats()
+
+
+@router.get("/stats/cache")
+def get_response_cache_stats():
+    """Hit/miss counters and savings for the LLM response cache"""
+    return response_cache.stats()
+
+
+@router.get("/stats/images")
+def get_image_pipeline_stats():
+    """Cache and payload statistics for the image preprocessing pipeline"""
+    return image_pipeline.stats()
+
+
+@router.get("/stats/tokens")
+def get_token_counter_stats():
+    """Memo hit/miss counters and tokenizer availability for the token counter"""
+    return token_counter.stats()
+
+
+@router.get("/stats/model-limits")
+def get_model_limit_stats():
+    """Memoized model context limits and single-flight counters"""
+    return model_limit_cache.stats()
+
+
+@router.get("/stats/catalog")
+def get_model_catalog_stats():
+    """Hit/refresh counters and per-endpoint health of the Ollama model catalog"""
+    return ollama_model_catalog.stats()
+
+
+@router.get("/stats/scheduler")
+def get_scheduler_stats():
+    """Running generations, queue depth per provider/priority and wait times"""
+    return llm_scheduler.stats()
+
+
+@router.get("/stats/resilience")
+def get_resilience_stats():
+    """Retry/failover/hedge counters and circuit breaker states"""
+    return llm_resilience.stats()
+
+
+@router.get("/stats/streams")
+def get_stream_stats(meeting_id: Optional[int] = None, staff_id: Optional[int] = None, limit: int = 50):
+    """TTFT, gaps, duration and tokens/sec per provider/model, plus active and recent streams"""
+    return {
+        **stream_telemetry.stats(),
+        "recent": stream_telemetry.recent(meeting_id=meeting_id, staff_id=staff_id, limit=limit),
+    }
+
+
+@router.get("/stats/jobs")
+def get_job_stats():
+    """Background generation jobs by state, plus lifetime counters"""
+    return generation_jobs.stats()
+
+
+@router.get("/stats/meeting-events")
+def get_meeting_event_stats():
+    """Event bus counters and meetings with live subscribers"""
+    return meeting_events.stats()
+
+
+@router.get("/stats/db")
+def get_db_stats():
+    """Serialized write path: queued writes and time spent waiting for the writer"""
+    return db_writer.stats()
+
+
+@router.get("/stats/library")
+def get_library_resolver_stats():
+    """Slug index version, size and expansion memo counters for @slug resolution"""
+    return library_resolver.stats()
+
+
+@router.get("/stats/prompts")
+def get_prompt_cache_stats():
+    """Hit ratio of the per-staff static prompt blocks, prompt assembly times and preview handle reuse"""
+    return {**prompt_cache.stats(), "handles": prompt_assemblies.stats()}
+
+
+@router.get("/stats/meeting-context")
+def get_meeting_context_stats():
+    """Cached meetings, memory use and hit ratio of the in-memory meeting history"""
+    return meeting_context_cache.stats()
+
+
+@router.delete("/cache")
+def clear_response_cache():
+    """Drop every cached LLM response"""
+    response_cache.clear()
+    return {"message": "Response cache cleared"}
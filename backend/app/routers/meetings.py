@@ -1,8 +1,10 @@
 # backend\app\routers\meetings.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, WebSocket, WebSocketDisconnect
 from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select, update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload 
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 from pathlib import Path
 import os
@@ -10,7 +12,8 @@ import base64
 from ..schemas import meeting as schemas
 from ..schemas.image import MeetingImageCreate
 from ..schemas.action_item import ActionItem as ActionItemSchema, ActionItemCreate
-from ..database import get_db, SessionLocal
+from ..database import get_db, get_async_db, SessionLocal
+from ..config import settings
 from ..models import (
     Company,
     Staff,
@@ -26,7 +29,37 @@ from ..models import (
 from ..services.llm_service import llm_service
 from ..services.memory_service import memory_service
 from ..services.mention_parser import mention_parser
+from ..services.token_counter import token_counter
+from ..services.llm_scheduler import is_queue_hint, queue_hint_position
+from ..services.llm_resilience import ErrorChunk
+from ..services import stream_mux
+from ..services.stream_mux import STREAM_END
+from ..services.stream_guard import DisconnectAwareStreamingResponse
+from ..services.generation_jobs import generation_jobs
+from ..services.db_writer import db_writer
+from ..services.sse import job_sse_response, format_sse, with_heartbeats, HEARTBEAT, SSE_HEADERS, parse_last_event_id
+from ..services.meeting_queries import MAX_MEETINGS_PAGE, list_meetings, meeting_detail
+from ..services.message_sync import (
+    MAX_PAGE_SIZE, message_delta, message_page, messages_etag, messages_version, amessages_version, etag_matches
+)
+from ..services.prompt_assembly import PromptAssembly, prompt_assemblies
+from ..services.prompt_cache import prompt_cache
+from ..services.meeting_context import meeting_context_cache
+from ..services.library_resolver import library_resolver
+from ..services.meeting_events import (
+    meeting_events,
+    message_payload,
+    image_payload,
+    MESSAGE_CREATED,
+    MESSAGE_UPDATED,
+    MESSAGES_DELETED,
+    IMAGE_LINKED,
+    STATUS_CHANGED,
+    STREAM_ENDED,
+    TOKEN,
+)
 import asyncio
+from contextlib import aclosing
 import queue
 import threading
 from ..services.langgraph_service import LangGraphService
@@ -39,6 +72,117 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__fil
 UPLOADS_DIR = os.path.join(BASE_DIR, "uploads", "meeting_images")
 
 
+def participant_fallbacks(participant: MeetingParticipant):
+    """Fallback (provider, model) list for generate_stream"""
+    if not participant.fallback_provider:
+        return []
+    return [(participant.fallback_provider, participant.fallback_model)]
+
+
+def save_staff_message(meeting_id: int, staff_id: int, sender_name: str, content: str, truncated: bool = False) -> int:
+    """Persist a streamed staff response with its own session (the request one is unsafe in a generator)"""
+    with SessionLocal() as new_db:
+        staff_message = MeetingMessage(
+            meeting_id=meeting_id,
+            staff_id=staff_id,
+            sender_type="staff",
+            sender_name=sender_name,
+            content=content,
+            truncated=truncated,
+        )
+        new_db.add(staff_message)
+        new_db.commit()
+        meeting_context_cache.add(staff_message)
+        meeting_events.publish(meeting_id, MESSAGE_CREATED, message_payload(staff_message))
+        return staff_message.id
+
+
+async def staff_response_stream(stream, meeting_id: int, staff_id: int, sender_name: str, saved: dict):
+    """
+    Pass a generate_stream through and save the answer once it completes; a client that
+    went away still leaves what was generated so far, marked as truncated.
+    saved[staff_id] receives the new message id.
+    """
+    response_parts = []
+    completed = False
+    try:
+        async with aclosing(stream):
+            async for chunk in stream:
+                if not is_queue_hint(chunk):
+                    response_parts.append(chunk)
+                    meeting_events.publish(
+                        meeting_id, TOKEN, {"staff_id": staff_id, "name": sender_name, "content": chunk}
+                    )
+                yield chunk
+        completed = True
+    finally:
+        if completed or response_parts:
+            saved[staff_id] = await db_writer.run(
+                save_staff_message, meeting_id, staff_id, sender_name, "".join(response_parts), truncated=not completed
+            )
+        else:
+            meeting_events.publish(meeting_id, STREAM_ENDED, {"staff_id": staff_id})
+
+
+async def participant_events(streams: dict, names: dict, saved: dict, mux, models: Optional[dict] = None):
+    """
+    Typed events (start/chunk/queue/usage/done) for staff response streams combined by a
+    stream_mux function. models maps staff_id -> (provider, model) for usage token counts.
+    """
+    texts = {staff_id: [] for staff_id in streams}
+    for staff_id in streams:
+        yield {"type": "start", "staff_id": staff_id, "name": names[staff_id]}
+    async with aclosing(mux(streams)) as combined:
+        async for staff_id, chunk in combined:
+            if chunk is STREAM_END:
+                text = "".join(texts[staff_id])
+                provider, model = (models or {}).get(staff_id, ("gemini", None))
+                yield {
+                    "type": "usage",
+                    "staff_id": staff_id,
+                    "completion_tokens": token_counter.count(text, provider, model),
+                    "chars": len(text),
+                }
+                yield {"type": "done", "staff_id": staff_id, "message_id": saved.get(staff_id)}
+            elif is_queue_hint(chunk):
+                yield {"type": "queue", "staff_id": staff_id, "position": queue_hint_position(chunk)}
+            else:
+                texts[staff_id].append(chunk)
+                event = {"type": "chunk", "staff_id": staff_id, "content": chunk}
+                if isinstance(chunk, ErrorChunk):
+                    event["error"] = True  # Sent as an SSE "error" event
+                yield event
+
+
+async def autonomous_events(session, staff_map: dict):
+    """Autonomous session updates as participant-style job events (whole turns, no usage)"""
+    async with aclosing(session) as updates:
+        async for update in updates:
+            if update.get("type") == "content":
+                staff_id = staff_map.get(update["speaker"])
+                yield {"type": "start", "staff_id": staff_id, "name": update["speaker"]}
+                yield {"type": "chunk", "staff_id": staff_id, "content": update["content"]}
+                yield {"type": "done", "staff_id": staff_id, "message_id": None}
+            elif update.get("type") == "error":
+                yield {"type": "error", "content": update.get("message", "")}
+
+
+def job_response(job) -> dict:
+    """Reply for background=true requests: the job and where to follow it"""
+    return {**job.to_dict(), "events_url": f"/jobs/{job.id}/events", "sse_url": f"/jobs/{job.id}/sse"}
+
+
+TRANSPORTS = ("text", "sse")
+
+
+def check_transport(transport: str):
+    if transport not in TRANSPORTS:
+        raise HTTPException(status_code=400, detail=f"transport must be one of {', '.join(TRANSPORTS)}")
+
+
+ASK_ALL_MODES = ("sequential", "ordered", "concurrent")
+ASK_ALL_MUX = {"sequential": stream_mux.chain, "ordered": stream_mux.ordered, "concurrent": stream_mux.multiplex}
+
 # Global dictionary to manage stop signals
 autonomous_stop_events = {}
 
@@ -51,50 +195,143 @@ def stop_autonomous_session(meeting_id: int):
     return {"message": "No active session found", "status": "ignored"}
 
 
-def link_mentioned_assets(db: Session, meeting_id: int, company_id: int, text: str):
+async def link_mentioned_assets(db: AsyncSession, meeting_id: int, company_id: int, text: str):
     """
     Check for company asset mentions in text and create MeetingImage records if they don't exist.
     This allows "discussed" assets to appear in the meeting images panel.
     """
-    mentions = mention_parser.parse_mentions(text)
-    for mention in mentions:
-        if not mention.startswith("img"):
-            # Check if it's a company asset
-            asset = (
-                db.query(CompanyAsset)
-                .filter(
-                    CompanyAsset.company_id == company_id,
-                    CompanyAsset.asset_name == mention,
-                )
-                .first()
+    mentions = [m for m in mention_parser.parse_mentions(text) if not m.startswith("img")]
+    if not mentions:
+        return
+    assets = (
+        await db.execute(
+            select(CompanyAsset)
+            .where(CompanyAsset.company_id == company_id, CompanyAsset.asset_name.in_(mentions))
+            .order_by(CompanyAsset.id)
+        )
+    ).scalars().all()
+    by_name = {}
+    for asset in assets:
+        by_name.setdefault(asset.asset_name, asset)
+    for asset in (by_name[m] for m in mentions if m in by_name):
+        # Check if already linked (by path)
+        existing = (
+            await db.execute(
+                select(MeetingImage.id)
+                .where(MeetingImage.meeting_id == meeting_id, MeetingImage.image_path == asset.file_path)
+                .limit(1)
             )
+        ).first()
 
-            if asset:
-                # Check if already linked (by path)
-                existing = (
-                    db.query(MeetingImage)
-                    .filter(
-                        MeetingImage.meeting_id == meeting_id,
-                        MeetingImage.image_path == asset.file_path,
-                    )
-                    .first()
-                )
-
-                if not existing:
-                    # Link it
-                    count = (
-                        db.query(MeetingImage)
-                        .filter(MeetingImage.meeting_id == meeting_id)
-                        .count()
-                    )
-                    new_image = MeetingImage(
-                        meeting_id=meeting_id,
-                        image_path=asset.file_path,
-                        display_order=count + 1,
-                        image_metadata=asset.display_name,
-                    )
-                    db.add(new_image)
-                    db.commit()
+        if not existing:
+            # Link it
+            count = await db.scalar(
+                select(func.count(MeetingImage.id)).where(MeetingImage.meeting_id == meeting_id)
+            )
+            new_image = MeetingImage(
+                meeting_id=meeting_id,
+                image_path=asset.file_path,
+                display_order=count + 1,
+                image_metadata=asset.display_name,
+            )
+            db.add(new_image)
+            await db.commit()
+            meeting_events.publish(meeting_id, IMAGE_LINKED, image_payload(new_image))
+
+
+async def load_active_meeting(db: AsyncSession, meeting_id: int) -> Meeting:
+    meeting = await db.get(Meeting, meeting_id)
+    if not meeting or meeting.status != "active":
+        raise HTTPException(status_code=400, detail="Meeting not active")
+    return meeting
+
+
+async def load_participant(db: AsyncSession, meeting_id: int, staff_id: int) -> MeetingParticipant:
+    """The participant with its staff row loaded (async sessions cannot lazy-load)"""
+    participant = (
+        await db.execute(
+            select(MeetingParticipant)
+            .options(joinedload(MeetingParticipant.staff))
+            .where(MeetingParticipant.meeting_id == meeting_id, MeetingParticipant.staff_id == staff_id)
+        )
+    ).scalars().first()
+    if not participant:
+        raise HTTPException(
+            status_code=404, detail="Staff member is not a participant in this meeting"
+        )
+    return participant
+
+
+async def with_sync_session(db: AsyncSession, fn, **kwargs):
+    """Run a sync helper that takes db=Session; its queries still go through the async driver"""
+    return await db.run_sync(lambda session: fn(db=session, **kwargs))
+
+
+async def assemble_prompt(
+    db: AsyncSession,
+    meeting: Meeting,
+    participant: MeetingParticipant,
+    content: str,
+    prompt: Optional[str] = None,
+) -> PromptAssembly:
+    """
+    History, knowledge, @mentions and the packed system prompt for one participant, built
+    once. `prompt` is the user turn the budget is computed against (defaults to content).
+    """
+    staff = participant.staff
+    provider = participant.llm_provider
+    model_name = participant.llm_model or llm_service.default_model_for(provider)
+
+    meeting_history = await memory_service.aget_meeting_history(db, meeting.id)
+    knowledge_context = await memory_service.aget_company_knowledge_context(db, meeting.company_id)
+    image_paths, missing_mentions = await mention_parser.aresolve_all_mentions(
+        content, meeting.id, meeting.company_id, db
+    )
+    company = await db.get(Company, meeting.company_id)
+
+    token_budget = await llm_service.get_context_budget(
+        provider, model_name, None, content if prompt is None else prompt, image_paths
+    )
+    blocks = await with_sync_session(
+        db,
+        llm_service.build_structured_prompt_blocks,
+        staff_name=staff.name,
+        role=staff.role,
+        personality=staff.personality,
+        expertise=staff.expertise,
+        company_context=knowledge_context,
+        meeting_context=None,
+        company_name=company.name if company else "MyVCO",
+        company_description=company.description if company else "",
+        system_prompt=staff.system_prompt or "",
+        knowledge_base=staff.knowledge_base or "",
+        context_settings=participant.context_settings,
+        meeting_history=meeting_history,
+        staff_id=staff.id,
+    )
+    packing = llm_service.pack_prompt_blocks(blocks, token_budget, provider, model_name)
+    return PromptAssembly(
+        meeting.id, staff.id, content, provider, model_name, blocks, packing,
+        llm_service.render_system_prompt(blocks), image_paths, missing_mentions,
+    )
+
+
+async def prompt_fingerprint(
+    db: AsyncSession, participant: MeetingParticipant, content: str, prompt: str
+) -> tuple:
+    """Everything a stored assembly depends on besides its age"""
+    return (
+        participant.meeting_id,
+        participant.staff_id,
+        content,
+        prompt,
+        participant.llm_provider,
+        participant.llm_model,
+        json.dumps(participant.context_settings, sort_keys=True),
+        prompt_cache.staff_version(participant.staff_id),
+        library_resolver.version,
+        await amessages_version(db, participant.meeting_id),
+    )
 
 
 @router.post("/companies/{company_id}/meetings", response_model=schemas.Meeting)
@@ -112,95 +349,50 @@ def create_meeting(
     db.add(db_meeting)
     db.commit()
     db.refresh(db_meeting)
+    meeting_context_cache.drop(db_meeting.id)  # SQLite can hand out a deleted meeting's id again
 
     # Add participants with their specific LLM config
+    requested_ids = {p.staff_id for p in meeting.participants}
+    existing_ids = {staff_id for (staff_id,) in db.query(Staff.id).filter(Staff.id.in_(requested_ids))}
     for participant_config in meeting.participants:
-        staff = db.query(Staff).filter(Staff.id == participant_config.staff_id).first()
-        if staff:
+        if participant_config.staff_id in existing_ids:
             participant = MeetingParticipant(
                 meeting_id=db_meeting.id,
                 staff_id=participant_config.staff_id,
                 llm_provider=participant_config.llm_provider,
                 llm_model=participant_config.llm_model,
+                fallback_provider=participant_config.fallback_provider,
+                fallback_model=participant_config.fallback_model,
             )
             db.add(participant)
 
     db.commit()
 
-    # Construct response with participant details
-    participants_data = []
-    participants = (
-        db.query(MeetingParticipant)
-        .filter(MeetingParticipant.meeting_id == db_meeting.id)
-        .all()
-    )
-
-    for participant in participants:
-        staff = db.query(Staff).filter(Staff.id == participant.staff_id).first()
-        if staff:
-            participants_data.append(
-                schemas.MeetingParticipantInfo(
-                    staff_id=staff.id,
-                    staff_name=staff.name,
-                    staff_role=staff.role,
-                    llm_provider=participant.llm_provider,
-                    llm_model=participant.llm_model,
-                    joined_at=participant.joined_at,
-                )
-            )
-
-    return {
-        "id": db_meeting.id,
-        "company_id": db_meeting.company_id,
-        "title": db_meeting.title,
-        "meeting_type": db_meeting.meeting_type,
-        "status": db_meeting.status,
-        "summary": db_meeting.summary,
-        "created_at": db_meeting.created_at,
-        "ended_at": db_meeting.ended_at,
-        "participants": participants_data,
-    }
+    return meeting_detail(db, db_meeting, include_context=False)
 
 
 @router.get("/companies/{company_id}/meetings", response_model=List[schemas.Meeting])
-def list_company_meetings(company_id: int, db: Session = Depends(get_db)):
-    meetings = db.query(Meeting).filter(Meeting.company_id == company_id).all()
-    result = []
-    for meeting in meetings:
-        participants_data = []
-        participants = (
-            db.query(MeetingParticipant)
-            .filter(MeetingParticipant.meeting_id == meeting.id)
-            .all()
-        )
-        for participant in participants:
-            staff = db.query(Staff).filter(Staff.id == participant.staff_id).first()
-            if staff:
-                participants_data.append(
-                    schemas.MeetingParticipantInfo(
-                        staff_id=staff.id,
-                        staff_name=staff.name,
-                        staff_role=staff.role,
-                        llm_provider=participant.llm_provider,
-                        llm_model=participant.llm_model,
-                        joined_at=participant.joined_at,
-                    )
-                )
-
-        result.append(
-            {
-                "id": meeting.id,
-                "company_id": meeting.company_id,
-                "title": meeting.title,
-                "meeting_type": meeting.meeting_type,
-                "status": meeting.status,
-                "summary": meeting.summary,
-                "created_at": meeting.created_at,
-                "ended_at": meeting.ended_at,
-                "participants": participants_data,
-            }
-        )
-    return result
+def list_company_meetings(
+    company_id: int,
+    status: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_MEETINGS_PAGE),
+    include_summary: bool = True,
+    db: Session = Depends(get_db),
+):
+    """Meetings oldest first; filter by status/creation date, page with skip/limit"""
+    return list_meetings(
+        db,
+        company_id,
+        status=status,
+        created_after=created_after,
+        created_before=created_before,
+        skip=skip,
+        limit=limit,
+        include_summary=include_summary,
+    )
 
 
 @router.get("/{meeting_id}", response_model=schemas.Meeting)
@@ -208,49 +400,79 @@ def get_meeting(meeting_id: int, db: Session = Depends(get_db)):
     meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
+    return meeting_detail(db, meeting)
 
-    participants_data = []
-    participants = (
-        db.query(MeetingParticipant)
-        .filter(MeetingParticipant.meeting_id == meeting_id)
-        .all()
-    )
-    for participant in participants:
-        staff = db.query(Staff).filter(Staff.id == participant.staff_id).first()
-        if staff:
-            participants_data.append(
-                schemas.MeetingParticipantInfo(
-                    staff_id=staff.id,
-                    staff_name=staff.name,
-                    staff_role=staff.role,
-                    llm_provider=participant.llm_provider,
-                    llm_model=participant.llm_model,
-                    context_settings=participant.context_settings,
-                    joined_at=participant.joined_at,
-                )
-            )
 
-    return {
-        "id": meeting.id,
-        "company_id": meeting.company_id,
-        "title": meeting.title,
-        "meeting_type": meeting.meeting_type,
-        "status": meeting.status,
-        "summary": meeting.summary,
-        "created_at": meeting.created_at,
-        "ended_at": meeting.ended_at,
-        "participants": participants_data,
-    }
+@router.get("/{meeting_id}/events")
+async def stream_meeting_events(
+    meeting_id: int,
+    since: Optional[int] = None,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
+    """
+    Live meeting updates as Server-Sent Events: message_created, message_updated,
+    messages_deleted, image_linked, status_changed, stream_ended and token. New clients
+    start with a snapshot event; reconnects (Last-Event-ID or ?since=) get only the
+    missed events while they are still buffered.
+    """
+    if last_event_id:
+        since = parse_last_event_id(last_event_id)
+
+    async def generate_events():
+        yield f"retry: {settings.sse_retry_ms}\n\n"
+        events = with_heartbeats(meeting_events.subscribe(meeting_id, since), settings.sse_heartbeat_seconds)
+        async with aclosing(events):
+            async for event in events:
+                yield ": heartbeat\n\n" if event is HEARTBEAT else format_sse(event, name=event["type"])
+
+    return DisconnectAwareStreamingResponse(generate_events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@router.websocket("/{meeting_id}/ws")
+async def meeting_events_websocket(websocket: WebSocket, meeting_id: int, since: Optional[int] = None):
+    """Same events as /events as JSON messages"""
+    await websocket.accept()
+    events = with_heartbeats(meeting_events.subscribe(meeting_id, since), settings.sse_heartbeat_seconds)
+    try:
+        async with aclosing(events):
+            async for event in events:
+                await websocket.send_json({"type": "heartbeat"} if event is HEARTBEAT else event)
+    except WebSocketDisconnect:
+        pass
 
 
 @router.get("/{meeting_id}/messages", response_model=List[schemas.MeetingMessage])
-def get_meeting_messages(meeting_id: int, db: Session = Depends(get_db)):
-    return (
-        db.query(MeetingMessage)
-        .filter(MeetingMessage.meeting_id == meeting_id)
-        .order_by(MeetingMessage.created_at)
-        .all()
-    )
+def get_meeting_messages(
+    meeting_id: int,
+    response: Response,
+    before: Optional[int] = None,
+    after: Optional[int] = None,
+    since_id: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    db: Session = Depends(get_db),
+):
+    """
+    Messages oldest first. Without params: the whole meeting. `limit` alone returns the
+    tail, `before`/`after` page by message id, `since_id` returns only messages created or
+    edited since that one. X-Has-More and X-Total-Count headers describe the rest.
+    """
+    if since_id is not None and (before is not None or after is not None):
+        raise HTTPException(status_code=400, detail="since_id cannot be combined with before/after")
+
+    version = messages_version(db, meeting_id)
+    etag = messages_etag(meeting_id, version, before=before, after=after, since_id=since_id, limit=limit)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    if since_id is not None:
+        messages, has_more = message_delta(db, meeting_id, since_id, limit)
+    else:
+        messages, has_more = message_page(db, meeting_id, before, after, limit)
+    response.headers["ETag"] = etag
+    response.headers["X-Has-More"] = "true" if has_more else "false"
+    response.headers["X-Total-Count"] = str(version[0])
+    return messages
 
 
 @router.post("/{meeting_id}/messages")
@@ -259,32 +481,40 @@ async def send_message(
     message: schemas.SendMessageRequest,
     staff_id: int,
     save_user_message: bool = True,  # <--- Added flag
-    db: Session = Depends(get_db),
+    queue_hints: bool = False,
+    background: bool = False,
+    transport: str = "text",
+    db: AsyncSession = Depends(get_async_db),
 ):
-    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
-    if not meeting or meeting.status != "active":
-        raise HTTPException(status_code=400, detail="Meeting not active")
-
-    participant = (
-        db.query(MeetingParticipant)
-        .filter(
-            MeetingParticipant.meeting_id == meeting_id,
-            MeetingParticipant.staff_id == staff_id,
-        )
-        .first()
-    )
-
-    if not participant:
-        raise HTTPException(
-            status_code=404, detail="Staff member is not a participant in this meeting"
-        )
-
+    """
+    Stream one staff member's answer. With background=true the generation runs as a
+    job (see /jobs) and the reply is the job; follow it at events_url.
+    transport=sse runs it as a job too and streams its Server-Sent Events right away
+    (the first "job" event names the job to resume from).
+    """
+    check_transport(transport)
+    meeting = await load_active_meeting(db, meeting_id)
+    participant = await load_participant(db, meeting_id, staff_id)
     staff = participant.staff
 
     # Extract primitives before entering async generator
     p_llm_provider = participant.llm_provider
     p_llm_model = participant.llm_model
 
+    final_prompt = (
+        message.custom_user_content
+        if message.custom_user_content is not None
+        else message.content
+    )
+
+    # A confirmed preview reuses its prompt unless something it was built from changed
+    assembly = None
+    if message.prompt_handle:
+        assembly = prompt_assemblies.get(
+            message.prompt_handle,
+            await prompt_fingerprint(db, participant, message.content, final_prompt),
+        )
+
     # Only save the user message if requested (prevents duplicates in Ask All)
     if save_user_message:
         user_message = MeetingMessage(
@@ -294,80 +524,56 @@ async def send_message(
             content=message.content,
         )
         db.add(user_message)
-        db.commit()
+        await db.commit()
+        meeting_context_cache.add(user_message)
+        meeting_events.publish(meeting_id, MESSAGE_CREATED, message_payload(user_message))
 
     # Link mentioned company assets to meeting images
-    link_mentioned_assets(db, meeting_id, meeting.company_id, message.content)
-
-    meeting_context = memory_service.get_meeting_context(db, meeting_id)
-    knowledge_context = memory_service.get_company_knowledge_context(
-        db, meeting.company_id
-    )
+    await link_mentioned_assets(db, meeting_id, meeting.company_id, message.content)
 
-    # Parse @mentions from message content to get image paths
-    image_paths, missing_mentions = mention_parser.resolve_all_mentions(
-        message.content, meeting_id, meeting.company_id, db
-    )
+    if assembly is None:
+        assembly = await assemble_prompt(db, meeting, participant, message.content, final_prompt)
+    image_paths = assembly.image_paths
 
     # Warn if any mentions were not found
-    if missing_mentions:
-        print(f"WARNING: Missing mentions in message: {missing_mentions}")
+    if assembly.missing_mentions:
+        print(f"WARNING: Missing mentions in message: {assembly.missing_mentions}")
 
-    company = db.query(Company).filter(Company.id == meeting.company_id).first()
-
-    system_prompt = llm_service.build_system_prompt(
-        staff_name=staff.name,
-        role=staff.role,
-        personality=staff.personality,
-        expertise=staff.expertise,
-        company_context=knowledge_context,
-        meeting_context=meeting_context,
-        company_name=company.name if company else "MyVCO",
-        company_description=company.description if company else "",
-        system_prompt=staff.system_prompt or "",
-        knowledge_base=staff.knowledge_base or "",
-        db=db,
-        context_settings=participant.context_settings,
-    )
+    system_prompt = assembly.system_prompt
 
     # Apply explicit overrides if provided
     if message.custom_system_prompt is not None:
         system_prompt = message.custom_system_prompt
 
-    final_prompt = (
-        message.custom_user_content
-        if message.custom_user_content is not None
-        else message.content
-    )
-
-    async def generate_response():
-        response_parts = []
-        async for chunk in llm_service.generate_stream(
+    saved = {}
+    response_stream = staff_response_stream(
+        llm_service.generate_stream(
             prompt=final_prompt,
             system_prompt=system_prompt,
             provider=p_llm_provider,
             model=p_llm_model,
             image_paths=image_paths,
-        ):
-            response_parts.append(chunk)
-            yield chunk
-
-        full_response = "".join(response_parts)
-
-        from ..database import SessionLocal
-
-        with SessionLocal() as new_db:
-            staff_message = MeetingMessage(
-                meeting_id=meeting_id,
-                staff_id=staff_id,
-                sender_type="staff",
-                sender_name=staff.name,
-                content=full_response,
-            )
-            new_db.add(staff_message)
-            new_db.commit()
+            use_cache=not message.bypass_cache,
+            meeting_id=meeting_id,
+            company_id=meeting.company_id,
+            staff_id=staff_id,
+            queue_hints=queue_hints,
+            fallbacks=participant_fallbacks(participant),
+        ),
+        meeting_id,
+        staff_id,
+        staff.name,
+        saved,
+    )
 
-    return StreamingResponse(generate_response(), media_type="text/plain")
+    if background or transport == "sse":
+        events = participant_events(
+            {staff_id: response_stream}, {staff_id: staff.name}, saved, stream_mux.chain,
+            {staff_id: (p_llm_provider, p_llm_model)},
+        )
+        job = generation_jobs.create(events, "message", meeting_id, [staff_id])
+        return job_sse_response(job, announce=True) if transport == "sse" else job_response(job)
+    return DisconnectAwareStreamingResponse(response_stream, media_type="text/plain")
 
 
 @router.post("/{meeting_id}/messages/preview")
@@ -375,73 +581,19 @@ async def preview_prompt(
     meeting_id: int,
     message: schemas.SendMessageRequest,
     staff_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """Generate the system prompt and user message preview without sending them to the LLM"""
-    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
-    if not meeting or meeting.status != "active":
-        raise HTTPException(status_code=400, detail="Meeting not active")
-
-    participant = (
-        db.query(MeetingParticipant)
-        .filter(
-            MeetingParticipant.meeting_id == meeting_id,
-            MeetingParticipant.staff_id == staff_id,
-        )
-        .first()
-    )
-
-    if not participant:
-        raise HTTPException(
-            status_code=404, detail="Staff member is not a participant in this meeting"
-        )
-
-    staff = participant.staff
-
-    meeting_context = memory_service.get_meeting_context(db, meeting_id)
-    knowledge_context = memory_service.get_company_knowledge_context(
-        db, meeting.company_id
-    )
-    company = db.query(Company).filter(Company.id == meeting.company_id).first()
-
-    # 2. Build structured prompt blocks
-    context_blocks_raw = llm_service.build_structured_prompt_blocks(
-        staff_name=staff.name,
-        role=staff.role,
-        personality=staff.personality,
-        expertise=staff.expertise,
-        company_context=knowledge_context,
-        meeting_context=meeting_context,
-        company_name=company.name if company else "MyVCO",
-        company_description=company.description if company else "",
-        system_prompt=staff.system_prompt or "",
-        knowledge_base=staff.knowledge_base or "",
-        db=db,
-        context_settings=participant.context_settings,
-    )
-
-    # Generate the final string for the preview
-    system_prompt = llm_service.build_system_prompt(
-        staff_name=staff.name,
-        role=staff.role,
-        personality=staff.personality,
-        expertise=staff.expertise,
-        company_context=knowledge_context,
-        meeting_context=meeting_context,
-        company_name=company.name if company else "MyVCO",
-        company_description=company.description if company else "",
-        system_prompt=staff.system_prompt or "",
-        knowledge_base=staff.knowledge_base or "",
-        db=db,
-        context_settings=participant.context_settings,
-    )
+    """
+    Generate the system prompt and user message preview without sending them to the LLM.
+    The returned prompt_handle lets the confirmed send reuse this prompt instead of rebuilding it.
+    """
+    meeting = await load_active_meeting(db, meeting_id)
+    participant = await load_participant(db, meeting_id, staff_id)
 
-    # 3. Handle mentions (images and assets) for Token Estimation & UI Thumbnail delivery
-    image_paths, missing_mentions = mention_parser.resolve_all_mentions(
-        text=message.content,
-        meeting_id=meeting_id,
-        company_id=meeting.company_id,
-        db=db,
+    assembly = await assemble_prompt(db, meeting, participant, message.content)
+    max_tokens = await llm_service.get_max_tokens(assembly.provider, assembly.model)
+    prompt_handle = prompt_assemblies.put(
+        assembly, await prompt_fingerprint(db, participant, message.content, message.content)
     )
 
     # Convert absolute paths to relative web URLs for frontend rendering
@@ -449,7 +601,7 @@ async def preview_prompt(
     base_dir = os.path.dirname(
         os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     )
-    for path in image_paths:
+    for path in assembly.image_paths:
         try:
             # We want to format string: C:/path/to/backend/uploads/... -> /uploads/...
             rel_path = os.path.relpath(path, base_dir)
@@ -461,20 +613,17 @@ async def preview_prompt(
         except Exception as e:
             print(f"Warning: Could not resolve relative URL for {path}: {e}")
 
-    provider = participant.llm_provider
-    model_name = participant.llm_model or (
-        "gemini-2.5-flash" if provider == "gemini" else "llama3"
-    )
-    max_tokens = await llm_service.get_max_tokens(provider, model_name, db)
-
     return {
-        "system_prompt": system_prompt,
+        "system_prompt": assembly.system_prompt,
         "user_content": message.content,
-        "llm_provider": provider,
-        "llm_model": model_name,
+        "llm_provider": assembly.provider,
+        "llm_model": assembly.model,
         "max_tokens": max_tokens,
         "image_urls": image_urls,
-        "context_blocks": context_blocks_raw,
+        "context_blocks": assembly.blocks,
+        "token_counts": assembly.token_counts(),
+        "packing": assembly.packing,
+        "prompt_handle": prompt_handle,
     }
 
 
@@ -483,22 +632,22 @@ async def update_participant_context_settings(
     meeting_id: int,
     staff_id: int,
     request: schemas.UpdateContextSettingsRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     participant = (
-        db.query(MeetingParticipant)
-        .filter(
-            MeetingParticipant.meeting_id == meeting_id,
-            MeetingParticipant.staff_id == staff_id,
+        await db.execute(
+            select(MeetingParticipant).where(
+                MeetingParticipant.meeting_id == meeting_id,
+                MeetingParticipant.staff_id == staff_id,
+            )
         )
-        .first()
-    )
+    ).scalars().first()
 
     if not participant:
         raise HTTPException(status_code=404, detail="Participant not found")
 
     participant.context_settings = request.context_settings
-    db.commit()
+    await db.commit()
     return {"status": "success", "context_settings": participant.context_settings}
 
 
@@ -516,14 +665,22 @@ def update_message(
     message.content = message_update.content
     db.commit()
     db.refresh(message)
+    meeting_context_cache.update(message)
+    meeting_events.publish(message.meeting_id, MESSAGE_UPDATED, message_payload(message))
     return message
 
 
 @router.post("/messages/{message_id}/resend")
-async def resend_message(message_id: int, staff_id: int, db: Session = Depends(get_db)):
+async def resend_message(
+    message_id: int,
+    staff_id: int,
+    bypass_cache: bool = False,
+    queue_hints: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+):
     """Resend a message - deletes all subsequent messages and regenerates response"""
     # Get the message to resend
-    message = db.query(MeetingMessage).filter(MeetingMessage.id == message_id).first()
+    message = await db.get(MeetingMessage, message_id)
     if not message:
         raise HTTPException(status_code=404, detail="Message not found")
 
@@ -531,111 +688,75 @@ async def resend_message(message_id: int, staff_id: int, db: Session = Depends(g
         raise HTTPException(status_code=400, detail="Can only resend user messages")
 
     meeting_id = message.meeting_id
-    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
-    if not meeting or meeting.status != "active":
-        raise HTTPException(status_code=400, detail="Meeting not active")
-
-    # Delete all messages created after this message
-    db.query(MeetingMessage).filter(
-        MeetingMessage.meeting_id == meeting_id,
-        MeetingMessage.created_at > message.created_at,
-    ).delete()
-    db.commit()
-
-    # Get participant info
-    participant = (
-        db.query(MeetingParticipant)
-        .filter(
-            MeetingParticipant.meeting_id == meeting_id,
-            MeetingParticipant.staff_id == staff_id,
-        )
-        .first()
+    meeting = await load_active_meeting(db, meeting_id)
+
+    # Delete all messages created after this message (images they linked stay in the meeting)
+    later = (MeetingMessage.meeting_id == meeting_id, MeetingMessage.created_at > message.created_at)
+    await db.execute(
+        update(MeetingImage)
+        .where(MeetingImage.message_id.in_(select(MeetingMessage.id).where(*later)))
+        .values(message_id=None)
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(delete(MeetingMessage).where(*later).execution_options(synchronize_session=False))
+    await db.commit()
+    meeting_context_cache.remove_after(meeting_id, message.created_at)
+    meeting_events.publish(
+        meeting_id,
+        MESSAGES_DELETED,
+        {"after_id": message.id, "after": message.created_at.isoformat() if message.created_at else None},
     )
 
-    if not participant:
-        raise HTTPException(
-            status_code=404, detail="Staff member is not a participant in this meeting"
-        )
-
+    # Get participant info
+    participant = await load_participant(db, meeting_id, staff_id)
     staff = participant.staff
     p_llm_provider = participant.llm_provider
     p_llm_model = participant.llm_model
 
     # Link mentioned company assets
-    link_mentioned_assets(db, meeting_id, meeting.company_id, message.content)
+    await link_mentioned_assets(db, meeting_id, meeting.company_id, message.content)
 
-    # Get context
-    meeting_context = memory_service.get_meeting_context(db, meeting_id)
-    knowledge_context = memory_service.get_company_knowledge_context(
-        db, meeting.company_id
-    )
-
-    # Parse mentions
-    image_paths, missing_mentions = mention_parser.resolve_all_mentions(
-        message.content, meeting_id, meeting.company_id, db
-    )
-
-    if missing_mentions:
-        print(f"WARNING: Missing mentions in resend: {missing_mentions}")
+    assembly = await assemble_prompt(db, meeting, participant, message.content)
+    image_paths = assembly.image_paths
+    system_prompt = assembly.system_prompt
 
-    company = db.query(Company).filter(Company.id == meeting.company_id).first()
-
-    system_prompt = llm_service.build_system_prompt(
-        staff_name=staff.name,
-        role=staff.role,
-        personality=staff.personality,
-        expertise=staff.expertise,
-        company_context=knowledge_context,
-        meeting_context=meeting_context,
-        company_name=company.name if company else "MyVCO",
-        company_description=company.description if company else "",
-        system_prompt=staff.system_prompt or "",
-        knowledge_base=staff.knowledge_base or "",
-        db=db,
-        context_settings=participant.context_settings,
-    )
+    if assembly.missing_mentions:
+        print(f"WARNING: Missing mentions in resend: {assembly.missing_mentions}")
 
     # No custom overrides implemented in resend for now (can be passed via schema if updated, but keeping it simple)
     # If we wanted to allow overrides in resend, we'd add custom_system_prompt as query param or body. We will leave it standard.
 
-    async def generate_response():
-        response_parts = []
-        async for chunk in llm_service.generate_stream(
+    saved = {}
+    response_stream = staff_response_stream(
+        llm_service.generate_stream(
             prompt=message.content,
             system_prompt=system_prompt,
             provider=p_llm_provider,
             model=p_llm_model,
             image_paths=image_paths,
-        ):
-            response_parts.append(chunk)
-            yield chunk
-
-        full_response = "".join(response_parts)
-
-        from ..database import SessionLocal
-
-        with SessionLocal() as new_db:
-            staff_message = MeetingMessage(
-                meeting_id=meeting_id,
-                staff_id=staff_id,
-                sender_type="staff",
-                sender_name=staff.name,
-                content=full_response,
-            )
-            new_db.add(staff_message)
-            new_db.commit()
-
-    return StreamingResponse(generate_response(), media_type="text/plain")
+            use_cache=not bypass_cache,
+            meeting_id=meeting_id,
+            company_id=meeting.company_id,
+            staff_id=staff_id,
+            queue_hints=queue_hints,
+            fallbacks=participant_fallbacks(participant),
+        ),
+        meeting_id,
+        staff_id,
+        staff.name,
+        saved,
+    )
+    return DisconnectAwareStreamingResponse(response_stream, media_type="text/plain")
 
 
 @router.put("/{meeting_id}/status")
 async def update_meeting_status(
     meeting_id: int,
     status_update: schemas.UpdateMeetingStatusRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Update meeting status (end meeting) and generate summary with specific LLM"""
-    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+    meeting = await db.get(Meeting, meeting_id)
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
 
@@ -654,8 +775,21 @@ async def update_meeting_status(
         meeting.summary = summary
         await extract_action_items(db, meeting_id, llm_service)
 
-    db.commit()
-    db.refresh(meeting)
+    await db.commit()
+    await db.refresh(meeting)
+    meeting_events.publish(
+        meeting_id,
+        STATUS_CHANGED,
+        {
+            "status": meeting.status,
+            "ended_at": meeting.ended_at.isoformat() if meeting.ended_at else None,
+            "summary": meeting.summary,
+        },
+    )
+    if meeting.status == "ended":
+        # Free the history buffer and event channel; a resumed meeting reloads them
+        meeting_context_cache.drop(meeting_id)
+        meeting_events.drop(meeting_id)
     return meeting
 
 
@@ -663,11 +797,23 @@ async def update_meeting_status(
 async def ask_all_participants(
     meeting_id: int,
     message: schemas.SendMessageToAllRequest,
-    db: Session = Depends(get_db),
+    queue_hints: bool = False,
+    mode: str = "sequential",
+    background: bool = False,
+    transport: str = "text",
+    db: AsyncSession = Depends(get_async_db),
 ):
-    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
-    if not meeting or meeting.status != "active":
-        raise HTTPException(status_code=400, detail="Meeting not active")
+    """
+    Ask every participant. mode: "sequential" (one after another, ---STAFF:name--- framing),
+    "ordered" (generated concurrently, same framing, later speakers buffered) or
+    "concurrent" (generated concurrently, NDJSON events tagged with staff_id).
+    With background=true the generations run as a job (see /jobs) and the reply is the job;
+    transport=sse streams the job's Server-Sent Events instead.
+    """
+    check_transport(transport)
+    if mode not in ASK_ALL_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of {', '.join(ASK_ALL_MODES)}")
+    meeting = await load_active_meeting(db, meeting_id)
 
     company_id = meeting.company_id
     user_message = MeetingMessage(
@@ -677,16 +823,21 @@ async def ask_all_participants(
         content=message.content,
     )
     db.add(user_message)
-    db.commit()
+    await db.commit()
+    meeting_context_cache.add(user_message)
+    meeting_events.publish(meeting_id, MESSAGE_CREATED, message_payload(user_message))
 
     # Link mentioned company assets to meeting images
-    link_mentioned_assets(db, meeting_id, company_id, message.content)
+    await link_mentioned_assets(db, meeting_id, company_id, message.content)
 
     participants_query = (
-        db.query(MeetingParticipant)
-        .filter(MeetingParticipant.meeting_id == meeting_id)
-        .all()
-    )
+        await db.execute(
+            select(MeetingParticipant)
+            .options(joinedload(MeetingParticipant.staff))
+            .where(MeetingParticipant.meeting_id == meeting_id)
+            .order_by(MeetingParticipant.id)
+        )
+    ).scalars().all()
 
     # Eager load participant data to avoid detached session errors during streaming
     participants_data = []
@@ -703,15 +854,16 @@ async def ask_all_participants(
                     "knowledge_base": p.staff.knowledge_base,
                     "llm_provider": p.llm_provider,
                     "llm_model": p.llm_model,
+                    "fallbacks": participant_fallbacks(p),
                     "context_settings": p.context_settings,
                 }
             )
 
-    meeting_context = memory_service.get_meeting_context(db, meeting_id)
-    knowledge_context = memory_service.get_company_knowledge_context(db, company_id)
+    meeting_history = await memory_service.aget_meeting_history(db, meeting_id)
+    knowledge_context = await memory_service.aget_company_knowledge_context(db, company_id)
 
     # Parse @mentions from message content to get image paths
-    image_paths, missing_mentions = mention_parser.resolve_all_mentions(
+    image_paths, missing_mentions = await mention_parser.aresolve_all_mentions(
         message.content, meeting_id, company_id, db
     )
 
@@ -719,71 +871,117 @@ async def ask_all_participants(
     if missing_mentions:
         print(f"WARNING: Missing mentions in ask_all: {missing_mentions}")
 
-    company = db.query(Company).filter(Company.id == meeting.company_id).first()
+    company = await db.get(Company, meeting.company_id)
     company_name = company.name if company else "MyVCO"
     company_desc = company.description if company else ""
 
-    async def generate_all_responses():
-        from ..database import SessionLocal
-
-        for p_data in participants_data:
-            system_prompt = llm_service.build_system_prompt(
-                staff_name=p_data["name"],
-                role=p_data["role"],
-                personality=p_data["personality"],
-                expertise=p_data["expertise"],
-                company_context=knowledge_context,
-                meeting_context=meeting_context,
-                company_name=company_name,
-                company_description=company_desc,
-                system_prompt=p_data["system_prompt"] or "",
-                knowledge_base=p_data.get("knowledge_base") or "",
-                db=db,
-                context_settings=p_data.get("context_settings"),
-            )
-
-            # Allow overrides
-            if message.custom_system_prompt is not None:
-                system_prompt = message.custom_system_prompt
+    final_prompt = (
+        message.custom_user_content
+        if message.custom_user_content is not None
+        else message.content
+    )
 
-            final_prompt = (
-                message.custom_user_content
-                if message.custom_user_content is not None
-                else message.content
+    # Build every participant's prompt up front so the generations can start together
+    budgets = await asyncio.gather(
+        *[
+            llm_service.get_context_budget(
+                p_data["llm_provider"], p_data["llm_model"], None, final_prompt, image_paths
             )
+            for p_data in participants_data
+        ]
+    )
+    for p_data, token_budget in zip(participants_data, budgets):
+        p_data["system_prompt_final"] = await with_sync_session(
+            db,
+            llm_service.build_system_prompt,
+            staff_name=p_data["name"],
+            role=p_data["role"],
+            personality=p_data["personality"],
+            expertise=p_data["expertise"],
+            company_context=knowledge_context,
+            meeting_context=None,
+            company_name=company_name,
+            company_description=company_desc,
+            system_prompt=p_data["system_prompt"] or "",
+            knowledge_base=p_data.get("knowledge_base") or "",
+            context_settings=p_data.get("context_settings"),
+            meeting_history=meeting_history,
+            token_budget=token_budget,
+            provider=p_data["llm_provider"],
+            model=p_data["llm_model"],
+            staff_id=p_data["staff_id"],
+        )
 
-            # Send the staff delimiter first
-            yield f"---STAFF:{p_data['name']}---\n"
+        # Allow overrides
+        if message.custom_system_prompt is not None:
+            p_data["system_prompt_final"] = message.custom_system_prompt
 
-            response_parts = []
+    names = {p_data["staff_id"]: p_data["name"] for p_data in participants_data}
+    models = {p_data["staff_id"]: (p_data["llm_provider"], p_data["llm_model"]) for p_data in participants_data}
 
-            # FIX: Explicitly iterate over the inner generator and yield its chunks
-            async for chunk in llm_service.generate_stream(
+    def participant_stream(p_data, saved):
+        """One participant's response; saved to the database as soon as it completes (or is cut off)"""
+        return staff_response_stream(
+            llm_service.generate_stream(
                 prompt=final_prompt,
-                system_prompt=system_prompt,
+                system_prompt=p_data["system_prompt_final"],
                 provider=p_data["llm_provider"],
                 model=p_data["llm_model"],
                 image_paths=image_paths,
-            ):
-                response_parts.append(chunk)
-                yield chunk
+                use_cache=not message.bypass_cache,
+                meeting_id=meeting_id,
+                company_id=company_id,
+                staff_id=p_data["staff_id"],
+                queue_hints=queue_hints,
+                fallbacks=p_data["fallbacks"],
+            ),
+            meeting_id,
+            p_data["staff_id"],
+            p_data["name"],
+            saved,
+        )
 
-            # Save the complete response to the database
-            full_response = "".join(response_parts)
+    def all_streams(saved):
+        return {p_data["staff_id"]: participant_stream(p_data, saved) for p_data in participants_data}
 
-            # Use a new session for saving since the main one is closed/unsafe in async generator
-            with SessionLocal() as new_db:
-                staff_message = MeetingMessage(
-                    meeting_id=meeting_id,
-                    staff_id=p_data["staff_id"],
-                    sender_type="staff",
-                    sender_name=p_data["name"],
-                    content=full_response,
-                )
-                new_db.add(staff_message)
-                new_db.commit()
+    async def generate_all_responses():
+        saved = {}
+        for p_data in participants_data:
+            # Send the staff delimiter first
+            yield f"---STAFF:{p_data['name']}---\n"
+            async with aclosing(participant_stream(p_data, saved)) as stream:
+                async for chunk in stream:
+                    yield chunk
+
+    async def generate_ordered_responses():
+        """All participants generate at once; output keeps the sequential framing"""
+        announced = set()
+        async with aclosing(stream_mux.ordered(all_streams({}), droppable=is_queue_hint)) as combined:
+            async for staff_id, chunk in combined:
+                if staff_id not in announced:
+                    announced.add(staff_id)
+                    yield f"---STAFF:{names[staff_id]}---\n"
+                if chunk is not STREAM_END:
+                    yield chunk
+
+    async def generate_concurrent_responses():
+        """All participants generate at once; NDJSON events tagged with staff_id"""
+        saved = {}
+        events = participant_events(all_streams(saved), names, saved, stream_mux.multiplex, models)
+        async with aclosing(events):
+            async for event in events:
+                yield json.dumps(event) + "\n"
 
-    return StreamingResponse(generate_all_responses(), media_type="text/plain")
+    if background or transport == "sse":
+        saved = {}
+        events = participant_events(all_streams(saved), names, saved, ASK_ALL_MUX[mode], models)
+        job = generation_jobs.create(events, "ask_all", meeting_id, list(names))
+        return job_sse_response(job, announce=True) if transport == "sse" else job_response(job)
+    if mode == "concurrent":
+        return DisconnectAwareStreamingResponse(generate_concurrent_responses(), media_type="application/x-ndjson")
+    if mode == "ordered":
+        return DisconnectAwareStreamingResponse(generate_ordered_responses(), media_type="text/plain")
+    return DisconnectAwareStreamingResponse(generate_all_responses(), media_type="text/plain")
 
 
 @router.post("/{meeting_id}/upload-image")
@@ -830,6 +1028,7 @@ async def upload_meeting_image(
         db.add(db_image)
         db.commit()
         db.refresh(db_image)
+        meeting_events.publish(meeting_id, IMAGE_LINKED, image_payload(db_image))
 
         return {
             "id": db_image.id,
@@ -892,7 +1091,7 @@ def complete_action_item(item_id: int, db: Session = Depends(get_db)):
     return item
 
 
-async def extract_action_items(db: Session, meeting_id: int, llm_service):
+async def extract_action_items(db: AsyncSession, meeting_id: int, llm_service):
     # Implementation skipped for brevity
     pass
 
@@ -917,12 +1116,16 @@ def delete_meeting(meeting_id: int, db: Session = Depends(get_db)):
     db.query(MeetingImage).filter(MeetingImage.meeting_id == meeting_id).delete()
     db.delete(meeting)
     db.commit()
+    meeting_context_cache.drop(meeting_id)
+    meeting_events.drop(meeting_id)
     return {"message": "Meeting deleted successfully"}
 
 @router.post("/{meeting_id}/autonomous")
 async def start_autonomous_session(
-    meeting_id: int, request: schemas.SendMessageRequest, db: Session = Depends(get_db)
+    meeting_id: int, request: schemas.SendMessageRequest, transport: str = "text", db: Session = Depends(get_db)
 ):
+    """NDJSON session updates; transport=sse runs the session as a resumable job streamed as SSE"""
+    check_transport(transport)
     print(f"DEBUG: ROUTE HIT! Meeting ID: {meeting_id}")
     
     meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
@@ -936,6 +1139,16 @@ async def start_autonomous_session(
         .all()
     print(f"DEBUG: Found {len(participants)} participants.")
 
+    if transport == "sse":
+        staff_map = {p.staff.name: p.staff.id for p in participants if p.staff}
+        session = langgraph_service.run_autonomous_session(
+            meeting_id, request.content, participants, request.target_path
+        )
+        job = generation_jobs.create(
+            autonomous_events(session, staff_map), "autonomous", meeting_id, list(staff_map.values())
+        )
+        return job_sse_response(job, announce=True)
+
     async def event_generator():
         print("DEBUG: Entering event_generator...")
         try:
@@ -5,6 +5,8 @@ from pathlib import Path
 from dotenv import load_dotenv
 from pydantic import BaseModel
 from ..config import settings as app_settings
+from ..services.http_pool import http_client_pool
+from ..services.model_catalog import ollama_model_catalog
 
 router = APIRouter(prefix="/settings", tags=["settings"])
 
@@ -52,7 +54,7 @@ class SettingsUpdate(BaseModel):
     runpod_url: str | None = None
 
 @router.post("/", response_model=dict)
-def update_settings(payload: SettingsUpdate):
+async def update_settings(payload: SettingsUpdate):
     try:
         if payload.gemini_api_key is not None:
             # Update .env
@@ -72,6 +74,10 @@ def update_settings(payload: SettingsUpdate):
             # Update Runtime Config
             app_settings.ollama_base_url = clean_url
             
+            # Point the shared Ollama client at the new host
+            await http_client_pool.rebuild(clean_url)
+            ollama_model_catalog.refresh(clean_url)
+            
         return {
             "gemini_api_key": app_settings.gemini_api_key,
             "runpod_url": app_settings.ollama_base_url,
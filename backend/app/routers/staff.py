@@ -6,6 +6,7 @@ from datetime import datetime
 from ..database import get_db
 from ..models import Staff, Company
 from .. import schemas
+from ..services.prompt_cache import prompt_cache
 
 router = APIRouter(prefix="/staff", tags=["staff"])
 
@@ -124,6 +125,7 @@ def update_staff(
         setattr(staff, field, value)
     
     db.commit()
+    prompt_cache.bump_staff(staff_id)
     db.refresh(staff)
     return staff
 
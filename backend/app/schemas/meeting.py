@@ -6,6 +6,8 @@ class ParticipantConfig(BaseModel):
     staff_id: int
     llm_provider: str = "gemini"
     llm_model: Optional[str] = None
+    fallback_provider: Optional[str] = None
+    fallback_model: Optional[str] = None
 
 class MeetingCreate(BaseModel):
     title: str
@@ -21,6 +23,8 @@ class MeetingParticipantInfo(BaseModel):
     department_name: Optional[str] = None
     llm_provider: str
     llm_model: Optional[str]
+    fallback_provider: Optional[str] = None
+    fallback_model: Optional[str] = None
     context_settings: Optional[Dict[str, bool]] = None
     joined_at: datetime
     
@@ -35,7 +39,9 @@ class MeetingMessage(BaseModel):
     sender_name: str
     content: str
     image_url: Optional[str] = None
+    truncated: Optional[bool] = False
     created_at: datetime
+    updated_at: Optional[datetime] = None
     
     class Config:
         from_attributes = True
@@ -61,6 +67,8 @@ class SendMessageRequest(BaseModel):
     target_path: Optional[str] = None
     custom_system_prompt: Optional[str] = None
     custom_user_content: Optional[str] = None
+    bypass_cache: bool = False
+    prompt_handle: Optional[str] = None  # From /messages/preview; reuses that prompt if still current
 
 class UpdateMessageRequest(BaseModel):
     content: str
@@ -71,12 +79,28 @@ class SendMessageToAllRequest(BaseModel):
     image_data: Optional[str] = None
     custom_system_prompt: Optional[str] = None
     custom_user_content: Optional[str] = None
+    bypass_cache: bool = False
 
 class PromptBlock(BaseModel):
     id: str
     label: str
     content: str
     enabled: bool
+    tokens: Optional[int] = None
+    packing: Optional[Dict[str, Any]] = None
+
+class PromptTokenCounts(BaseModel):
+    system_prompt: int
+    user_content: int
+    images: int
+    total: int
+    tokenizer: str
+
+class PromptPackingReport(BaseModel):
+    budget: int
+    used: int
+    dropped: List[str] = []
+    truncated: List[str] = []
 
 class PromptPreviewResponse(BaseModel):
     system_prompt: str
@@ -86,6 +110,9 @@ class PromptPreviewResponse(BaseModel):
     max_tokens: int
     image_urls: List[str] = []
     context_blocks: List[PromptBlock] = []
+    token_counts: Optional[PromptTokenCounts] = None
+    packing: Optional[PromptPackingReport] = None
+    prompt_handle: Optional[str] = None  # Pass back in SendMessageRequest to send this exact prompt
 
 class UpdateMeetingStatusRequest(BaseModel):
     status: str
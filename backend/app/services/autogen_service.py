@@ -2,8 +2,39 @@
 
 import os
 import autogen
+from types import SimpleNamespace
 from typing import List, Dict, Any
 from ..config import settings
+from .mock_provider import mock_provider
+
+
+class MockAutoGenClient:
+    """
+    AutoGen custom model client backed by the offline mock provider.
+    Registered on agents whose config uses model_client_cls="MockAutoGenClient".
+    """
+
+    def __init__(self, config: Dict[str, Any], **kwargs):
+        self.model = config.get("model", "mock")
+
+    def create(self, params: Dict[str, Any]):
+        messages = params.get("messages", [])
+        system_prompt = "\n".join(str(m.get("content") or "") for m in messages if m.get("role") == "system")
+        prompt = "\n".join(str(m.get("content") or "") for m in messages if m.get("role") != "system")
+        content = mock_provider.complete_sync(prompt, system_prompt, self.model)
+        message = SimpleNamespace(content=content, function_call=None, tool_calls=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], model=self.model, cost=0.0)
+
+    def message_retrieval(self, response) -> List[str]:
+        return [choice.message.content for choice in response.choices]
+
+    def cost(self, response) -> float:
+        return 0.0
+
+    @staticmethod
+    def get_usage(response) -> Dict[str, Any]:
+        return {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "cost": 0.0, "model": response.model}
+
 
 class AutoGenService:
     """
@@ -48,6 +79,12 @@ class AutoGenService:
                 "api_type": "google" 
             })
 
+        elif provider == "mock":
+            config_list.append({
+                "model": model or "mock",
+                "model_client_cls": "MockAutoGenClient",
+            })
+
         return config
     
     def create_agent(self, staff_name: str, system_prompt: str, provider: str, model: str) -> autogen.AssistantAgent:
@@ -73,6 +110,8 @@ class AutoGenService:
             llm_config=llm_config,
             description=f"This is {staff_name}, an AI staff member."
         )
+        if provider == "mock":
+            agent.register_model_client(model_client_cls=MockAutoGenClient)
         return agent
 
     def create_user_proxy(self) -> autogen.UserProxyAgent:
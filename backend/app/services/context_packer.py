@@ -0,0 +1,109 @@
+# backend\app\services\context_packer.py
+from typing import Dict, List, Optional, Any
+from ..config import settings
+from .token_counter import token_counter
+
+TRUNCATION_MARKER = "\n[...truncated to fit the context window]"
+
+
+class ContextPacker:
+    """Fits system prompt blocks into a token budget by priority, trimming or dropping what does not fit"""
+
+    # Below this many free tokens a block is dropped rather than truncated to a useless stub
+    MIN_TRUNCATED_TOKENS = 32
+
+    def priorities(self) -> List[str]:
+        return [block_id.strip() for block_id in settings.context_block_priority.split(",") if block_id.strip()]
+
+    def _ordered(self, blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        rank = {block_id: i for i, block_id in enumerate(self.priorities())}
+        return sorted(blocks, key=lambda b: rank.get(b["id"], len(rank)))
+
+    def _truncate_text(self, content: str, budget: int, provider: str, model: Optional[str]) -> str:
+        """Longest head of content (plus marker) that fits in budget tokens"""
+        low, high = 0, len(content)
+        while low < high:
+            mid = (low + high + 1) // 2
+            if token_counter.count(content[:mid] + TRUNCATION_MARKER, provider, model) <= budget:
+                low = mid
+            else:
+                high = mid - 1
+        return content[:low] + TRUNCATION_MARKER if low else ""
+
+    def _trim_segments(self, block: Dict[str, Any], budget: int, provider: str, model: Optional[str]) -> str:
+        """Drop the oldest segments (e.g. meeting messages) until the block fits"""
+        segments = block["segments"]
+        kept: List[str] = []
+        used = token_counter.count(block["header"], provider, model)
+        for segment in reversed(segments):
+            cost = token_counter.count(segment, provider, model) + 1  # +1 for the joining newline
+            if used + cost > budget:
+                break
+            kept.insert(0, segment)
+            used += cost
+        block["segments_dropped"] = len(segments) - len(kept)
+        return block["header"] + "\n".join(kept) if kept else ""
+
+    def pack(
+        self,
+        blocks: List[Dict[str, Any]],
+        budget: int,
+        provider: str = "gemini",
+        model: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Mutates blocks in place: each enabled block gets "tokens" and a "packing" status
+        (kept / truncated / dropped). Returns a summary report for the preview.
+        """
+        remaining = max(0, budget)
+        report = {"budget": budget, "used": 0, "dropped": [], "truncated": []}
+
+        tokenizer = token_counter.tokenizer_name(provider, model)
+        for block in self._ordered(blocks):
+            # Cached static blocks carry their counts per tokenizer (see services/prompt_cache.py)
+            counts = block.get("token_counts")
+            original = counts.get(tokenizer) if counts is not None else None
+            if original is None:
+                original = token_counter.count(block["content"], provider, model)
+                if counts is not None:
+                    counts[tokenizer] = original
+            block["tokens"] = original
+            if not block["enabled"]:
+                continue
+
+            status = "kept"
+            if original > remaining:
+                content = ""
+                if remaining >= self.MIN_TRUNCATED_TOKENS:
+                    if block.get("segments"):
+                        content = self._trim_segments(block, remaining, provider, model)
+                    else:
+                        content = self._truncate_text(block["content"], remaining, provider, model)
+
+                if content:
+                    status = "truncated"
+                    block["content"] = content
+                    block["tokens"] = token_counter.count(content, provider, model)
+                    report["truncated"].append(block["id"])
+                else:
+                    status = "dropped"
+                    block["enabled"] = False
+                    block["tokens"] = 0
+                    report["dropped"].append(block["id"])
+
+            remaining -= block["tokens"]
+            report["used"] += block["tokens"]
+            block["packing"] = {"status": status, "original_tokens": original}
+            if "segments_dropped" in block:
+                block["packing"]["messages_dropped"] = block.pop("segments_dropped")
+
+        # Internal trimming helpers are not part of the block payload
+        for block in blocks:
+            block.pop("segments", None)
+            block.pop("header", None)
+            block.pop("token_counts", None)
+        return report
+
+
+# Singleton instance
+context_packer = ContextPacker()
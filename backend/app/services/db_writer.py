@@ -0,0 +1,67 @@
+# backend\app\services\db_writer.py
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from ..config import settings
+
+
+class DbWriter:
+    """
+    Runs blocking database writes from async code off the event loop. With
+    db_single_writer on, they all go through one dedicated thread, so commits from
+    concurrent streams queue up in-process instead of contending for SQLite's write lock.
+    """
+
+    def __init__(self):
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self.counters = {"writes": 0, "errors": 0, "max_pending": 0, "wait_ms_total": 0.0}
+
+    def _executor_for_writes(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        call = functools.partial(fn, *args, **kwargs)
+        if not settings.db_single_writer:
+            return await asyncio.to_thread(call)
+
+        queued_at = time.monotonic()
+
+        def timed():
+            self.counters["wait_ms_total"] += (time.monotonic() - queued_at) * 1000
+            return call()
+
+        self._pending += 1
+        self.counters["max_pending"] = max(self.counters["max_pending"], self._pending)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor_for_writes(), timed)
+        except Exception:
+            self.counters["errors"] += 1
+            raise
+        finally:
+            self._pending -= 1
+            self.counters["writes"] += 1
+
+    def shutdown(self):
+        """Let queued writes finish (called from the app lifespan)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        writes = self.counters["writes"]
+        return {
+            "single_writer": settings.db_single_writer,
+            "pending": self._pending,
+            **self.counters,
+            "wait_ms_total": round(self.counters["wait_ms_total"], 2),
+            "avg_wait_ms": round(self.counters["wait_ms_total"] / writes, 2) if writes else 0.0,
+        }
+
+
+# Singleton instance
+db_writer = DbWriter()
@@ -0,0 +1,201 @@
+# backend\app\services\generation_jobs.py
+import asyncio
+import time
+import uuid
+from collections import deque
+from contextlib import aclosing
+from itertools import islice
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+from ..config import settings
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_STATES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+
+class JobBufferExpired(Exception):
+    """The requested events were dropped from the bounded job buffer"""
+
+    def __init__(self, first_seq: int):
+        super().__init__(f"Events before seq {first_seq} are no longer buffered")
+        self.first_seq = first_seq
+
+
+class GenerationJob:
+    """
+    One generation running in a worker task. Events from the source (dicts with a "type")
+    are numbered with a job-wide `seq` and kept in a bounded buffer; chunk events also carry
+    the character `offset` of their text within that staff member's answer.
+    """
+
+    def __init__(self, kind: str, meeting_id: Optional[int], staff_ids: List[int]):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.meeting_id = meeting_id
+        self.staff_ids = staff_ids
+        self.status = JOB_QUEUED
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.message_ids: Dict[int, int] = {}
+        self.last_seq = 0
+        self._events: Deque[Dict[str, Any]] = deque()
+        self._buffered_chars = 0
+        self._offsets: Dict[Any, int] = {}
+        self._wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def first_seq(self) -> int:
+        """Oldest seq still buffered (last_seq + 1 when the buffer is empty)"""
+        return self._events[0]["seq"] if self._events else self.last_seq + 1
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def append(self, event: Dict[str, Any]):
+        self.last_seq += 1
+        event = {"seq": self.last_seq, **event}
+        if event["type"] == "chunk":
+            key = event.get("staff_id")
+            event["offset"] = self._offsets.get(key, 0)
+            self._offsets[key] = event["offset"] + len(event["content"])
+        elif event["type"] == "done" and event.get("message_id") is not None:
+            self.message_ids[event["staff_id"]] = event["message_id"]
+        self._events.append(event)
+        self._buffered_chars += len(event.get("content", ""))
+        # Bounded buffer: drop the oldest events, always keeping the newest one
+        while len(self._events) > 1 and (
+            self._buffered_chars > settings.generation_job_buffer_chars
+            or len(self._events) > settings.generation_job_buffer_events
+        ):
+            dropped = self._events.popleft()
+            self._buffered_chars -= len(dropped.get("content", ""))
+        self._notify()
+
+    def _notify(self):
+        self._wakeup.set()
+        self._wakeup = asyncio.Event()
+
+    async def run(self, source: AsyncIterator[Dict[str, Any]]):
+        self.status = JOB_RUNNING
+        try:
+            async with aclosing(source):
+                async for event in source:
+                    self.append(event)
+            self.status = JOB_COMPLETED
+        except asyncio.CancelledError:
+            self.status = JOB_CANCELLED
+            self.append({"type": "cancelled"})
+            raise
+        except Exception as e:
+            print(f"ERROR: Generation job {self.id} failed: {e}")
+            self.status = JOB_FAILED
+            self.error = str(e)
+            self.append({"type": "error", "content": f"Error: {e}"})
+        finally:
+            self.finished_at = time.time()
+            self._notify()
+
+    async def events(self, after: int = 0) -> AsyncIterator[Dict[str, Any]]:
+        """Buffered events with seq > after, then live ones until the job finishes"""
+        while True:
+            wakeup = self._wakeup
+            if after + 1 < self.first_seq:
+                raise JobBufferExpired(self.first_seq)
+            pending = list(islice(self._events, max(0, after + 1 - self.first_seq), None))
+            for event in pending:
+                yield event
+                after = event["seq"]
+            if self.finished and after >= self.last_seq:
+                return
+            if not pending:
+                await wakeup.wait()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "meeting_id": self.meeting_id,
+            "staff_ids": self.staff_ids,
+            "status": self.status,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "message_ids": self.message_ids,
+            "first_seq": self.first_seq,
+            "last_seq": self.last_seq,
+        }
+
+
+class GenerationJobManager:
+    """Registry of generation jobs; finished jobs expire after generation_job_ttl seconds"""
+
+    def __init__(self):
+        self._jobs: Dict[str, GenerationJob] = {}
+        self.counters = {"created": 0, "completed": 0, "failed": 0, "cancelled": 0, "expired": 0}
+
+    def create(
+        self, source: AsyncIterator[Dict[str, Any]], kind: str, meeting_id: Optional[int], staff_ids: List[int]
+    ) -> GenerationJob:
+        self.prune()
+        job = GenerationJob(kind, meeting_id, staff_ids)
+        self._jobs[job.id] = job
+        job.task = asyncio.create_task(job.run(source))
+        job.task.add_done_callback(lambda _: self._finished(job))
+        self.counters["created"] += 1
+        return job
+
+    def _finished(self, job: GenerationJob):
+        if not job.finished:  # Cancelled before the worker got to run
+            job.status = JOB_CANCELLED
+            job.finished_at = time.time()
+            job.append({"type": "cancelled"})
+        if job.status in self.counters:
+            self.counters[job.status] += 1
+
+    def get(self, job_id: str) -> Optional[GenerationJob]:
+        self.prune()
+        return self._jobs.get(job_id)
+
+    def list(self, meeting_id: Optional[int] = None) -> List[GenerationJob]:
+        self.prune()
+        return [job for job in self._jobs.values() if meeting_id is None or job.meeting_id == meeting_id]
+
+    def cancel(self, job: GenerationJob) -> bool:
+        if job.finished or job.task is None:
+            return False
+        job.task.cancel()
+        return True
+
+    def prune(self):
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and now - job.finished_at > settings.generation_job_ttl
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+        self.counters["expired"] += len(expired)
+
+    async def aclose(self):
+        """Cancel running jobs on shutdown (their partial answers are saved as truncated)"""
+        tasks = [job.task for job in self._jobs.values() if job.task is not None and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        self.prune()
+        states: Dict[str, int] = {}
+        for job in self._jobs.values():
+            states[job.status] = states.get(job.status, 0) + 1
+        return {**self.counters, "jobs": len(self._jobs), "states": states}
+
+
+# Singleton instance
+generation_jobs = GenerationJobManager()
@@ -0,0 +1,167 @@
+# backend\app\services\http_pool.py
+import asyncio
+import time
+import httpx
+from typing import Dict, Optional, Any
+from ..config import settings
+
+try:
+    import h2  # noqa: F401 - only needed so httpx can negotiate HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class HttpClientPool:
+    """Shared app-lifetime httpx clients (one per base URL) with keep-alive and pool stats"""
+
+    RETIRE_POLL_SECONDS = 1.0
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+        # Swapped-out clients that may still be serving streams; closed once idle
+        self._retiring: Dict[httpx.AsyncClient, asyncio.Task] = {}
+
+    def _new_stats(self) -> Dict[str, float]:
+        return {
+            "requests": 0,
+            "connections_opened": 0,
+            "wait_ms_total": 0.0,
+            "wait_ms_max": 0.0,
+            "headers_ms_total": 0.0,
+            "responses": 0,
+        }
+
+    def _build_client(self, base_url: str) -> httpx.AsyncClient:
+        stats = self._stats.setdefault(base_url, self._new_stats())
+
+        async def on_request(request: httpx.Request):
+            started = time.perf_counter()
+            request.extensions["myvco_started"] = started
+            stats["requests"] += 1
+
+            async def trace(event_name: str, info: Dict[str, Any]):
+                # Pool wait = time until headers start going out (includes connect on a cold pool)
+                if event_name == "connection.connect_tcp.complete":
+                    stats["connections_opened"] += 1
+                elif event_name.endswith("send_request_headers.started"):
+                    wait_ms = (time.perf_counter() - started) * 1000
+                    stats["wait_ms_total"] += wait_ms
+                    stats["wait_ms_max"] = max(stats["wait_ms_max"], wait_ms)
+
+            request.extensions["trace"] = trace
+
+        async def on_response(response: httpx.Response):
+            started = response.request.extensions.get("myvco_started")
+            if started is not None:
+                stats["responses"] += 1
+                stats["headers_ms_total"] += (time.perf_counter() - started) * 1000
+
+        limits = httpx.Limits(
+            max_connections=settings.ollama_max_connections,
+            max_keepalive_connections=settings.ollama_max_keepalive_connections,
+            keepalive_expiry=settings.ollama_keepalive_expiry,
+        )
+        timeout = httpx.Timeout(
+            settings.ollama_read_timeout,
+            connect=settings.ollama_connect_timeout,
+            pool=settings.ollama_pool_timeout,
+        )
+        stats["http2"] = settings.ollama_http2 and HTTP2_AVAILABLE
+        return httpx.AsyncClient(
+            base_url=base_url,
+            limits=limits,
+            timeout=timeout,
+            http2=stats["http2"],
+            event_hooks={"request": [on_request], "response": [on_response]},
+        )
+
+    def get_client(self, base_url: Optional[str] = None) -> httpx.AsyncClient:
+        """Return the pooled client for base_url (defaults to the configured Ollama URL)"""
+        base_url = (base_url or settings.ollama_base_url).rstrip("/")
+        client = self._clients.get(base_url)
+        if client is None or client.is_closed:
+            client = self._build_client(base_url)
+            self._clients[base_url] = client
+        return client
+
+    async def startup(self):
+        """Open the client for the configured Ollama URL (called from the app lifespan)"""
+        if settings.ollama_base_url:
+            self.get_client()
+
+    async def rebuild(self, base_url: str):
+        """Swap to a new base URL, retiring clients for URLs that are no longer configured"""
+        base_url = base_url.rstrip("/")
+        for url in list(self._clients):
+            if url != base_url:
+                client = self._clients.pop(url)
+                self._stats.pop(url, None)
+                self._retire(client)
+        if base_url:
+            self.get_client(base_url)
+
+    def _in_use(self, client: httpx.AsyncClient) -> bool:
+        """Whether any request or response stream is still open on the client"""
+        try:
+            return bool(client._transport._pool._requests)
+        except AttributeError:
+            return True  # Unknown transport: rely on the grace period
+
+    def _retire(self, client: httpx.AsyncClient):
+        """Close the client once its in-flight streams finish, or after the grace period"""
+        if client.is_closed or client in self._retiring:
+            return
+
+        async def close_when_idle():
+            deadline = time.monotonic() + settings.ollama_client_retire_grace
+            try:
+                while self._in_use(client) and time.monotonic() < deadline:
+                    await asyncio.sleep(self.RETIRE_POLL_SECONDS)
+                await client.aclose()
+            finally:
+                self._retiring.pop(client, None)
+
+        self._retiring[client] = asyncio.create_task(close_when_idle())
+
+    async def aclose(self):
+        """Close every pooled and retiring client (called on shutdown)"""
+        clients = list(self._clients.values()) + list(self._retiring)
+        self._clients.clear()
+        for task in list(self._retiring.values()):
+            task.cancel()
+        self._retiring.clear()
+        for client in clients:
+            await client.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-base-URL pool statistics"""
+        result = {}
+        for base_url, client in self._clients.items():
+            raw = self._stats.get(base_url, self._new_stats())
+            connections = []
+            try:
+                connections = list(client._transport._pool.connections)
+            except AttributeError:
+                pass
+            idle = sum(1 for conn in connections if conn.is_idle())
+            requests = raw["requests"] or 1
+            responses = raw["responses"] or 1
+            result[base_url] = {
+                "http2": bool(raw.get("http2")),
+                "open_connections": len(connections),
+                "idle_connections": idle,
+                "active_connections": len(connections) - idle,
+                "requests": raw["requests"],
+                "connections_opened": raw["connections_opened"],
+                "connection_reuse_ratio": round(1 - raw["connections_opened"] / requests, 3) if raw["requests"] else 0.0,
+                "avg_wait_ms": round(raw["wait_ms_total"] / requests, 2),
+                "max_wait_ms": round(raw["wait_ms_max"], 2),
+                "avg_time_to_headers_ms": round(raw["headers_ms_total"] / responses, 2),
+            }
+        return result
+
+
+# Singleton instance
+http_client_pool = HttpClientPool()
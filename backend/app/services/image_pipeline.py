@@ -0,0 +1,225 @@
+# backend\app\services\image_pipeline.py
+import asyncio
+import base64
+import hashlib
+import io
+import math
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Any
+import PIL.Image
+from ..config import settings
+
+
+def fitted_size(size: Tuple[int, int], max_dim: int) -> Tuple[int, int]:
+    """Size after img.thumbnail((max_dim, max_dim)), rounded the way PIL rounds it"""
+    width, height = size
+    if width <= max_dim and height <= max_dim:
+        return size
+
+    def round_aspect(number: float, key) -> int:
+        return max(min(math.floor(number), math.ceil(number), key=key), 1)
+
+    aspect = width / height
+    if aspect <= 1:
+        return round_aspect(max_dim * aspect, key=lambda n: abs(aspect - n / max_dim)), max_dim
+    return max_dim, round_aspect(max_dim / aspect, key=lambda n: 0 if n == 0 else abs(aspect - max_dim / n))
+
+
+class ProcessedImage:
+    """A downscaled, re-encoded image plus its lazily built PIL and base64 forms"""
+
+    def __init__(self, content_hash: str, data: bytes, mime_type: str, size: Tuple[int, int]):
+        self.content_hash = content_hash
+        self.data = data
+        self.mime_type = mime_type
+        self.size = size
+        self.pil_image: Optional[PIL.Image.Image] = None
+        self.base64: Optional[str] = None
+
+    @property
+    def memory_bytes(self) -> int:
+        total = len(self.data)
+        if self.pil_image is not None:
+            total += self.size[0] * self.size[1] * len(self.pil_image.getbands())
+        if self.base64 is not None:
+            total += len(self.base64)
+        return total
+
+
+class ImagePipeline:
+    """Loads images for LLM requests off the event loop, downscaled per provider and cached"""
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.image_pipeline_workers, thread_name_prefix="image-pipeline"
+        )
+        self._lock = threading.Lock()
+        # abs path -> (mtime_ns, size, content hash), so unchanged files are never re-read;
+        # pruned together with the processed images below
+        self._hashes: Dict[str, Tuple[int, int, str]] = {}
+        # (content hash, max dimension) -> processed image, in LRU order
+        self._entries: "OrderedDict[Tuple[str, int], ProcessedImage]" = OrderedDict()
+        self._memory_bytes = 0
+        self.counters = {"hits": 0, "misses": 0, "evictions": 0, "bytes_in": 0, "bytes_out": 0}
+
+    def max_dim_for(self, provider: str) -> int:
+        return getattr(settings, f"image_max_dim_{provider}", settings.image_max_dim_gemini)
+
+    def content_hash(self, path: str) -> Optional[str]:
+        """Content hash for a path if it has already been through the pipeline"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return self._known_hash(os.path.abspath(path), stat)
+
+    def _known_hash(self, abs_path: str, stat: os.stat_result) -> Optional[str]:
+        known = self._hashes.get(abs_path)
+        if known is None or known[:2] != (stat.st_mtime_ns, stat.st_size):
+            return None
+        return known[2]
+
+    def sent_size(self, path: str, provider: str) -> Optional[Tuple[int, int]]:
+        """Dimensions the image has once downscaled for `provider`; reads only the header on a miss"""
+        max_dim = self.max_dim_for(provider)
+        content_hash = self.content_hash(path)
+        if content_hash is not None:
+            with self._lock:
+                entry = self._entries.get((content_hash, max_dim))
+            if entry is not None:
+                return entry.size
+        try:
+            with PIL.Image.open(path) as img:
+                return fitted_size(img.size, max_dim)
+        except Exception:
+            return None
+
+    def _encode(self, raw: bytes, max_dim: int) -> Tuple[bytes, str, Tuple[int, int]]:
+        img = PIL.Image.open(io.BytesIO(raw))
+        original_format = img.format
+        img.load()
+
+        resized = max(img.size) > max_dim
+        if resized:
+            img.thumbnail((max_dim, max_dim), PIL.Image.LANCZOS)
+
+        has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+        buffer = io.BytesIO()
+        if has_alpha:
+            img.convert("RGBA").save(buffer, format="PNG", optimize=True)
+            data, mime_type = buffer.getvalue(), "image/png"
+        else:
+            img.convert("RGB").save(buffer, format="JPEG", quality=settings.image_jpeg_quality, optimize=True)
+            data, mime_type = buffer.getvalue(), "image/jpeg"
+
+        # Keep the original bytes when re-encoding would not make the payload smaller
+        if not resized and original_format in ("JPEG", "PNG") and len(raw) <= len(data):
+            data, mime_type = raw, f"image/{original_format.lower()}"
+        return data, mime_type, img.size
+
+    def _load_sync(self, path: str, max_dim: int, form: str) -> ProcessedImage:
+        abs_path = os.path.abspath(path)
+        stat = os.stat(abs_path)
+
+        entry = None
+        with self._lock:
+            content_hash = self._known_hash(abs_path, stat)
+            if content_hash is not None:
+                entry = self._entries.get((content_hash, max_dim))
+                if entry is not None:
+                    self._entries.move_to_end((content_hash, max_dim))
+                    self.counters["hits"] += 1
+
+        if entry is None:
+            with open(abs_path, "rb") as f:
+                raw = f.read()
+            content_hash = hashlib.sha256(raw).hexdigest()
+            data, mime_type, size = self._encode(raw, max_dim)
+            entry = ProcessedImage(content_hash, data, mime_type, size)
+            with self._lock:
+                self._hashes[abs_path] = (stat.st_mtime_ns, stat.st_size, content_hash)
+                self.counters["misses"] += 1
+                self.counters["bytes_in"] += len(raw)
+                self.counters["bytes_out"] += len(data)
+                existing = self._entries.get((content_hash, max_dim))
+                if existing is not None:
+                    entry = existing
+                else:
+                    self._entries[(content_hash, max_dim)] = entry
+                    self._memory_bytes += entry.memory_bytes
+
+        # Build the requested form once; later turns reuse it
+        pil_image = encoded = None
+        if form == "pil" and entry.pil_image is None:
+            pil_image = PIL.Image.open(io.BytesIO(entry.data))
+            pil_image.load()
+        elif form == "base64" and entry.base64 is None:
+            encoded = base64.b64encode(entry.data).decode("utf-8")
+
+        with self._lock:
+            before = entry.memory_bytes
+            if pil_image is not None and entry.pil_image is None:
+                entry.pil_image = pil_image
+            if encoded is not None and entry.base64 is None:
+                entry.base64 = encoded
+            if self._entries.get((entry.content_hash, max_dim)) is entry:
+                self._memory_bytes += entry.memory_bytes - before
+            self._evict()
+        return entry
+
+    def _evict(self):
+        limit = settings.image_cache_max_mb * 1024 * 1024
+        evicted_any = False
+        while self._memory_bytes > limit and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._memory_bytes -= evicted.memory_bytes
+            self.counters["evictions"] += 1
+            evicted_any = True
+        if not evicted_any:
+            return
+        # Forget paths whose content is no longer cached at any size
+        cached = {content_hash for content_hash, _ in self._entries}
+        self._hashes = {path: known for path, known in self._hashes.items() if known[2] in cached}
+
+    async def load(
+        self, image_paths: List[str], provider: str, form: str
+    ) -> Tuple[List[ProcessedImage], List[Tuple[str, Exception]]]:
+        """Load all images of a turn concurrently; returns (images, [(path, error), ...])"""
+        loop = asyncio.get_running_loop()
+        max_dim = self.max_dim_for(provider)
+        results = await asyncio.gather(
+            *[loop.run_in_executor(self._executor, self._load_sync, path, max_dim, form) for path in image_paths],
+            return_exceptions=True,
+        )
+        images, errors = [], []
+        for path, result in zip(image_paths, results):
+            if isinstance(result, Exception):
+                errors.append((path, result))
+            else:
+                images.append(result)
+        return images, errors
+
+    async def load_for_gemini(self, image_paths: List[str]) -> Tuple[List[PIL.Image.Image], List[Tuple[str, Exception]]]:
+        images, errors = await self.load(image_paths, "gemini", "pil")
+        return [img.pil_image for img in images], errors
+
+    async def load_for_ollama(self, image_paths: List[str]) -> Tuple[List[str], List[Tuple[str, Exception]]]:
+        images, errors = await self.load(image_paths, "ollama", "base64")
+        return [img.base64 for img in images], errors
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.counters,
+                "entries": len(self._entries),
+                "paths": len(self._hashes),
+                "memory_bytes": self._memory_bytes,
+                "memory_limit_bytes": settings.image_cache_max_mb * 1024 * 1024,
+            }
+
+
+# Singleton instance
+image_pipeline = ImagePipeline()
@@ -12,12 +12,34 @@ from langgraph.graph import StateGraph, START, END
 from langgraph.prebuilt import ToolNode
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_google_genai import ChatGoogleGenerativeAI 
+from ..config import settings
+from .mock_provider import MockChatModel
+from .meeting_events import meeting_events, message_payload, MESSAGE_CREATED
+from .db_writer import db_writer
+from .meeting_context import meeting_context_cache
 
 logger = logging.getLogger(__name__)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 env_path = os.path.join(BASE_DIR, ".env")
 load_dotenv(dotenv_path=env_path)
 
+def save_autonomous_message(meeting_id: int, staff_id, speaker_name: str, content: str):
+    from ..database import SessionLocal
+    from ..models import MeetingMessage
+
+    with SessionLocal() as db:
+        db_msg = MeetingMessage(
+            meeting_id=meeting_id,
+            staff_id=staff_id,
+            sender_type="staff",
+            sender_name=speaker_name,
+            content=content,
+        )
+        db.add(db_msg)
+        db.commit()
+        meeting_context_cache.add(db_msg)
+        meeting_events.publish(meeting_id, MESSAGE_CREATED, message_payload(db_msg))
+
 class AgentState(TypedDict):
     messages: Annotated[Sequence[BaseMessage], add_messages]
     next_speaker: str
@@ -73,12 +95,29 @@ def get_workspace_tools(target_path: str) -> List:
 
 class LangGraphService:
     def __init__(self):
+        if settings.autonomous_llm_provider == "mock":
+            # Offline sessions for load tests; no API key needed
+            self.llm = MockChatModel()
+            return
         api_key = os.getenv("GEMINI_API_KEY")
         if not api_key:
             logger.error("GEMINI_API_KEY is missing from environment variables!")
             raise ValueError("API key required for Gemini Developer API.")
         self.llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", google_api_key=api_key)
 
+    def _supervisor_llm(self, staff_names: List[str]):
+        if not isinstance(self.llm, MockChatModel):
+            return self.llm
+
+        # Scripted supervisor: hand the floor to each staff member in turn, then finish
+        def next_speaker(messages: List[BaseMessage]) -> str:
+            turns = sum(1 for m in messages if isinstance(m, AIMessage))
+            if not staff_names or turns >= settings.mock_llm_autonomous_turns:
+                return "FINISH"
+            return staff_names[turns % len(staff_names)]
+
+        return self.llm.model_copy(update={"responder": next_speaker})
+
     def build_graph(self, meeting_id: int, participants: list, target_path: str = None):
         builder = StateGraph(AgentState)
         staff_names = [p.staff.name for p in participants if p.staff is not None]
@@ -98,7 +137,7 @@ class LangGraphService:
                 ("system", system_prompt),
                 MessagesPlaceholder(variable_name="messages"),
             ])
-            chain = prompt | self.llm
+            chain = prompt | self._supervisor_llm(staff_names)
             response = await chain.ainvoke(state) # Async invocation!
 
             content = response.content.strip()
@@ -181,20 +220,14 @@ class LangGraphService:
                                 if content_str.strip():
                                     speaker_name = getattr(msg, "name", node_name)
                                     
-                                    # 2. SAVE TO DATABASE (Using a local session)
-                                    from ..database import SessionLocal
-                                    from ..models import MeetingMessage
-                                    
-                                    with SessionLocal() as db:
-                                        db_msg = MeetingMessage(
-                                            meeting_id=meeting_id,
-                                            staff_id=staff_map.get(speaker_name),
-                                            sender_type="staff",
-                                            sender_name=speaker_name,
-                                            content=content_str,
-                                        )
-                                        db.add(db_msg)
-                                        db.commit()
+                                    # 2. SAVE TO DATABASE (Using a local session, on the writer thread)
+                                    await db_writer.run(
+                                        save_autonomous_message,
+                                        meeting_id,
+                                        staff_map.get(speaker_name),
+                                        speaker_name,
+                                        content_str,
+                                    )
 
                                     # 3. Stream to frontend
                                     yield {
@@ -0,0 +1,110 @@
+# backend\app\services\library_resolver.py
+import re
+import threading
+from typing import Any, Dict, FrozenSet, Optional, Set, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from ..models import LibraryItem
+
+# One pass over the text; each @word is looked up in the index, so the cost does not
+# grow with the number of library items
+MENTION_PATTERN = re.compile(r"@(\w+)")
+
+
+class LibraryResolver:
+    """
+    Expands @slug references to library item content from an in-memory slug index.
+    The index is loaded with one query and dropped by the /library routes on every
+    change; `version` moves with each invalidation so callers can key caches on it.
+    Items may reference other items; expansions are memoized and cycles are left as
+    the literal @slug.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._items: Optional[Dict[str, Tuple[str, str]]] = None  # slug -> (name, content)
+        self._expanded: Dict[str, Tuple[str, FrozenSet[str]]] = {}  # slug -> (expanded block, slugs inside)
+        self.version = 0
+        self.counters = {"loads": 0, "resolves": 0, "expansions": 0, "memo_hits": 0, "cycles": 0}
+
+    def invalidate(self):
+        """Drop the index; called after any library item is created, updated or deleted"""
+        with self._lock:
+            self._items = None
+            self._expanded = {}
+            self.version += 1
+
+    def _snapshot(self, db: Session) -> Tuple[Dict[str, Tuple[str, str]], Dict[str, Tuple[str, FrozenSet[str]]]]:
+        with self._lock:
+            if self._items is not None:
+                return self._items, self._expanded
+            version = self.version
+
+        rows = db.execute(select(LibraryItem.slug, LibraryItem.name, LibraryItem.content)).all()
+        items = {slug: (name, content or "") for slug, name, content in rows}
+        self.counters["loads"] += 1
+        with self._lock:
+            if self.version != version:  # Invalidated while loading; use it once, don't keep it
+                return items, {}
+            self._items = items
+            return self._items, self._expanded
+
+    def _substitute(
+        self, text: str, items: Dict[str, Tuple[str, str]], expanded: Dict[str, Tuple[str, FrozenSet[str]]],
+        stack: Tuple[str, ...]
+    ) -> Tuple[str, Set[str], Set[str]]:
+        """
+        Returns the expanded text, the stack slugs it was cut at (cycles) and the slugs
+        it includes. A block is memoized once it was not cut at any of its ancestors.
+        """
+        cuts: Set[str] = set()
+        included: Set[str] = set()
+
+        def replace(match: "re.Match") -> str:
+            slug = match.group(1)
+            if slug not in items:
+                return match.group(0)
+            if slug in stack:
+                self.counters["cycles"] += 1
+                cuts.add(slug)
+                return match.group(0)
+            memo = expanded.get(slug)
+            if memo is not None and memo[1].isdisjoint(stack):
+                self.counters["memo_hits"] += 1
+                included.update(memo[1])
+                return memo[0]
+            name, content = items[slug]
+            body, inner_cuts, inner_included = self._substitute(content, items, expanded, stack + (slug,))
+            block = f"\n[Start of {name}]\n{body}\n[End of {name}]\n"
+            self.counters["expansions"] += 1
+            inner_cuts.discard(slug)
+            inner_included.add(slug)
+            if not inner_cuts:
+                expanded[slug] = (block, frozenset(inner_included))
+            cuts.update(inner_cuts)
+            included.update(inner_included)
+            return block
+
+        return MENTION_PATTERN.sub(replace, text), cuts, included
+
+    def resolve(self, text: str, db: Session) -> str:
+        """Replace every known @slug in `text` with its (nested-expanded) library content"""
+        if not text or "@" not in text:
+            return text
+        items, expanded = self._snapshot(db)
+        self.counters["resolves"] += 1
+        return self._substitute(text, items, expanded, ())[0]
+
+    def stats(self) -> Dict[str, Any]:
+        items = self._items
+        return {
+            "version": self.version,
+            "loaded": items is not None,
+            "items": len(items) if items is not None else 0,
+            "memoized": len(self._expanded),
+            **self.counters,
+        }
+
+
+# Singleton instance
+library_resolver = LibraryResolver()
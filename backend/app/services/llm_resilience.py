@@ -0,0 +1,185 @@
+# backend\app\services\llm_resilience.py
+import asyncio
+import random
+import time
+from typing import AsyncGenerator, Dict, Optional, Tuple, Any
+from ..config import settings
+
+# HTTP-ish status codes worth retrying (rate limits and server-side failures)
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class ErrorChunk(str):
+    """
+    Error text streamed in place of (or next to) an answer: a failed provider call or an image
+    that could not be loaded. Plain text to text clients; consumers check the type, not the wording.
+    """
+
+
+class LLMProviderError(Exception):
+    """A provider call failed; message is the user-facing error text"""
+
+    def __init__(self, provider: str, message: str, retryable: bool = True, status: Optional[int] = None):
+        super().__init__(message)
+        self.provider = provider
+        self.message = message
+        self.retryable = retryable
+        self.status = status
+
+
+def is_retryable_exception(e: Exception) -> bool:
+    """Transport failures and retryable status codes (google.api_core errors carry .code)"""
+    import httpx
+    if isinstance(e, (httpx.TransportError, asyncio.TimeoutError, ConnectionError)):
+        return True
+    code = getattr(e, "code", None)
+    if isinstance(code, int):
+        return code in RETRYABLE_STATUS
+    return False
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter, capped"""
+    ceiling = min(settings.llm_retry_max_delay, settings.llm_retry_base_delay * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open (cooldown) -> half-open (one probe)"""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+        self.counters = {"opened": 0, "rejected": 0}
+
+    def allow(self) -> bool:
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < settings.llm_breaker_cooldown:
+                self.counters["rejected"] += 1
+                return False
+            self.state = "half_open"
+            self.probing = False
+        if self.state == "half_open":
+            if self.probing:
+                self.counters["rejected"] += 1
+                return False
+            self.probing = True
+        return True
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+        self.probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        self.probing = False
+        if self.state == "half_open" or self.failures >= settings.llm_breaker_failure_threshold:
+            if self.state != "open":
+                self.counters["opened"] += 1
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def release_probe(self):
+        """The probe ended without a verdict (e.g. the client went away)"""
+        self.probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "failures": self.failures, **self.counters}
+
+
+class ResilienceState:
+    """Circuit breakers (one per provider endpoint) and retry/failover/hedge counters"""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self.counters = {
+            "retries": 0,
+            "failovers": 0,
+            "hedges_started": 0,
+            "hedges_won": 0,
+            "circuit_rejections": 0,
+            "exhausted": 0,
+        }
+
+    def breaker_key(self, provider: str) -> str:
+        if provider == "ollama":
+            return f"ollama:{settings.ollama_base_url.rstrip('/')}"
+        return provider
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        key = self.breaker_key(provider)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = self._breakers[key] = CircuitBreaker(key)
+        return breaker
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "breakers": {key: breaker.stats() for key, breaker in self._breakers.items()},
+        }
+
+
+class FirstChunkRace:
+    """
+    Races streams on their first chunk. The primary starts right away; if it has not
+    produced anything within `delay` seconds a hedge is started, the first stream to
+    produce a chunk wins and the other one is cancelled.
+    """
+
+    def __init__(self, primary: AsyncGenerator[str, None], hedge_factory, delay: float):
+        self.primary = primary
+        self.hedge_factory = hedge_factory
+        self.delay = delay
+        self.hedged = False
+
+    async def run(self) -> Tuple[AsyncGenerator[str, None], str, Optional[str]]:
+        """
+        Returns (winning stream, "primary" | "hedge", first chunk or None if it ended empty).
+        Raises the last error when every contender failed.
+        """
+        tasks = {asyncio.ensure_future(self.primary.__anext__()): (self.primary, "primary")}
+        last_error: Optional[BaseException] = None
+        timeout: Optional[float] = self.delay
+        try:
+            while tasks:
+                done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # Primary is slow: start the hedge and keep waiting on both
+                    timeout = None
+                    self.hedged = True
+                    hedge = self.hedge_factory()
+                    tasks[asyncio.ensure_future(hedge.__anext__())] = (hedge, "hedge")
+                    continue
+                for task in done:
+                    stream, label = tasks.pop(task)
+                    error = task.exception()
+                    if error is None or isinstance(error, StopAsyncIteration):
+                        await self._cancel(tasks)
+                        return stream, label, None if error else task.result()
+                    last_error = error
+                    await stream.aclose()
+                # A failed primary is not worth hedging; let the caller retry it
+                timeout = None
+        except BaseException:
+            await self._cancel(tasks)
+            raise
+        raise last_error
+
+    async def _cancel(self, tasks: Dict[asyncio.Future, Tuple[AsyncGenerator[str, None], str]]):
+        for task, (stream, _) in list(tasks.items()):
+            task.cancel()
+            try:
+                await task
+            except BaseException:
+                pass
+            await stream.aclose()
+        tasks.clear()
+
+
+# Singleton instance
+llm_resilience = ResilienceState()
@@ -0,0 +1,269 @@
+# backend\app\services\llm_scheduler.py
+import asyncio
+import itertools
+import re
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Optional, Any
+from ..config import settings
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BACKGROUND = "background"
+PRIORITIES = (PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND)
+
+# In-band queue position marker for plain-text streams (only sent to clients that opt in)
+QUEUE_HINT_PATTERN = re.compile(r"\x1eQUEUE:(\d+)\x1e")
+
+
+def queue_hint(position: int) -> str:
+    return f"\x1eQUEUE:{position}\x1e"
+
+
+def is_queue_hint(chunk: str) -> bool:
+    return QUEUE_HINT_PATTERN.fullmatch(chunk) is not None
+
+
+def queue_hint_position(chunk: str) -> Optional[int]:
+    match = QUEUE_HINT_PATTERN.fullmatch(chunk)
+    return int(match.group(1)) if match else None
+
+
+class SchedulerTicket:
+    """One generation waiting for (or holding) a provider slot"""
+
+    def __init__(self, seq: int, provider: str, model: Optional[str], fair_key: str, priority: str):
+        self.seq = seq
+        self.provider = provider
+        self.model = model or ""
+        self.fair_key = fair_key
+        self.priority = priority
+        self.queue = priority  # Queue it currently waits in (background work can be promoted)
+        self.enqueued_at = time.perf_counter()
+        self.granted_at: Optional[float] = None
+        self.granted = asyncio.Event()
+        self.done = False
+
+    @property
+    def wait_seconds(self) -> float:
+        end = self.granted_at if self.granted_at is not None else time.perf_counter()
+        return end - self.enqueued_at
+
+
+class LLMScheduler:
+    """
+    Admission control for provider calls: per-provider and per-model concurrency limits,
+    round-robin fairness between meetings and interactive work ahead of background work.
+    """
+
+    def __init__(self):
+        self._seq = itertools.count()
+        # priority -> fair key -> waiting tickets
+        self._queues: Dict[str, "OrderedDict[str, Deque[SchedulerTicket]]"] = {p: OrderedDict() for p in PRIORITIES}
+        self._last_served: Dict[str, int] = {}  # fair key -> order of its latest grant
+        self._holding: Dict[str, int] = {}  # fair key -> granted, unreleased tickets
+        self._served_seq = itertools.count()
+        self._running: Dict[str, int] = {}  # "provider" and "provider/model" -> active generations
+        self.counters = {"granted": 0, "cancelled": 0, "promoted": 0}
+        self._wait_totals: Dict[str, Dict[str, float]] = {
+            p: {"count": 0, "total": 0.0, "max": 0.0} for p in PRIORITIES
+        }
+
+    # --- limits ---
+
+    def provider_limit(self, provider: str) -> int:
+        """0 means unlimited"""
+        return getattr(settings, f"llm_concurrency_{provider}", settings.llm_concurrency_default)
+
+    def model_limits(self) -> Dict[str, int]:
+        """Parse "ollama/llama3:70b=1,gemini/gemini-2.5-pro=4" from settings"""
+        limits = {}
+        for item in settings.llm_model_concurrency.split(","):
+            key, _, value = item.strip().rpartition("=")
+            if key and value.strip().isdigit():
+                limits[key.strip()] = int(value)
+        return limits
+
+    def _has_capacity(self, ticket: SchedulerTicket, model_limits: Dict[str, int]) -> bool:
+        provider_limit = self.provider_limit(ticket.provider)
+        if provider_limit and self._running.get(ticket.provider, 0) >= provider_limit:
+            return False
+        model_key = f"{ticket.provider}/{ticket.model}"
+        model_limit = model_limits.get(model_key)
+        if model_limit and self._running.get(model_key, 0) >= model_limit:
+            return False
+        return True
+
+    # --- queueing ---
+
+    def fair_key(self, meeting_id: Optional[int], company_id: Optional[int]) -> str:
+        if meeting_id is not None:
+            return f"meeting:{meeting_id}"
+        if company_id is not None:
+            return f"company:{company_id}"
+        return "global"
+
+    def submit(
+        self,
+        provider: str,
+        model: Optional[str] = None,
+        meeting_id: Optional[int] = None,
+        company_id: Optional[int] = None,
+        priority: str = PRIORITY_INTERACTIVE,
+    ) -> SchedulerTicket:
+        if priority not in PRIORITIES:
+            priority = PRIORITY_INTERACTIVE
+        ticket = SchedulerTicket(next(self._seq), provider, model, self.fair_key(meeting_id, company_id), priority)
+        self._queues[priority].setdefault(ticket.fair_key, deque()).append(ticket)
+        self._dispatch()
+        return ticket
+
+    def _promote_aged(self):
+        """Background work that waited too long competes as interactive so it cannot starve"""
+        max_wait = settings.llm_scheduler_background_max_wait
+        if max_wait <= 0:
+            return
+        background = self._queues[PRIORITY_BACKGROUND]
+        for key in list(background):
+            queue = background[key]
+            while queue and queue[0].wait_seconds >= max_wait:
+                ticket = queue.popleft()
+                ticket.queue = PRIORITY_INTERACTIVE
+                self._queues[PRIORITY_INTERACTIVE].setdefault(key, deque()).append(ticket)
+                self.counters["promoted"] += 1
+            if not queue:
+                del background[key]
+
+    def _dispatch(self):
+        self._promote_aged()
+        model_limits = self.model_limits()
+        for priority in PRIORITIES:
+            queues = self._queues[priority]
+            while queues:
+                # Round-robin: the fair key served least recently goes first
+                candidates = []
+                for key, queue in queues.items():
+                    ticket = next((t for t in queue if self._has_capacity(t, model_limits)), None)
+                    if ticket is not None:
+                        candidates.append((self._last_served.get(key, -1), ticket.seq, key, ticket))
+                if not candidates:
+                    break
+                _, _, key, ticket = min(candidates)
+                queues[key].remove(ticket)
+                if not queues[key]:
+                    del queues[key]
+                self._last_served[key] = next(self._served_seq)
+                self._grant(ticket)
+
+    def _forget_if_idle(self, key: str):
+        """Drop a fair key's round-robin position once it neither waits nor holds a slot"""
+        if key not in self._holding and not any(key in self._queues[p] for p in PRIORITIES):
+            self._last_served.pop(key, None)
+
+    def _grant(self, ticket: SchedulerTicket):
+        ticket.granted_at = time.perf_counter()
+        for key in (ticket.provider, f"{ticket.provider}/{ticket.model}"):
+            self._running[key] = self._running.get(key, 0) + 1
+        self._holding[ticket.fair_key] = self._holding.get(ticket.fair_key, 0) + 1
+        waits = self._wait_totals[ticket.priority]
+        waits["count"] += 1
+        waits["total"] += ticket.wait_seconds
+        waits["max"] = max(waits["max"], ticket.wait_seconds)
+        self.counters["granted"] += 1
+        ticket.granted.set()
+
+    def position(self, ticket: SchedulerTicket) -> int:
+        """Approximate 1-based place in line among tickets competing for the same provider"""
+        if ticket.granted.is_set():
+            return 0
+        ahead = 0
+        for priority in PRIORITIES:
+            for queue in self._queues[priority].values():
+                ahead += sum(
+                    1 for t in queue
+                    if t.provider == ticket.provider and (priority != ticket.queue or t.seq < ticket.seq)
+                )
+            if priority == ticket.queue:
+                break
+        return ahead + 1
+
+    async def wait(self, ticket: SchedulerTicket, timeout: Optional[float] = None) -> bool:
+        """Wait for the slot; returns False on timeout so callers can report their position"""
+        self._dispatch()  # Lets aged background work through even when nothing was released
+        try:
+            await asyncio.wait_for(ticket.granted.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def release(self, ticket: SchedulerTicket):
+        """Give the slot back (or leave the queue); safe to call more than once"""
+        if ticket.done:
+            return
+        ticket.done = True
+        if ticket.granted.is_set():
+            for key in (ticket.provider, f"{ticket.provider}/{ticket.model}"):
+                self._running[key] -= 1
+                if not self._running[key]:
+                    del self._running[key]
+            self._holding[ticket.fair_key] -= 1
+            if not self._holding[ticket.fair_key]:
+                del self._holding[ticket.fair_key]
+            self._forget_if_idle(ticket.fair_key)
+        else:
+            queue = self._queues[ticket.queue].get(ticket.fair_key)
+            if queue is not None and ticket in queue:
+                queue.remove(ticket)
+                if not queue:
+                    del self._queues[ticket.queue][ticket.fair_key]
+                    self._forget_if_idle(ticket.fair_key)
+            self.counters["cancelled"] += 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        provider: str,
+        model: Optional[str] = None,
+        meeting_id: Optional[int] = None,
+        company_id: Optional[int] = None,
+        priority: str = PRIORITY_INTERACTIVE,
+    ):
+        """Hold a provider slot for a non-streaming call"""
+        ticket = self.submit(provider, model, meeting_id, company_id, priority)
+        try:
+            while not await self.wait(ticket, settings.llm_scheduler_poll_interval):
+                pass
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    def stats(self) -> Dict[str, Any]:
+        depth: Dict[str, Dict[str, int]] = {}
+        for priority in PRIORITIES:
+            for queue in self._queues[priority].values():
+                for ticket in queue:
+                    provider_depth = depth.setdefault(ticket.provider, {p: 0 for p in PRIORITIES})
+                    provider_depth[priority] += 1
+        return {
+            **self.counters,
+            "running": dict(self._running),
+            "queued": depth,
+            "waiting_meetings": sorted({key for p in PRIORITIES for key in self._queues[p]}),
+            "wait": {
+                p: {
+                    "count": int(w["count"]),
+                    "avg_ms": round(w["total"] / w["count"] * 1000, 1) if w["count"] else 0.0,
+                    "max_ms": round(w["max"] * 1000, 1),
+                }
+                for p, w in self._wait_totals.items()
+            },
+            "limits": {
+                provider: self.provider_limit(provider) for provider in ("gemini", "ollama", "mock")
+            },
+            "model_limits": self.model_limits(),
+        }
+
+
+# Singleton instance
+llm_scheduler = LLMScheduler()
@@ -1,105 +1,115 @@
+import asyncio
 import google.generativeai as genai
 import httpx
 import json
 import traceback
 import os
-import re
-import base64
-from typing import AsyncGenerator, Optional, List, Dict, Any
+import time
+from contextlib import aclosing
+from typing import AsyncGenerator, Optional, List, Dict, Tuple, Any
 from sqlalchemy.orm import Session
 from ..config import settings
+from .http_pool import http_client_pool
+from .response_cache import response_cache
+from .image_pipeline import image_pipeline
+from .token_counter import token_counter
+from .context_packer import context_packer
+from .model_limits import model_limit_cache
+from .model_catalog import ollama_model_catalog
+from .mock_provider import mock_provider, MOCK_ERROR
+from .llm_scheduler import llm_scheduler, queue_hint, is_queue_hint, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+from .stream_telemetry import stream_telemetry
+from .library_resolver import library_resolver
+from .prompt_cache import prompt_cache
+from .llm_resilience import (
+    ErrorChunk,
+    LLMProviderError,
+    FirstChunkRace,
+    RETRYABLE_STATUS,
+    backoff_delay,
+    is_retryable_exception,
+    llm_resilience,
+)
 
 class LLMService:
     """Service for LLM interactions with Gemini and Ollama support"""
     
+    PROMPT_CLOSING = "\\nRespond naturally as this character."
+    
     def __init__(self):
         # Configure Gemini initial load
         if settings.gemini_api_key:
             genai.configure(api_key=settings.gemini_api_key)
     
     async def get_ollama_models(self) -> List[str]:
-        """Fetch available models from Ollama RunPod instance"""
-        print(f"DEBUG: Checking Ollama connection at: {settings.ollama_base_url}")
-        
-        if not settings.ollama_base_url:
-            print("DEBUG: Ollama URL is missing/empty.")
-            return []
-        
-        try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                target_url = f"{settings.ollama_base_url}/api/tags"
-                print(f"DEBUG: Sending GET request to: {target_url}")
-                
-                response = await client.get(target_url)
-                print(f"DEBUG: Ollama Response Status: {response.status_code}")
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    models = [model["name"] for model in data.get("models", [])]
-                    print(f"DEBUG: Found models: {models}")
-                    return models
-                else:
-                    print(f"DEBUG: Failed to get models. Response text: {response.text}")
-                    return []
-        except Exception as e:
-            print(f"ERROR: Exception fetching Ollama models: {e}")
-            return []
-        
-        return []
-
-    async def get_max_tokens(self, provider: str, model_name: str, db: Session) -> int:
-        from ..models import LlmModelLimit
-        # Check cache
-        cached = db.query(LlmModelLimit).filter(
-            LlmModelLimit.provider == provider,
-            LlmModelLimit.model_name == model_name
-        ).first()
-        if cached:
-            return cached.max_tokens
-
-        # Fallback default
-        limit = 8192 
-        
+        """Available models of the configured Ollama instance, from the cached catalog"""
+        return await ollama_model_catalog.get_model_names()
+
+    async def get_max_tokens(self, provider: str, model_name: str, db: Optional[Session] = None) -> int:
+        """Context window of a model, served from the in-process memo in front of LlmModelLimit"""
+        return await model_limit_cache.get(
+            provider, model_name, self._fetch_model_limit, self._default_model_limit(provider, model_name)
+        )
+
+    def _default_model_limit(self, provider: str, model_name: str) -> int:
+        if provider == "gemini":
+            # Defaults based on model names
+            if "flash" in model_name or "pro" in model_name:
+                return 1048576
+            return 32768
+        return 8192
+
+    async def _fetch_model_limit(self, provider: str, model_name: str) -> Optional[int]:
+        """Ask the provider for the model's input limit; None if it could not be determined"""
         if provider == "gemini":
             try:
                 # gemini models need models/ prefix sometimes, but let's try direct first
                 model_path = model_name if model_name.startswith("models/") else f"models/{model_name}"
-                model_info = genai.get_model(model_path)
+                model_info = await asyncio.to_thread(genai.get_model, model_path)
                 if hasattr(model_info, 'input_token_limit'):
-                    limit = model_info.input_token_limit
+                    return model_info.input_token_limit
             except Exception as e:
                 print(f"Error fetching gemini model limit for {model_name}: {e}")
-                # Defaults based on model names
-                if "flash" in model_name or "pro" in model_name:
-                    limit = 1048576
-                else:
-                    limit = 32768
-        
+
         elif provider == "ollama":
             if settings.ollama_base_url:
                 try:
-                    async with httpx.AsyncClient(timeout=10.0) as client:
-                        resp = await client.post(f"{settings.ollama_base_url}/api/show", json={"model": model_name})
-                        if resp.status_code == 200:
-                            data = resp.json()
-                            model_info = data.get("model_info", {})
-                            for key, val in model_info.items():
-                                if "context_length" in key:
-                                    limit = int(val)
-                                    break
+                    client = http_client_pool.get_client()
+                    resp = await client.post("/api/show", json={"model": model_name}, timeout=10.0)
+                    if resp.status_code == 200:
+                        data = resp.json()
+                        model_info = data.get("model_info", {})
+                        for key, val in model_info.items():
+                            if "context_length" in key:
+                                return int(val)
                 except Exception as e:
                     print(f"Error fetching ollama model limit for {model_name}: {e}")
+        return None
+
+    async def warmup_model_limits(self):
+        """Prefetch context limits for every model used by participants of active meetings"""
+        from ..database import SessionLocal
+        from ..models import Meeting, MeetingParticipant
+
+        def load_models():
+            with SessionLocal() as db:
+                rows = db.query(MeetingParticipant.llm_provider, MeetingParticipant.llm_model).join(
+                    Meeting, Meeting.id == MeetingParticipant.meeting_id
+                ).filter(Meeting.status == "active").distinct().all()
+            return {(provider or "gemini", model or self.default_model_for(provider or "gemini")) for provider, model in rows}
 
         try:
-            new_limit = LlmModelLimit(provider=provider, model_name=model_name, max_tokens=limit)
-            db.add(new_limit)
-            db.commit()
+            models = await asyncio.to_thread(load_models)
         except Exception as e:
-            db.rollback()
-            print(f"Error caching model limit: {e}")
-            
-        return limit
-    
+            print(f"WARNING: Model limit warmup skipped: {e}")
+            return
+        results = await asyncio.gather(
+            *[self.get_max_tokens(provider, model) for provider, model in models], return_exceptions=True
+        )
+        for (provider, model), result in zip(models, results):
+            if isinstance(result, Exception):
+                print(f"WARNING: Could not warm model limit for {provider}/{model}: {result}")
+
     async def generate_stream(
         self,
         prompt: str,
@@ -107,16 +117,263 @@ class LLMService:
         provider: str = "gemini",
         model: Optional[str] = None,
         temperature: float = 0.7,
-        image_paths: List[str] = []
+        image_paths: List[str] = [],
+        use_cache: bool = True,
+        meeting_id: Optional[int] = None,
+        company_id: Optional[int] = None,
+        priority: str = PRIORITY_INTERACTIVE,
+        queue_hints: bool = False,
+        fallbacks: Optional[List[Tuple[str, Optional[str]]]] = None,
+        hedge: Optional[bool] = None,
+        staff_id: Optional[int] = None
     ) -> AsyncGenerator[str, None]:
-        if provider == "gemini":
-            async for chunk in self._generate_gemini_stream(prompt, system_prompt, model, temperature, image_paths):
+        """
+        Stream a response, replaying identical earlier answers from the response cache.
+        Provider calls wait for a scheduler slot; with queue_hints the stream carries
+        queue position markers (see llm_scheduler.queue_hint) while waiting.
+        Failures before the first token are retried, then fail over to `fallbacks`.
+        Every call is recorded by stream_telemetry.
+        """
+        targets = self._generation_targets(provider, model, fallbacks)
+        record = stream_telemetry.start(provider, targets[0][1], meeting_id, staff_id, priority)
+        status = "cancelled"  # Unless the stream runs to completion
+        try:
+            stream = self._cached_stream(
+                prompt, system_prompt, provider, model, temperature, image_paths, use_cache,
+                targets, meeting_id, company_id, priority, queue_hints, hedge, record,
+            )
+            # aclosing: an abandoned stream must cancel the provider call right away, not at GC
+            async with aclosing(stream):
+                async for chunk in stream:
+                    if not is_queue_hint(chunk):
+                        record.chunk(chunk)
+                    yield chunk
+            status = record.status if record.status != "running" else "ok"
+        finally:
+            served_by = record.served_by or targets[0]
+            stream_telemetry.finish(record, status, *served_by)
+
+    async def _cached_stream(
+        self, prompt, system_prompt, provider, model, temperature, image_paths, use_cache,
+        targets, meeting_id, company_id, priority, queue_hints, hedge, record
+    ) -> AsyncGenerator[str, None]:
+        cache_key = None
+        if response_cache.enabled:
+            if use_cache:
+                cache_key = response_cache.make_key(prompt, system_prompt, provider, model, temperature, image_paths)
+                cached_chunks = response_cache.get(cache_key)
+                if cached_chunks is not None:
+                    record.status = "cached"
+                    for chunk in cached_chunks:
+                        yield chunk
+                    return
+            else:
+                response_cache.record_bypass()
+
+        chunks = []
+        failed = False
+        outcome: Dict[str, Any] = {"record": record}
+        started = time.perf_counter()
+        request = {
+            "prompt": prompt,
+            "system_prompt": system_prompt,
+            "temperature": temperature,
+            "image_paths": image_paths,
+            "meeting_id": meeting_id,
+            "company_id": company_id,
+            "priority": priority,
+        }
+        async with aclosing(self._resilient_stream(targets, request, queue_hints, hedge, outcome)) as stream:
+            async for chunk in stream:
+                if is_queue_hint(chunk):
+                    yield chunk
+                    continue
+                chunks.append(chunk)
+                failed = failed or isinstance(chunk, ErrorChunk)
                 yield chunk
+        if failed:
+            record.status = "error"
+
+        # Only complete, error-free answers from the requested model are cached
+        if cache_key and chunks and not failed and outcome.get("target") == targets[0]:
+            response_cache.set(cache_key, provider, chunks, time.perf_counter() - started)
+
+    def _generation_targets(
+        self, provider: str, model: Optional[str], fallbacks: Optional[List[Tuple[str, Optional[str]]]]
+    ) -> List[Tuple[str, str]]:
+        """Requested provider/model followed by distinct fallbacks (participant's, then global)"""
+        candidates = [(provider, model)] + list(fallbacks or [])
+        if settings.llm_fallback_provider:
+            candidates.append((settings.llm_fallback_provider, settings.llm_fallback_model or None))
+        targets: List[Tuple[str, str]] = []
+        for target_provider, target_model in candidates:
+            if not target_provider:
+                continue
+            target = (target_provider, target_model or self.default_model_for(target_provider))
+            if target not in targets:
+                targets.append(target)
+        return targets
+
+    async def _acquire_slot(self, ticket, queue_hints: bool) -> AsyncGenerator[str, None]:
+        last_position = None
+        while not ticket.granted.is_set():
+            position = llm_scheduler.position(ticket)
+            if queue_hints and position != last_position:
+                yield queue_hint(position)
+                last_position = position
+            await llm_scheduler.wait(ticket, settings.llm_scheduler_poll_interval)
+
+    async def _slotted_stream(self, target: Tuple[str, str], request: Dict[str, Any], notices: List[str]):
+        """Provider stream that waits for its own scheduler slot first (used for hedges)"""
+        ticket = llm_scheduler.submit(
+            target[0], target[1], request["meeting_id"], request["company_id"], request["priority"]
+        )
+        try:
+            async for _ in self._acquire_slot(ticket, False):
+                pass
+            async with aclosing(self._generate_provider_stream(target[0], target[1], request, notices)) as stream:
+                async for chunk in stream:
+                    yield chunk
+        finally:
+            llm_scheduler.release(ticket)
+
+    async def _resilient_stream(
+        self,
+        targets: List[Tuple[str, str]],
+        request: Dict[str, Any],
+        queue_hints: bool,
+        hedge: Optional[bool],
+        outcome: Dict[str, Any],
+    ) -> AsyncGenerator[str, None]:
+        """Retry with backoff before the first token, fail over across targets, optionally hedge"""
+        hedge_delay = settings.llm_hedge_after_ms / 1000
+        hedge_enabled = hedge_delay > 0 if hedge is None else bool(hedge and hedge_delay > 0)
+        sent_notices = set()
+        notices: List[str] = []
+        last_error: Optional[LLMProviderError] = None
+
+        def pending_notices(notices: List[str]) -> List[ErrorChunk]:
+            fresh = [n for n in notices if n not in sent_notices]
+            sent_notices.update(fresh)
+            return [ErrorChunk(n) for n in fresh]
+
+        for index, target in enumerate(targets):
+            if index:
+                llm_resilience.counters["failovers"] += 1
+                print(f"WARNING: Failing over to {target[0]}/{target[1]} after: {last_error}")
+            breaker = llm_resilience.breaker(target[0])
+
+            for attempt in range(settings.llm_retry_attempts + 1):
+                if not breaker.allow():
+                    llm_resilience.counters["circuit_rejections"] += 1
+                    last_error = LLMProviderError(
+                        target[0], f"Error: {target[0]} is temporarily unavailable, please try again shortly",
+                        retryable=False,
+                    )
+                    break
+                if attempt:
+                    llm_resilience.counters["retries"] += 1
+                    await asyncio.sleep(backoff_delay(attempt - 1))
+
+                notices: List[str] = []
+                ticket = llm_scheduler.submit(
+                    target[0], target[1], request["meeting_id"], request["company_id"], request["priority"]
+                )
+                stream = None
+                first_token = False
+                try:
+                    async for hint in self._acquire_slot(ticket, queue_hints):
+                        yield hint
+                    outcome["record"].queue_wait += ticket.wait_seconds
+                    outcome["record"].granted_at = ticket.granted_at
+
+                    stream = self._generate_provider_stream(target[0], target[1], request, notices)
+                    if hedge_enabled:
+                        race = FirstChunkRace(
+                            stream, lambda: self._slotted_stream(target, request, notices), hedge_delay
+                        )
+                        stream, winner, first = await race.run()
+                        if race.hedged:
+                            llm_resilience.counters["hedges_started"] += 1
+                            if winner == "hedge":
+                                llm_resilience.counters["hedges_won"] += 1
+                                # The hedge streams on its own slot; don't hold two for one answer
+                                llm_scheduler.release(ticket)
+                        if first is None:
+                            raise StopAsyncIteration
+                    else:
+                        first = await stream.__anext__()
+
+                    first_token = True
+                    breaker.record_success()
+                    outcome["target"] = outcome["record"].served_by = target
+                    for notice in pending_notices(notices):
+                        yield notice
+                    yield first
+                    async for chunk in stream:
+                        yield chunk
+                    return
+                except StopAsyncIteration:
+                    # Provider finished without output
+                    breaker.record_success()
+                    outcome["target"] = outcome["record"].served_by = target
+                    for notice in pending_notices(notices):
+                        yield notice
+                    return
+                except LLMProviderError as e:
+                    last_error = e
+                    if e.retryable:
+                        breaker.record_failure()
+                    else:
+                        breaker.release_probe()
+                    if first_token:
+                        # Part of the answer is already out; report instead of replaying it
+                        yield ErrorChunk(e.message)
+                        return
+                    if not e.retryable:
+                        break
+                except BaseException:
+                    breaker.release_probe()
+                    raise
+                finally:
+                    if stream is not None:
+                        await stream.aclose()
+                    llm_scheduler.release(ticket)
+
+        llm_resilience.counters["exhausted"] += 1
+        # Image problems of the last attempt are still worth showing next to the error
+        for notice in pending_notices(notices):
+            yield notice
+        yield ErrorChunk(last_error.message if last_error else "Error: No LLM provider available")
+
+    async def _generate_provider_stream(
+        self,
+        provider: str,
+        model: str,
+        request: Dict[str, Any],
+        notices: List[str]
+    ) -> AsyncGenerator[str, None]:
+        """Raw provider stream; raises LLMProviderError, image problems are appended to notices"""
+        prompt, system_prompt = request["prompt"], request["system_prompt"]
+        temperature, image_paths = request["temperature"], request["image_paths"]
+        if provider == "gemini":
+            stream = self._generate_gemini_stream(prompt, system_prompt, model, temperature, image_paths, notices)
         elif provider == "ollama":
-            async for chunk in self._generate_ollama_stream(prompt, system_prompt, model, temperature, image_paths):
-                yield chunk
+            stream = self._generate_ollama_stream(prompt, system_prompt, model, temperature, image_paths, notices)
+        elif provider == "mock":
+            if not mock_provider.enabled:
+                raise LLMProviderError("mock", "Error: Mock provider is disabled (set MOCK_LLM_ENABLED=true)", retryable=False)
+            stream = mock_provider.stream(prompt, system_prompt, model)
         else:
-            yield f"Error: Unknown provider '{provider}'"
+            raise LLMProviderError(provider, f"Error: Unknown provider '{provider}'", retryable=False)
+
+        try:
+            async for chunk in stream:
+                if provider == "mock" and chunk == MOCK_ERROR:
+                    raise LLMProviderError("mock", MOCK_ERROR)
+                yield chunk
+        finally:
+            await stream.aclose()
     
     async def _generate_gemini_stream(
         self,
@@ -124,27 +381,24 @@ class LLMService:
         system_prompt: str,
         model: Optional[str] = None,
         temperature: float = 0.7,
-        image_paths: List[str] = []
+        image_paths: List[str] = [],
+        notices: Optional[List[str]] = None
     ) -> AsyncGenerator[str, None]:
         """Generate streaming response from Gemini"""
         try:
-            model_name = model or settings.default_model
+            model_name = model or self.default_model_for("gemini")
             gemini_model = genai.GenerativeModel(model_name=model_name)
             
             full_prompt = f"{system_prompt}\n\nUser: {prompt}"
             content = []
             
             if image_paths:
-                import PIL.Image
-                for img_path in image_paths:
-                    try:
-                        with open(img_path, 'rb') as f:
-                            img = PIL.Image.open(f)
-                            img.load()
-                            content.append(img)
-                    except Exception as e:
-                        yield f"[SYSTEM ERROR: Could not load image {img_path}: {str(e)}]\n"
+                images, failures = await image_pipeline.load_for_gemini(image_paths)
+                for img_path, e in failures:
+                    if notices is not None:
+                        notices.append(f"[SYSTEM ERROR: Could not load image {img_path}: {str(e)}]\n")
                 
+                content.extend(images)
                 content.append(full_prompt)
             else:
                 content = [full_prompt]
@@ -159,7 +413,10 @@ class LLMService:
                 if chunk.text:
                     yield chunk.text
         except Exception as e:
-            yield f"Error generating Gemini response: {str(e)}"
+            raise LLMProviderError(
+                "gemini", f"Error generating Gemini response: {str(e)}",
+                retryable=is_retryable_exception(e), status=getattr(e, "code", None),
+            ) from e
 
     async def _generate_ollama_stream(
         self,
@@ -167,67 +424,66 @@ class LLMService:
         system_prompt: str,
         model: Optional[str] = None,
         temperature: float = 0.7,
-        image_paths: List[str] = []
+        image_paths: List[str] = [],
+        notices: Optional[List[str]] = None
     ) -> AsyncGenerator[str, None]:
         """Generate streaming response from Ollama"""
         if not settings.ollama_base_url:
-            yield "Error: Ollama base URL not configured"
-            return
+            raise LLMProviderError("ollama", "Error: Ollama base URL not configured", retryable=False)
         
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                payload = {
-                    "model": model or "llama2",
-                    "prompt": prompt,
-                    "system": system_prompt,
-                    "stream": True,
-                    "options": {"temperature": temperature}
-                }
-
-                if image_paths:
-                    encoded_images = []
-                    for img_path in image_paths:
-                        try:
-                            print(f"DEBUG: Encoding image for Ollama from: {img_path}")
-                            with open(img_path, "rb") as image_file:
-                                encoded_string = base64.b64encode(image_file.read()).decode('utf-8')
-                                encoded_images.append(encoded_string)
-                        except Exception as e:
-                            print(f"Error encoding image {img_path} for Ollama: {e}")
-                            yield f"[SYSTEM ERROR: Failed to load image {img_path} for Ollama: {str(e)}]\n"
-                    
-                    if encoded_images:
-                        payload["images"] = encoded_images
+            client = http_client_pool.get_client()
+            payload = {
+                "model": model or self.default_model_for("ollama"),
+                "prompt": prompt,
+                "system": system_prompt,
+                "stream": True,
+                "options": {"temperature": temperature}
+            }
+
+            if image_paths:
+                encoded_images, failures = await image_pipeline.load_for_ollama(image_paths)
+                for img_path, e in failures:
+                    print(f"Error encoding image {img_path} for Ollama: {e}")
+                    if notices is not None:
+                        notices.append(f"[SYSTEM ERROR: Failed to load image {img_path} for Ollama: {str(e)}]\n")
                 
-                target_url = f"{settings.ollama_base_url}/api/generate"
-                print(f"DEBUG: Connecting to Ollama at {target_url} with model {payload['model']}")
-
-                async with client.stream("POST", target_url, json=payload) as response:
-                    if response.status_code != 200:
-                        error_content = await response.read()
-                        error_msg = f"Ollama HTTP Error {response.status_code}: {error_content.decode('utf-8')}"
-                        print(f"ERROR: {error_msg}")
-                        yield error_msg
-                        return
+                if encoded_images:
+                    payload["images"] = encoded_images
+            
+            print(f"DEBUG: Connecting to Ollama at {settings.ollama_base_url} with model {payload['model']}")
+
+            async with client.stream("POST", "/api/generate", json=payload) as response:
+                if response.status_code != 200:
+                    error_content = await response.aread()
+                    error_msg = f"Ollama HTTP Error {response.status_code}: {error_content.decode('utf-8')}"
+                    print(f"ERROR: {error_msg}")
+                    raise LLMProviderError(
+                        "ollama", error_msg,
+                        retryable=response.status_code in RETRYABLE_STATUS, status=response.status_code,
+                    )
+
+                async for line in response.aiter_lines():
+                    if line:
+                        try:
+                            data = json.loads(line)
+                            if "error" in data:
+                                error_msg = f"Ollama API Error: {data['error']}"
+                                print(f"ERROR: {error_msg}")
+                                raise LLMProviderError("ollama", error_msg, retryable=False)
+                            if "response" in data:
+                                yield data["response"]
+                        except json.JSONDecodeError:
+                            continue
 
-                    async for line in response.aiter_lines():
-                        if line:
-                            try:
-                                data = json.loads(line)
-                                if "error" in data:
-                                    error_msg = f"Ollama API Error: {data['error']}"
-                                    print(f"ERROR: {error_msg}")
-                                    yield error_msg
-                                    return
-                                if "response" in data:
-                                    yield data["response"]
-                            except json.JSONDecodeError:
-                                continue
-                                
+        except LLMProviderError:
+            raise
         except Exception as e:
             print("ERROR: Exception in _generate_ollama_stream:")
             traceback.print_exc()
-            yield f"Error generating Ollama response: {repr(e)}"
+            raise LLMProviderError(
+                "ollama", f"Error generating Ollama response: {repr(e)}", retryable=is_retryable_exception(e)
+            ) from e
 
     def resolve_dependencies(self, text: str, db: Session) -> str:
         """
@@ -235,22 +491,7 @@ class LLMService:
         """
         if not text or not db:
             return text
-            
-        matches = re.findall(r'@(\w+)', text)
-        
-        if not matches:
-            return text
-            
-        from ..models import LibraryItem
-        
-        resolved_text = text
-        for slug in matches:
-            item = db.query(LibraryItem).filter(LibraryItem.slug == slug).first()
-            if item:
-                pattern = f"@{slug}\\b"
-                resolved_text = re.sub(pattern, f"\\n[Start of {item.name}]\\n{item.content}\\n[End of {item.name}]\\n", resolved_text)
-        
-        return resolved_text
+        return library_resolver.resolve(text, db)
 
     def build_system_prompt(
         self, 
@@ -265,11 +506,17 @@ class LLMService:
         system_prompt="", # NEW: Added personal instructions param
         knowledge_base="", # NEW: Added knowledge base param
         db: Session = None,
-        context_settings: Optional[Dict[str, bool]] = None
+        context_settings: Optional[Dict[str, bool]] = None,
+        meeting_history: Optional[List[str]] = None,
+        token_budget: Optional[int] = None,
+        provider: str = "gemini",
+        model: Optional[str] = None,
+        staff_id: Optional[int] = None
     ):
         """
         Builds a system prompt from various context pieces.
         If context_settings is provided, it filters which blocks are included.
+        If token_budget is provided, blocks are packed to fit it (see ContextPacker).
         Returns the final prompt string.
         """
         blocks = self.build_structured_prompt_blocks(
@@ -284,28 +531,60 @@ class LLMService:
             system_prompt=system_prompt,
             knowledge_base=knowledge_base,
             db=db,
-            context_settings=context_settings
+            context_settings=context_settings,
+            meeting_history=meeting_history,
+            staff_id=staff_id
         )
-        
+        if token_budget is not None:
+            self.pack_prompt_blocks(blocks, token_budget, provider, model)
+        return self.render_system_prompt(blocks)
+
+    def render_system_prompt(self, blocks: List[Dict[str, Any]]) -> str:
+        """Join the enabled blocks into the final system prompt string"""
         enabled_parts = [b["content"] for b in blocks if b["enabled"]]
-        enabled_parts.append("\\nRespond naturally as this character.")
+        enabled_parts.append(self.PROMPT_CLOSING)
         return "\\n".join(enabled_parts)
 
-    def build_structured_prompt_blocks(
+    def pack_prompt_blocks(
+        self, blocks: List[Dict[str, Any]], token_budget: int, provider: str, model: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Fit blocks into token_budget (minus the closing line); returns the packing report"""
+        closing_tokens = token_counter.count(self.PROMPT_CLOSING, provider, model)
+        return context_packer.pack(blocks, token_budget - closing_tokens, provider, model)
+
+    async def get_context_budget(
+        self,
+        provider: str,
+        model: Optional[str],
+        db: Optional[Session],
+        prompt: str = "",
+        image_paths: List[str] = []
+    ) -> int:
+        """Tokens left for the system prompt after the user turn, its images and the reserved output"""
+        model_name = model or self.default_model_for(provider)
+        max_tokens = await self.get_max_tokens(provider, model_name, db)
+        used = token_counter.count(prompt, provider, model_name)
+        used += sum(token_counter.count_image(path, provider) for path in image_paths)
+        return max(0, max_tokens - settings.context_reserved_output_tokens - used)
+
+    def default_model_for(self, provider: str) -> str:
+        if provider == "mock":
+            return "mock"
+        return settings.default_model if provider == "gemini" else "llama2"
+
+    def compile_static_prompt_blocks(
         self,
         staff_name,
         role,
         personality,
         expertise,
-        company_context,
-        meeting_context,
         company_name="MyVCO",
         company_description="",
         system_prompt="",
-        knowledge_base="", # NEW
-        db: Session = None,
-        context_settings: Optional[Dict[str, bool]] = None
-    ) -> List[Dict[str, Any]]:
+        knowledge_base="",
+        db: Session = None
+    ) -> Dict[str, str]:
+        """Content of the blocks that only depend on the staff member, library and company"""
         # Resolve dependencies in personality, expertise, personal instructions, and knowledge base
         if db:
             if personality:
@@ -325,6 +604,59 @@ class LLMService:
         else:
             expertise_str = ", ".join(expertise) if isinstance(expertise, list) else str(expertise or "")
 
+        return {
+            "personality": f"You are {staff_name}, a {role} at {company_name}.\n{company_description}\nYour Personality: {personality}" if personality else f"You are {staff_name}, a {role} at {company_name}.\n{company_description}",
+            "expertise": f"Your Expertise: {expertise_str}",
+            "knowledge_base": f"Agent Knowledge Base:\n{knowledge_base}",
+            "personal_instructions": f"Personal Instructions:\n{system_prompt}",
+        }
+
+    def build_structured_prompt_blocks(
+        self,
+        staff_name,
+        role,
+        personality,
+        expertise,
+        company_context,
+        meeting_context,
+        company_name="MyVCO",
+        company_description="",
+        system_prompt="",
+        knowledge_base="", # NEW
+        db: Session = None,
+        context_settings: Optional[Dict[str, bool]] = None,
+        meeting_history: Optional[List[str]] = None,
+        staff_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        With a staff_id (and a session to resolve library slugs with) the static blocks come
+        from the prompt cache and carry their token counts; only the company and meeting
+        blocks are assembled per turn.
+        """
+        started = time.perf_counter()
+        static_inputs = dict(
+            staff_name=staff_name,
+            role=role,
+            personality=personality,
+            expertise=expertise,
+            company_name=company_name,
+            company_description=company_description,
+            system_prompt=system_prompt,
+            knowledge_base=knowledge_base,
+        )
+        if staff_id is not None and db is not None and prompt_cache.enabled:
+            source = tuple(
+                tuple(value) if isinstance(value, list) else value for value in static_inputs.values()
+            )
+            static = prompt_cache.static_blocks(
+                staff_id, source, lambda: self.compile_static_prompt_blocks(**static_inputs, db=db)
+            )
+        else:
+            static = {
+                block_id: {"content": content}
+                for block_id, content in self.compile_static_prompt_blocks(**static_inputs, db=db).items()
+            }
+
         settings = context_settings or {
             "personality": True,
             "expertise": True,
@@ -338,25 +670,25 @@ class LLMService:
             {
                 "id": "personality",
                 "label": "Staff Personality",
-                "content": f"You are {staff_name}, a {role} at {company_name}.\n{company_description}\nYour Personality: {personality}" if personality else f"You are {staff_name}, a {role} at {company_name}.\n{company_description}",
+                **static["personality"],
                 "enabled": settings.get("personality", True)
             },
             {
                 "id": "expertise",
                 "label": "Staff Expertise",
-                "content": f"Your Expertise: {expertise_str}",
+                **static["expertise"],
                 "enabled": settings.get("expertise", True)
             },
             {
                 "id": "knowledge_base",
                 "label": "Agent Knowledge Base",
-                "content": f"Agent Knowledge Base:\n{knowledge_base}",
+                **static["knowledge_base"],
                 "enabled": settings.get("knowledge_base", True) and bool(knowledge_base)
             },
             {
                 "id": "personal_instructions",
                 "label": "Personal Instructions",
-                "content": f"Personal Instructions:\n{system_prompt}",
+                **static["personal_instructions"],
                 "enabled": settings.get("personal_instructions", True) and bool(system_prompt)
             },
             {
@@ -372,15 +704,27 @@ class LLMService:
                 "enabled": settings.get("meeting_context", True)
             }
         ]
+
+        # Keep the individual messages so the context packer can trim history message by message
+        if meeting_history:
+            from .memory_service import memory_service
+            history_block = blocks[-1]
+            history_block["content"] = f"Meeting Context:\n{memory_service.format_meeting_context(meeting_history)}"
+            history_block["header"] = f"Meeting Context:\n{memory_service.HISTORY_HEADER}\n"
+            history_block["segments"] = list(meeting_history)
+        prompt_cache.record_assembly((time.perf_counter() - started) * 1000)
         return blocks
     
     async def analyze_image(self, image_path, context=None):
         try:
-            import PIL.Image
-            img = PIL.Image.open(image_path)
+            images, failures = await image_pipeline.load_for_gemini([image_path])
+            if failures:
+                raise failures[0][1]
+            img = images[0]
             model = genai.GenerativeModel('gemini-2.0-flash')
             prompt = f"Analyze this image. Context: {context}" if context else "Analyze this image in detail."
-            response = await model.generate_content_async([prompt, img])
+            async with llm_scheduler.slot("gemini", "gemini-2.0-flash", priority=PRIORITY_BACKGROUND):
+                response = await model.generate_content_async([prompt, img])
             return response.text
         except Exception as e:
             return f"Error analyzing image: {str(e)}"
@@ -0,0 +1,215 @@
+# backend\app\services\meeting_context.py
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Sequence, Set, Tuple
+from ..config import settings
+
+# (created_at, id, sender_name, content); sorts like the history query
+Message = Tuple[datetime, int, str, str]
+
+ENTRY_OVERHEAD_BYTES = 120  # Tuple, datetime and deque slot per message, roughly
+
+
+def _message(created_at, message_id, sender_name, content) -> Message:
+    return (created_at or datetime.min, message_id or 0, sender_name or "", content or "")
+
+
+def _size(message: Message) -> int:
+    return len(message[2]) + len(message[3]) + ENTRY_OVERHEAD_BYTES
+
+
+class MeetingBuffer:
+    """The newest messages of one meeting, oldest first"""
+
+    def __init__(self, messages: Sequence[Message], capacity: int, complete: bool):
+        self.messages: Deque[Message] = deque(messages, maxlen=capacity)
+        self.complete = complete  # Holds every message of the meeting, not just the newest
+        self.bytes = sum(_size(m) for m in self.messages)
+
+
+class HistoryLoad:
+    """A database read in progress; writes to the meeting meanwhile make its rows unsafe to keep"""
+
+    __slots__ = ("meeting_id", "dirty")
+
+    def __init__(self, meeting_id: int):
+        self.meeting_id = meeting_id
+        self.dirty = False
+
+
+class MeetingContextCache:
+    """
+    Ring buffer of recent messages per meeting, so prompt building reads meeting history
+    from memory. Filled by the first history read, then kept current by the code that
+    inserts, edits and deletes messages. Meetings are evicted least recently used first,
+    within a meeting count and a memory cap.
+    """
+
+    def __init__(self):
+        self._buffers: "OrderedDict[int, MeetingBuffer]" = OrderedDict()
+        self._loads: Dict[int, Set[HistoryLoad]] = {}
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.counters = {"hits": 0, "misses": 0, "loads": 0, "discarded_loads": 0, "evictions": 0, "writes": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return settings.meeting_context_cache_enabled
+
+    @property
+    def capacity(self) -> int:
+        return settings.context_history_max_messages
+
+    def history(self, meeting_id: int, limit: int) -> Optional[List[str]]:
+        """The newest `limit` messages as "sender: content" lines, or None on a miss"""
+        if not self.enabled or limit > self.capacity:
+            return None
+        with self._lock:
+            buffer = self._buffers.get(meeting_id)
+            if buffer is None or (len(buffer.messages) < limit and not buffer.complete):
+                self.counters["misses"] += 1
+                return None
+            self._buffers.move_to_end(meeting_id)
+            self.counters["hits"] += 1
+            recent = list(buffer.messages)[-limit:] if limit else []
+        return [f"{sender}: {content}" for _, _, sender, content in recent]
+
+    def begin_load(self, meeting_id: int) -> Optional[HistoryLoad]:
+        if not self.enabled:
+            return None
+        load = HistoryLoad(meeting_id)
+        with self._lock:
+            self._loads.setdefault(meeting_id, set()).add(load)
+        return load
+
+    def finish_load(self, load: Optional[HistoryLoad], rows: Optional[Sequence], requested: int):
+        """
+        rows: (created_at, id, sender_name, content), newest first, from a query limited to
+        `requested`. None when the read failed. Kept unless a write raced with the read.
+        """
+        if load is None:
+            return
+        with self._lock:
+            loads = self._loads.get(load.meeting_id)
+            if loads is not None:
+                loads.discard(load)
+                if not loads:
+                    del self._loads[load.meeting_id]
+            if rows is None:
+                return
+            if load.dirty:
+                self.counters["discarded_loads"] += 1
+                return
+            newest = [_message(*row) for row in rows[: self.capacity]]
+            complete = len(rows) < requested and len(rows) <= self.capacity
+            self._store(load.meeting_id, MeetingBuffer(reversed(newest), self.capacity, complete))
+            self.counters["loads"] += 1
+
+    def _store(self, meeting_id: int, buffer: MeetingBuffer):
+        self._discard(meeting_id)
+        self._buffers[meeting_id] = buffer
+        self._bytes += buffer.bytes
+        self._enforce_limits()
+
+    def _discard(self, meeting_id: int):
+        buffer = self._buffers.pop(meeting_id, None)
+        if buffer is not None:
+            self._bytes -= buffer.bytes
+
+    def _enforce_limits(self):
+        max_bytes = settings.meeting_context_cache_max_mb * 1024 * 1024
+        while self._buffers and (
+            len(self._buffers) > settings.meeting_context_cache_max_meetings or self._bytes > max_bytes
+        ):
+            _, buffer = self._buffers.popitem(last=False)
+            self._bytes -= buffer.bytes
+            self.counters["evictions"] += 1
+
+    def _written(self, meeting_id: int) -> Optional[MeetingBuffer]:
+        """Mark reads in flight as stale; returns the meeting's buffer if cached"""
+        for load in self._loads.get(meeting_id, ()):
+            load.dirty = True
+        self.counters["writes"] += 1
+        return self._buffers.get(meeting_id)
+
+    def add(self, message):
+        """A MeetingMessage was committed"""
+        with self._lock:
+            buffer = self._written(message.meeting_id)
+            if buffer is None:
+                return
+            entry = _message(message.created_at, message.id, message.sender_name, message.content)
+            messages = buffer.messages
+            index = len(messages)
+            while index and messages[index - 1] > entry:  # Concurrent commits can land out of order
+                index -= 1
+            delta = _size(entry)
+            if len(messages) == messages.maxlen:
+                if index == 0:
+                    return  # Older than everything kept
+                delta -= _size(messages.popleft())
+                buffer.complete = False
+                index -= 1
+            messages.insert(index, entry)
+            buffer.bytes += delta
+            self._bytes += delta
+            self._enforce_limits()
+
+    def update(self, message):
+        """A MeetingMessage's content was edited"""
+        with self._lock:
+            buffer = self._written(message.meeting_id)
+            if buffer is None:
+                return
+            for index, (created_at, message_id, _, _) in enumerate(buffer.messages):
+                if message_id == message.id:
+                    entry = (created_at, message_id, message.sender_name or "", message.content or "")
+                    delta = _size(entry) - _size(buffer.messages[index])
+                    buffer.messages[index] = entry
+                    buffer.bytes += delta
+                    self._bytes += delta
+                    break
+            self._enforce_limits()
+
+    def remove_after(self, meeting_id: int, created_at: datetime):
+        """Messages created after `created_at` were deleted (resend)"""
+        with self._lock:
+            buffer = self._written(meeting_id)
+            if buffer is None:
+                return
+            removed = 0
+            while buffer.messages and buffer.messages[-1][0] > created_at:
+                removed += _size(buffer.messages.pop())
+            buffer.bytes -= removed
+            self._bytes -= removed
+            if removed and not buffer.complete:
+                # Older messages outside the window should move up; reload on the next read
+                self._discard(meeting_id)
+
+    def drop(self, meeting_id: int):
+        """Forget a meeting (ended, deleted, or an id that is being reused)"""
+        with self._lock:
+            self._written(meeting_id)
+            self._discard(meeting_id)
+
+    def clear(self):
+        with self._lock:
+            self._buffers.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.counters["hits"] + self.counters["misses"]
+        return {
+            "enabled": self.enabled,
+            "meetings": len(self._buffers),
+            "messages": sum(len(b.messages) for b in self._buffers.values()),
+            "memory_mb": round(self._bytes / (1024 * 1024), 3),
+            "max_mb": settings.meeting_context_cache_max_mb,
+            **self.counters,
+            "hit_ratio": round(self.counters["hits"] / lookups, 3) if lookups else 0.0,
+        }
+
+
+# Singleton instance
+meeting_context_cache = MeetingContextCache()
@@ -0,0 +1,257 @@
+# backend\app\services\meeting_events.py
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set
+from ..config import settings
+from ..database import SessionLocal
+from ..models import Meeting, MeetingMessage, MeetingImage
+
+MESSAGE_CREATED = "message_created"
+MESSAGE_UPDATED = "message_updated"
+MESSAGES_DELETED = "messages_deleted"  # Every message after a cut-off was removed (resend)
+IMAGE_LINKED = "image_linked"
+STATUS_CHANGED = "status_changed"
+TOKEN = "token"
+STREAM_ENDED = "stream_ended"  # An answer stopped without a saved message
+SNAPSHOT = "snapshot"
+RESYNC = "resync"
+
+
+def message_payload(message) -> Dict[str, Any]:
+    return {
+        "id": message.id,
+        "meeting_id": message.meeting_id,
+        "staff_id": message.staff_id,
+        "sender_type": message.sender_type,
+        "sender_name": message.sender_name,
+        "content": message.content,
+        "image_url": message.image_url,
+        "truncated": bool(message.truncated),
+        "created_at": message.created_at.isoformat() if message.created_at else None,
+        "updated_at": message.updated_at.isoformat() if message.updated_at else None,
+    }
+
+
+def image_payload(image) -> Dict[str, Any]:
+    """Same shape as GET /meetings/{id}/images"""
+    return {
+        "id": image.id,
+        "image_url": f"/{image.image_path.replace(os.sep, '/')}",
+        "description": image.image_metadata,
+        "display_order": image.display_order,
+        "created_at": image.created_at.isoformat() if image.created_at else None,
+    }
+
+
+class MeetingSubscription:
+    """One client's bounded queue; a client that falls behind gets a resync marker instead"""
+
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.meeting_events_queue_size)
+        self.lagged = 0
+
+    def put(self, event: Dict[str, Any]):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Drop the backlog; the client reloads a snapshot rather than missing events silently
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"type": RESYNC})
+            self.lagged += 1
+
+
+class MeetingChannel:
+    def __init__(self, seq: int = 0):
+        self.seq = seq
+        self.active_at = time.monotonic()  # Last event or unsubscribe; idle channels get dropped
+        self.replay: Deque[Dict[str, Any]] = deque(maxlen=settings.meeting_events_replay)
+        self.subscribers: Set[MeetingSubscription] = set()
+        self.streaming: Dict[Any, Dict[str, Any]] = {}  # staff_id -> {"name", "text"} of answers in progress
+
+
+class MeetingEventBus:
+    """
+    In-process pub/sub per meeting. publish() is safe from worker threads (sync routes run
+    in the threadpool): events are handed to the event loop with call_soon_threadsafe.
+    Events get a per-meeting seq; all but token events are kept in a short replay buffer
+    so reconnecting clients receive deltas, everyone else starts from a snapshot.
+    Channels nobody listens to are dropped once idle, or when their meeting ends or is deleted.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._channels: Dict[int, MeetingChannel] = {}
+        # Highest seq a dropped channel handed out; new channels count on from here so a
+        # reconnect cursor from before the drop can never match a different event
+        self._seq_floor = 0
+        self.counters = {"published": 0, "delivered": 0, "snapshots": 0, "resyncs": 0, "channels_dropped": 0}
+
+    def start(self):
+        """Bind to the running loop (called from the app lifespan)"""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+
+    def _channel(self, meeting_id: int) -> MeetingChannel:
+        channel = self._channels.get(meeting_id)
+        if channel is None:
+            self._prune()
+            channel = self._channels[meeting_id] = MeetingChannel(self._seq_floor)
+        return channel
+
+    def _remove(self, meeting_id: int):
+        channel = self._channels.pop(meeting_id)
+        self._seq_floor = max(self._seq_floor, channel.seq)
+        self.counters["channels_dropped"] += 1
+
+    def _prune(self):
+        """Drop channels without subscribers that saw no events for meeting_events_idle_seconds"""
+        cutoff = time.monotonic() - settings.meeting_events_idle_seconds
+        for meeting_id, channel in list(self._channels.items()):
+            if not channel.subscribers and channel.active_at < cutoff:
+                self._remove(meeting_id)
+
+    def _discard(self, meeting_id: int):
+        channel = self._channels.get(meeting_id)
+        if channel is not None and not channel.subscribers and not channel.streaming:
+            self._remove(meeting_id)
+
+    def _call_on_loop(self, fn, *args):
+        if self._loop is None or self._loop.is_closed():
+            return
+        if threading.get_ident() == self._loop_thread:
+            fn(*args)
+        else:
+            self._loop.call_soon_threadsafe(fn, *args)
+
+    def publish(self, meeting_id: int, event_type: str, data: Dict[str, Any]):
+        self._call_on_loop(self._dispatch, meeting_id, event_type, data)
+
+    def drop(self, meeting_id: int):
+        """Forget an ended or deleted meeting's channel unless someone is listening or streaming"""
+        self._call_on_loop(self._discard, meeting_id)
+
+    def _dispatch(self, meeting_id: int, event_type: str, data: Dict[str, Any]):
+        channel = self._channel(meeting_id)
+        channel.active_at = time.monotonic()
+        if event_type == TOKEN:
+            # Ephemeral: no seq, not replayed; late joiners get the partial text in the snapshot
+            event = {"type": event_type, "meeting_id": meeting_id, "data": data}
+            entry = channel.streaming.setdefault(data["staff_id"], {"name": data.get("name"), "text": ""})
+            entry["text"] += data["content"]
+        else:
+            channel.seq += 1
+            event = {"seq": channel.seq, "type": event_type, "meeting_id": meeting_id, "data": data}
+            channel.replay.append(event)
+            if event_type == STREAM_ENDED or (event_type == MESSAGE_CREATED and data.get("sender_type") == "staff"):
+                channel.streaming.pop(data.get("staff_id"), None)
+        self.counters["published"] += 1
+        for subscription in channel.subscribers:
+            subscription.put(event)
+            self.counters["delivered"] += 1
+
+    def deltas_since(self, meeting_id: int, since: int) -> Optional[List[Dict[str, Any]]]:
+        """Buffered events after `since`, or None when they are not all buffered any more"""
+        channel = self._channels.get(meeting_id) or MeetingChannel(self._seq_floor)  # Lookups keep nothing
+        first_buffered = channel.replay[0]["seq"] if channel.replay else channel.seq + 1
+        if since > channel.seq or since + 1 < first_buffered:
+            return None
+        return [event for event in channel.replay if event["seq"] > since]
+
+    def _load_state(self, meeting_id: int) -> Dict[str, Any]:
+        with SessionLocal() as db:
+            meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+            total = db.query(MeetingMessage).filter(MeetingMessage.meeting_id == meeting_id).count()
+            messages = (
+                db.query(MeetingMessage)
+                .filter(MeetingMessage.meeting_id == meeting_id)
+                .order_by(MeetingMessage.id.desc())
+                .limit(settings.meeting_events_snapshot_messages)
+                .all()
+            )
+            images = (
+                db.query(MeetingImage)
+                .filter(MeetingImage.meeting_id == meeting_id)
+                .order_by(MeetingImage.display_order)
+                .all()
+            )
+            return {
+                "status": meeting.status if meeting else None,
+                "total_messages": total,
+                "messages": [message_payload(m) for m in reversed(messages)],
+                "images": [image_payload(i) for i in images],
+            }
+
+    async def snapshot(self, meeting_id: int) -> Dict[str, Any]:
+        """
+        Compact current state: status, latest messages, images and answers in progress.
+        Events published while it loads may also show up as deltas; clients upsert by id.
+        """
+        channel = self._channel(meeting_id)
+        seq = channel.seq  # Taken first: later events are delivered as deltas
+        streaming = [{"staff_id": staff_id, **entry} for staff_id, entry in channel.streaming.items()]
+        state = await asyncio.to_thread(self._load_state, meeting_id)
+        self.counters["snapshots"] += 1
+        return {
+            "seq": seq,
+            "type": SNAPSHOT,
+            "meeting_id": meeting_id,
+            "data": {**state, "streaming": streaming},
+        }
+
+    async def subscribe(self, meeting_id: int, since: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Snapshot (or buffered deltas when `since` is still covered), then live events"""
+        if self._loop is None:
+            self.start()
+        channel = self._channel(meeting_id)
+        subscription = MeetingSubscription()
+        channel.subscribers.add(subscription)
+        try:
+            deltas = self.deltas_since(meeting_id, since) if since is not None else None
+            if deltas is None:
+                snapshot = await self.snapshot(meeting_id)
+                yield snapshot
+                last_seq = snapshot["seq"]
+            else:
+                for event in deltas:
+                    yield event
+                last_seq = deltas[-1]["seq"] if deltas else since
+            while True:
+                event = await subscription.queue.get()
+                if event["type"] == RESYNC:
+                    self.counters["resyncs"] += 1
+                    snapshot = await self.snapshot(meeting_id)
+                    yield snapshot
+                    last_seq = snapshot["seq"]
+                    continue
+                if "seq" in event:
+                    if event["seq"] <= last_seq:
+                        continue  # Already covered by the snapshot or the replay
+                    last_seq = event["seq"]
+                yield event
+        finally:
+            channel.subscribers.discard(subscription)
+            channel.active_at = time.monotonic()  # Keep the replay around for a reconnect
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "channels": len(self._channels),
+            "meetings": {
+                meeting_id: {
+                    "seq": channel.seq,
+                    "subscribers": len(channel.subscribers),
+                    "streaming": len(channel.streaming),
+                }
+                for meeting_id, channel in self._channels.items()
+                if channel.subscribers or channel.streaming
+            },
+        }
+
+
+# Singleton instance
+meeting_events = MeetingEventBus()
@@ -0,0 +1,104 @@
+# backend\app\services\meeting_queries.py
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from sqlalchemy.orm import Session
+from ..models import Meeting, MeetingParticipant, Staff
+from ..schemas import meeting as schemas
+
+MAX_MEETINGS_PAGE = 200
+
+MEETING_COLUMNS = (
+    Meeting.id,
+    Meeting.company_id,
+    Meeting.title,
+    Meeting.meeting_type,
+    Meeting.status,
+    Meeting.created_at,
+    Meeting.ended_at,
+)
+
+
+def participants_by_meeting(
+    db: Session, meeting_ids: List[int], include_context: bool = False
+) -> Dict[int, List[schemas.MeetingParticipantInfo]]:
+    """Participants with their staff details for many meetings in one joined query"""
+    grouped: Dict[int, List[schemas.MeetingParticipantInfo]] = {meeting_id: [] for meeting_id in meeting_ids}
+    if not meeting_ids:
+        return grouped
+    columns = [
+        MeetingParticipant.meeting_id,
+        Staff.id.label("staff_id"),
+        Staff.name.label("staff_name"),
+        Staff.role.label("staff_role"),
+        MeetingParticipant.llm_provider,
+        MeetingParticipant.llm_model,
+        MeetingParticipant.fallback_provider,
+        MeetingParticipant.fallback_model,
+        MeetingParticipant.joined_at,
+    ]
+    if include_context:
+        columns.append(MeetingParticipant.context_settings)
+    rows = (
+        db.query(*columns)
+        .join(Staff, Staff.id == MeetingParticipant.staff_id)  # Inner join: deleted staff are skipped
+        .filter(MeetingParticipant.meeting_id.in_(meeting_ids))
+        .order_by(MeetingParticipant.meeting_id, MeetingParticipant.id)
+        .all()
+    )
+    for row in rows:
+        info = row._asdict()
+        grouped[info.pop("meeting_id")].append(schemas.MeetingParticipantInfo(**info))
+    return grouped
+
+
+def meeting_response(meeting, participants: List[schemas.MeetingParticipantInfo], summary: Optional[str]) -> Dict[str, Any]:
+    return {
+        "id": meeting.id,
+        "company_id": meeting.company_id,
+        "title": meeting.title,
+        "meeting_type": meeting.meeting_type,
+        "status": meeting.status,
+        "summary": summary,
+        "created_at": meeting.created_at,
+        "ended_at": meeting.ended_at,
+        "participants": participants,
+    }
+
+
+def list_meetings(
+    db: Session,
+    company_id: int,
+    status: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    include_summary: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    A company's meetings, oldest first, in two queries however many there are.
+    Only the selected columns are loaded; summaries are left out unless asked for.
+    """
+    columns = MEETING_COLUMNS + ((Meeting.summary,) if include_summary else ())
+    query = db.query(*columns).filter(Meeting.company_id == company_id)
+    if status:
+        query = query.filter(Meeting.status == status)
+    if created_after:
+        query = query.filter(Meeting.created_at >= created_after)
+    if created_before:
+        query = query.filter(Meeting.created_at < created_before)
+    query = query.order_by(Meeting.id).offset(skip)
+    if limit is not None:
+        query = query.limit(limit)
+    meetings = query.all()
+
+    participants = participants_by_meeting(db, [m.id for m in meetings])
+    return [
+        meeting_response(m, participants[m.id], m.summary if include_summary else None)
+        for m in meetings
+    ]
+
+
+def meeting_detail(db: Session, meeting: Meeting, include_context: bool = True) -> Dict[str, Any]:
+    participants = participants_by_meeting(db, [meeting.id], include_context=include_context)
+    return meeting_response(meeting, participants[meeting.id], meeting.summary)
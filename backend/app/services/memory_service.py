@@ -1,9 +1,14 @@
 # backend\app\services\memory_service.py
 import os
 from pathlib import Path
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from ..models import Meeting, MeetingMessage, Knowledge
+from ..config import settings
+from .llm_scheduler import PRIORITY_BACKGROUND
+from .meeting_context import meeting_context_cache
 
 
 class MemoryService:
@@ -12,34 +17,75 @@ class MemoryService:
     # Calculate absolute path to backend root
     BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     
+    HISTORY_HEADER = "Recent conversation:"
+    
     def get_meeting_context(self, db: Session, meeting_id: int, limit: int = 10) -> str:
         """Get recent meeting messages as context"""
-        messages = db.query(MeetingMessage)\
-            .filter(MeetingMessage.meeting_id == meeting_id)\
-            .order_by(MeetingMessage.created_at.desc())\
-            .limit(limit)\
-            .all()
-        
-        if not messages:
+        return self.format_meeting_context(self.get_meeting_history(db, meeting_id, limit))
+    
+    def _history_query(self, meeting_id: int, limit: int):
+        # Only the columns the history lines and the context cache need
+        return select(MeetingMessage.created_at, MeetingMessage.id, MeetingMessage.sender_name, MeetingMessage.content)\
+            .where(MeetingMessage.meeting_id == meeting_id)\
+            .order_by(MeetingMessage.created_at.desc(), MeetingMessage.id.desc())\
+            .limit(limit)
+    
+    def _history_lines(self, rows, limit: int) -> List[str]:
+        # Newest first from the query; reverse to chronological order
+        return [f"{sender}: {content}" for _, _, sender, content in reversed(rows[:limit])]
+    
+    def get_meeting_history(self, db: Session, meeting_id: int, limit: Optional[int] = None) -> List[str]:
+        """Get recent meeting messages as "sender: content" lines in chronological order"""
+        limit = limit or settings.context_history_max_messages
+        history = meeting_context_cache.history(meeting_id, limit)
+        if history is not None:
+            return history
+        
+        requested = max(limit, meeting_context_cache.capacity)  # Fill the whole buffer while at it
+        load = meeting_context_cache.begin_load(meeting_id)
+        rows = None
+        try:
+            rows = db.execute(self._history_query(meeting_id, requested)).all()
+        finally:
+            meeting_context_cache.finish_load(load, rows, requested)
+        return self._history_lines(rows, limit)
+    
+    async def aget_meeting_history(self, db: AsyncSession, meeting_id: int, limit: Optional[int] = None) -> List[str]:
+        """get_meeting_history on an async session"""
+        limit = limit or settings.context_history_max_messages
+        history = meeting_context_cache.history(meeting_id, limit)
+        if history is not None:
+            return history
+        
+        requested = max(limit, meeting_context_cache.capacity)
+        load = meeting_context_cache.begin_load(meeting_id)
+        rows = None
+        try:
+            rows = (await db.execute(self._history_query(meeting_id, requested))).all()
+        finally:
+            meeting_context_cache.finish_load(load, rows, requested)
+        return self._history_lines(rows, limit)
+    
+    def format_meeting_context(self, history: List[str]) -> str:
+        if not history:
             return "This is the start of the meeting."
-        
-        # Reverse to chronological order
-        messages = reversed(messages)
-        
-        context_parts = ["Recent conversation:"]
-        for msg in messages:
-            context_parts.append(f"{msg.sender_name}: {msg.content}")
-        
-        return "\n".join(context_parts)
+        return "\n".join([self.HISTORY_HEADER] + history)
+    
+    def _knowledge_query(self, company_id: int, limit: int):
+        return select(Knowledge.title, Knowledge.content)\
+            .where(Knowledge.company_id == company_id)\
+            .order_by(Knowledge.created_at.desc())\
+            .limit(limit)
     
     def get_company_knowledge_context(self, db: Session, company_id: int, limit: int = 5) -> str:
         """Get company knowledge base as context"""
-        knowledge_entries = db.query(Knowledge)\
-            .filter(Knowledge.company_id == company_id)\
-            .order_by(Knowledge.created_at.desc())\
-            .limit(limit)\
-            .all()
-        
+        return self.format_knowledge_context(db.execute(self._knowledge_query(company_id, limit)).all())
+    
+    async def aget_company_knowledge_context(self, db: AsyncSession, company_id: int, limit: int = 5) -> str:
+        """get_company_knowledge_context on an async session"""
+        return self.format_knowledge_context((await db.execute(self._knowledge_query(company_id, limit))).all())
+    
+    def format_knowledge_context(self, knowledge_entries) -> str:
         if not knowledge_entries:
             return ""
         
@@ -102,7 +148,7 @@ class MemoryService:
     
     async def generate_meeting_summary(
         self,
-        db: Session,
+        db: AsyncSession,
         meeting_id: int,
         llm_service,
         provider: str = "gemini",  # Added param
@@ -111,29 +157,30 @@ class MemoryService:
         """Generate a summary of the meeting using specific LLM"""
         from ..models import MeetingImage
         
-        messages = db.query(MeetingMessage)\
-            .filter(MeetingMessage.meeting_id == meeting_id)\
-            .order_by(MeetingMessage.created_at)\
-            .all()
+        messages = (await db.execute(
+            select(MeetingMessage.sender_name, MeetingMessage.content)
+            .where(MeetingMessage.meeting_id == meeting_id)
+            .order_by(MeetingMessage.created_at)
+        )).all()
         
         if not messages:
             return "No discussion took place."
         
         transcript = []
-        for msg in messages:
-            transcript.append(f"{msg.sender_name}: {msg.content}")
+        for sender_name, content in messages:
+            transcript.append(f"{sender_name}: {content}")
         
         conversation = "\n".join(transcript)
         
-        images = db.query(MeetingImage)\
-            .filter(MeetingImage.meeting_id == meeting_id)\
-            .all()
+        descriptions = (await db.execute(
+            select(MeetingImage.image_metadata).where(MeetingImage.meeting_id == meeting_id)
+        )).scalars().all()
         
         images_context = ""
-        if images:
+        if descriptions:
             images_context = "\n\nImages discussed in this meeting:\n"
-            for img in images:
-                desc = img.image_metadata or "No description"
+            for description in descriptions:
+                desc = description or "No description"
                 images_context += f"- {desc}\n"
         
         system_prompt = (
@@ -150,7 +197,9 @@ class MemoryService:
             prompt=prompt,
             system_prompt=system_prompt,
             provider=provider,
-            model=model
+            model=model,
+            meeting_id=meeting_id,
+            priority=PRIORITY_BACKGROUND,
         ):
             summary_parts.append(chunk)
         
@@ -1,6 +1,8 @@
 # backend\app\services\mention_parser.py
 import re
 from typing import List, Tuple, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from ..models.meeting import MeetingImage
 from ..models.company_asset import CompanyAsset
@@ -188,6 +190,82 @@ class MentionParser:
         all_missing.extend(asset_missing)
         
         return all_paths, all_missing
+    
+    async def aresolve_all_mentions(
+        self,
+        text: str,
+        meeting_id: int,
+        company_id: int,
+        db: AsyncSession
+    ) -> Tuple[List[str], List[str]]:
+        """
+        resolve_all_mentions on an async session; one query for all @img mentions and
+        one for all asset mentions instead of one per mention
+        
+        Returns:
+            Tuple of (all_resolved_paths, all_missing_mentions)
+        """
+        mentions = self.parse_mentions(text)
+        
+        if not mentions:
+            return [], []
+        
+        image_orders = {}
+        for mention in mentions:
+            if mention.startswith('img'):
+                try:
+                    image_orders[mention] = int(mention[3:])
+                except (ValueError, IndexError):
+                    image_orders[mention] = None
+        asset_names = [mention for mention in mentions if not mention.startswith('img')]
+        
+        image_rows = []
+        if image_orders:
+            image_rows = (await db.execute(
+                select(MeetingImage.display_order, MeetingImage.image_path)
+                .where(
+                    MeetingImage.meeting_id == meeting_id,
+                    MeetingImage.display_order.in_([o for o in image_orders.values() if o is not None])
+                )
+                .order_by(MeetingImage.id)
+            )).all()
+        asset_rows = []
+        if asset_names:
+            asset_rows = (await db.execute(
+                select(CompanyAsset.asset_name, CompanyAsset.file_path)
+                .where(CompanyAsset.company_id == company_id, CompanyAsset.asset_name.in_(asset_names))
+                .order_by(CompanyAsset.id)
+            )).all()
+        
+        img_paths, img_missing = self._paths_for(image_orders, image_rows, "Image")
+        asset_paths, asset_missing = self._paths_for({name: name for name in asset_names}, asset_rows, "Asset")
+        return img_paths + asset_paths, img_missing + asset_missing
+    
+    def _paths_for(self, keys: dict, rows, kind: str) -> Tuple[List[str], List[str]]:
+        """Resolve mentions (mention -> row key, in order) against (key, raw_path) rows"""
+        BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        found = {}
+        for key, raw_path in rows:
+            found.setdefault(key, raw_path)  # First match wins, like .first()
+        
+        resolved_paths = []
+        missing_mentions = []
+        for mention, key in keys.items():
+            raw_path = found.get(key) if key is not None else None
+            if raw_path is None:
+                missing_mentions.append(f"@{mention}")
+                continue
+            # Convert relative path to absolute
+            raw_path = raw_path.replace("\\", "/")
+            if raw_path.startswith("/"):
+                raw_path = raw_path[1:]
+            abs_path = os.path.join(BASE_DIR, raw_path)
+            if os.path.exists(abs_path):
+                resolved_paths.append(abs_path)
+            else:
+                print(f"WARNING: {kind} file not found: {abs_path}")
+                missing_mentions.append(f"@{mention}")
+        return resolved_paths, missing_mentions
 
 
 # Singleton instance
@@ -0,0 +1,105 @@
+# backend\app\services\message_sync.py
+import hashlib
+from typing import List, Optional, Tuple
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from ..models import MeetingMessage
+
+MAX_PAGE_SIZE = 500
+
+
+def _version_query(meeting_id: int):
+    return select(
+        func.count(MeetingMessage.id),
+        func.max(MeetingMessage.id),
+        func.max(MeetingMessage.updated_at),
+    ).where(MeetingMessage.meeting_id == meeting_id)
+
+
+def _version(row) -> Tuple[int, int, Optional[str]]:
+    count, max_id, last_edit = row
+    return count, max_id or 0, str(last_edit) if last_edit else None
+
+
+def messages_version(db: Session, meeting_id: int) -> Tuple[int, int, Optional[str]]:
+    """(count, max id, last edit) - changes whenever a message is added, edited or deleted"""
+    return _version(db.execute(_version_query(meeting_id)).one())
+
+
+async def amessages_version(db: AsyncSession, meeting_id: int) -> Tuple[int, int, Optional[str]]:
+    """messages_version on an async session"""
+    return _version((await db.execute(_version_query(meeting_id))).one())
+
+
+def messages_etag(meeting_id: int, version: Tuple, **params) -> str:
+    """Weak ETag for one meeting's message list under the given query params"""
+    key = repr((meeting_id, version, sorted(params.items())))
+    return f'W/"{hashlib.sha1(key.encode()).hexdigest()[:20]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # Weak comparison: W/"x" and "x" are the same version
+    bare = etag[2:] if etag.startswith("W/") else etag
+    return "*" in candidates or any(
+        (tag[2:] if tag.startswith("W/") else tag) == bare for tag in candidates
+    )
+
+
+def message_page(
+    db: Session,
+    meeting_id: int,
+    before: Optional[int] = None,
+    after: Optional[int] = None,
+    limit: Optional[int] = None,
+) -> Tuple[List[MeetingMessage], bool]:
+    """
+    Keyset page by message id, always returned oldest first. With `after` the page starts
+    right after that id (walking forward); otherwise it is the newest `limit` messages
+    before `before` (the tail when both are omitted). The flag tells whether more
+    messages exist in the walking direction.
+    """
+    query = db.query(MeetingMessage).filter(MeetingMessage.meeting_id == meeting_id)
+    if before is not None:
+        query = query.filter(MeetingMessage.id < before)
+    if after is not None:
+        query = query.filter(MeetingMessage.id > after)
+    if limit is None:
+        return query.order_by(MeetingMessage.id).all(), False
+
+    if after is not None:
+        rows = query.order_by(MeetingMessage.id).limit(limit + 1).all()
+        return rows[:limit], len(rows) > limit
+    rows = query.order_by(MeetingMessage.id.desc()).limit(limit + 1).all()
+    return list(reversed(rows[:limit])), len(rows) > limit
+
+
+def message_delta(
+    db: Session, meeting_id: int, since_id: int, limit: Optional[int] = None
+) -> Tuple[List[MeetingMessage], bool]:
+    """
+    Messages created after `since_id` plus older ones edited since it was written, oldest
+    first. Deletions (resend) are not visible here; clients compare the total count.
+    """
+    watermark = (
+        db.query(MeetingMessage.created_at)
+        .filter(MeetingMessage.meeting_id == meeting_id, MeetingMessage.id <= since_id)
+        .order_by(MeetingMessage.id.desc())
+        .limit(1)
+        .scalar()
+    )
+    changed = MeetingMessage.id > since_id
+    if watermark is not None:
+        changed = or_(changed, MeetingMessage.updated_at > watermark)
+    query = (
+        db.query(MeetingMessage)
+        .filter(MeetingMessage.meeting_id == meeting_id, changed)
+        .order_by(MeetingMessage.id)
+    )
+    if limit is None:
+        return query.all(), False
+    rows = query.limit(limit + 1).all()
+    return rows[:limit], len(rows) > limit
@@ -0,0 +1,200 @@
+# backend\app\services\mock_provider.py
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+from typing import AsyncGenerator, Any, Callable, Iterator, List, Optional
+from urllib.parse import parse_qsl
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from ..config import settings
+
+MOCK_ERROR = "Error: Mock provider injected failure"
+
+WORDS = (
+    "the team should review budget timeline risk plan customer launch design metric "
+    "quarter roadmap feature support hiring vendor contract scope quality release "
+    "we can agree next step owner priority feedback data report update meeting"
+).split()
+
+
+class MockProfile:
+    """Latency/error knobs for one mock call: settings, overridden by the model string"""
+
+    FIELDS = {
+        "ttft_ms": float,
+        "tokens_per_second": float,
+        "chunk_tokens": int,
+        "reply_tokens": int,
+        "error_rate": float,
+        "seed": int,
+    }
+
+    def __init__(self, model: Optional[str] = None):
+        for name, cast in self.FIELDS.items():
+            setattr(self, name, cast(getattr(settings, f"mock_llm_{name}")))
+        # e.g. "mock?ttft_ms=50&tokens_per_second=500" to mix profiles in one meeting
+        query = (model or "").partition("?")[2]
+        for name, value in parse_qsl(query):
+            if name in self.FIELDS:
+                setattr(self, name, self.FIELDS[name](value))
+
+    @property
+    def seconds_per_chunk(self) -> float:
+        if self.tokens_per_second <= 0:
+            return 0.0
+        return max(1, self.chunk_tokens) / self.tokens_per_second
+
+
+class MockLLMProvider:
+    """Offline provider with deterministic replies and configurable latency and failures"""
+
+    def __init__(self):
+        self._script: Optional[List[Any]] = None
+        self._script_path: Optional[str] = None
+
+    @property
+    def enabled(self) -> bool:
+        return settings.mock_llm_enabled
+
+    def _load_script(self) -> List[Any]:
+        """Scripted replies: a JSON list of strings and/or {"match": regex, "reply": text}"""
+        path = settings.mock_llm_script_path
+        if path != self._script_path:
+            self._script_path = path
+            self._script = []
+            if path:
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        self._script = json.load(f)
+                except Exception as e:
+                    print(f"WARNING: Could not load mock LLM script {path}: {e}")
+        return self._script
+
+    def _rng(self, profile: MockProfile, system_prompt: str, prompt: str, purpose: str) -> random.Random:
+        # Same seed + same input -> same reply and same failure decision
+        material = f"{profile.seed}\0{purpose}\0{system_prompt}\0{prompt}"
+        digest = hashlib.sha256(material.encode("utf-8")).hexdigest()
+        return random.Random(int(digest[:16], 16))
+
+    def reply_for(self, prompt: str, system_prompt: str = "", model: Optional[str] = None) -> str:
+        profile = MockProfile(model)
+        rng = self._rng(profile, system_prompt, prompt, "reply")
+        script = self._load_script()
+        plain = [entry for entry in script if isinstance(entry, str)]
+        for entry in script:
+            if isinstance(entry, dict) and re.search(entry.get("match", ""), f"{system_prompt}\n{prompt}"):
+                return entry.get("reply", "")
+        if plain:
+            return rng.choice(plain)
+        words = [rng.choice(WORDS) for _ in range(max(1, profile.reply_tokens))]
+        words[0] = words[0].capitalize()
+        return " ".join(words) + "."
+
+    def _chunks(self, text: str, chunk_tokens: int) -> List[str]:
+        words = text.split(" ")
+        size = max(1, chunk_tokens)
+        return [
+            " ".join(words[i:i + size]) + (" " if i + size < len(words) else "")
+            for i in range(0, len(words), size)
+        ]
+
+    def _plan(self, prompt: str, system_prompt: str, model: Optional[str]):
+        """Chunks to emit and, if a failure is injected, the chunk index it happens at"""
+        profile = MockProfile(model)
+        rng = self._rng(profile, system_prompt, prompt, "failure")
+        chunks = self._chunks(self.reply_for(prompt, system_prompt, model), profile.chunk_tokens)
+        fail_at = None
+        if rng.random() < profile.error_rate:
+            fail_at = rng.randrange(len(chunks) + 1)  # 0 = fails before the first token
+        return profile, chunks, fail_at
+
+    async def stream(
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        model: Optional[str] = None,
+    ) -> AsyncGenerator[str, None]:
+        profile, chunks, fail_at = self._plan(prompt, system_prompt, model)
+        await asyncio.sleep(profile.ttft_ms / 1000)
+        for i, chunk in enumerate(chunks):
+            if i == fail_at:
+                yield MOCK_ERROR
+                return
+            if i:
+                await asyncio.sleep(profile.seconds_per_chunk)
+            yield chunk
+        if fail_at == len(chunks):
+            yield MOCK_ERROR
+
+    def complete_sync(self, prompt: str, system_prompt: str = "", model: Optional[str] = None) -> str:
+        """Blocking variant for synchronous adapters (AutoGen); sleeps for the simulated duration"""
+        profile, chunks, fail_at = self._plan(prompt, system_prompt, model)
+        time.sleep(profile.ttft_ms / 1000 + profile.seconds_per_chunk * max(0, len(chunks) - 1))
+        if fail_at is not None:
+            raise RuntimeError(MOCK_ERROR)
+        return "".join(chunks)
+
+
+class MockChatModel(BaseChatModel):
+    """LangChain chat model backed by the mock provider, for offline LangGraph sessions"""
+
+    model: str = "mock"
+    # Optional override that picks the reply from the conversation (e.g. a scripted supervisor)
+    responder: Optional[Callable[[List[BaseMessage]], Optional[str]]] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "myvco-mock"
+
+    def _split(self, messages: List[BaseMessage]):
+        system_prompt = "\n".join(str(m.content) for m in messages if m.type == "system")
+        prompt = "\n".join(str(m.content) for m in messages if m.type != "system")
+        return system_prompt, prompt
+
+    def _reply(self, messages: List[BaseMessage]) -> Optional[str]:
+        return self.responder(messages) if self.responder is not None else None
+
+    def bind_tools(self, tools, **kwargs):
+        # The mock never calls tools, so binding is a no-op
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        system_prompt, prompt = self._split(messages)
+        content = self._reply(messages)
+        if content is None:
+            content = mock_provider.complete_sync(prompt, system_prompt, self.model)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        content = self._reply(messages)
+        if content is None:
+            system_prompt, prompt = self._split(messages)
+            parts = []
+            async for chunk in mock_provider.stream(prompt, system_prompt, self.model):
+                if chunk == MOCK_ERROR:
+                    raise RuntimeError(MOCK_ERROR)
+                parts.append(chunk)
+            content = "".join(parts)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        content = self._reply(messages)
+        if content is not None:
+            yield ChatGenerationChunk(message=AIMessageChunk(content=content))
+            return
+        system_prompt, prompt = self._split(messages)
+        async for chunk in mock_provider.stream(prompt, system_prompt, self.model):
+            if chunk == MOCK_ERROR:
+                raise RuntimeError(MOCK_ERROR)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=chunk))
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        yield ChatGenerationChunk(message=AIMessageChunk(content=self._generate(messages).generations[0].message.content))
+
+
+# Singleton instance
+mock_provider = MockLLMProvider()
@@ -0,0 +1,195 @@
+# backend\app\services\model_catalog.py
+import asyncio
+import time
+from typing import Dict, List, Optional, Any
+from ..config import settings
+from .http_pool import http_client_pool
+
+
+class OllamaModelCatalog:
+    """
+    Cached view of the models on each Ollama endpoint. Served from memory; stale
+    entries are revalidated in the background instead of blocking the caller.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Dict[str, Any]] = {}  # base_url -> {"models", "fetched_at"}
+        self._health: Dict[str, Dict[str, Any]] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        # digest -> context length, so /api/show only runs for new or changed models
+        self._context_lengths: Dict[str, Optional[int]] = {}
+        self._loop_task: Optional[asyncio.Task] = None
+        self.counters = {"hits": 0, "stale_hits": 0, "cold_misses": 0, "refreshes": 0, "refresh_errors": 0}
+
+    def _base_url(self, base_url: Optional[str] = None) -> str:
+        return (base_url or settings.ollama_base_url).rstrip("/")
+
+    def _health_for(self, base_url: str) -> Dict[str, Any]:
+        return self._health.setdefault(base_url, {
+            "healthy": None,
+            "last_success": None,
+            "last_error": None,
+            "last_error_at": None,
+            "consecutive_failures": 0,
+            "latency_ms": None,
+        })
+
+    async def _context_length(self, client, model: Dict[str, Any]) -> Optional[int]:
+        digest = model.get("digest") or model["name"]
+        if digest in self._context_lengths:
+            return self._context_lengths[digest]
+        length = None
+        try:
+            resp = await client.post("/api/show", json={"model": model["name"]})
+            if resp.status_code == 200:
+                for key, val in resp.json().get("model_info", {}).items():
+                    if "context_length" in key:
+                        length = int(val)
+                        break
+        except Exception as e:
+            print(f"WARNING: Could not read context length for Ollama model {model['name']}: {e}")
+            return None  # Not memoized, retried on the next refresh
+        self._context_lengths[digest] = length
+        return length
+
+    async def _fetch(self, base_url: str) -> List[Dict[str, Any]]:
+        client = http_client_pool.get_client(base_url)
+        response = await client.get("/api/tags", timeout=settings.ollama_catalog_timeout)
+        response.raise_for_status()
+        raw_models = response.json().get("models", [])
+
+        context_lengths = await asyncio.gather(*[self._context_length(client, m) for m in raw_models])
+        models = []
+        for model, context_length in zip(raw_models, context_lengths):
+            details = model.get("details") or {}
+            models.append({
+                "name": model["name"],
+                "size": model.get("size"),
+                "modified_at": model.get("modified_at"),
+                "digest": model.get("digest"),
+                "family": details.get("family"),
+                "parameter_size": details.get("parameter_size"),
+                "quantization": details.get("quantization_level"),
+                "format": details.get("format"),
+                "context_length": context_length,
+            })
+        return models
+
+    async def _refresh(self, base_url: str):
+        health = self._health_for(base_url)
+        started = time.perf_counter()
+        try:
+            models = await self._fetch(base_url)
+        except Exception as e:
+            self.counters["refresh_errors"] += 1
+            health.update({
+                "healthy": False,
+                "last_error": str(e) or e.__class__.__name__,
+                "last_error_at": time.time(),
+                "consecutive_failures": health["consecutive_failures"] + 1,
+            })
+            print(f"ERROR: Exception fetching Ollama models from {base_url}: {e}")
+            return
+        now = time.time()
+        self._entries[base_url] = {"models": models, "fetched_at": now}
+        health.update({
+            "healthy": True,
+            "last_success": now,
+            "consecutive_failures": 0,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+        })
+        self.counters["refreshes"] += 1
+
+    def refresh(self, base_url: Optional[str] = None) -> asyncio.Task:
+        """Start (or join) a background refresh of one endpoint"""
+        base_url = self._base_url(base_url)
+        task = self._refreshing.get(base_url)
+        if task is None:
+            task = asyncio.ensure_future(self._refresh(base_url))
+            self._refreshing[base_url] = task
+            task.add_done_callback(lambda _: self._refreshing.pop(base_url, None))
+        return task
+
+    async def get_models(self, base_url: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Models of an endpoint with metadata; never waits longer than the cold-start budget"""
+        base_url = self._base_url(base_url)
+        if not base_url:
+            return []
+
+        entry = self._entries.get(base_url)
+        if entry is not None:
+            if time.time() - entry["fetched_at"] > settings.ollama_catalog_ttl:
+                self.counters["stale_hits"] += 1
+                self.refresh(base_url)
+            else:
+                self.counters["hits"] += 1
+            return entry["models"]
+
+        # Nothing cached yet (first load or endpoint just changed): wait briefly for the fetch
+        self.counters["cold_misses"] += 1
+        last_error_at = self._health_for(base_url)["last_error_at"]
+        if last_error_at and time.time() - last_error_at < settings.ollama_catalog_ttl:
+            # Endpoint failed recently: do not make every page load wait on it again
+            self.refresh(base_url)
+            return []
+        try:
+            await asyncio.wait_for(asyncio.shield(self.refresh(base_url)), settings.ollama_catalog_cold_wait)
+        except asyncio.TimeoutError:
+            pass
+        entry = self._entries.get(base_url)
+        return entry["models"] if entry else []
+
+    async def get_model_names(self, base_url: Optional[str] = None) -> List[str]:
+        return [model["name"] for model in await self.get_models(base_url)]
+
+    def snapshot(self, base_url: Optional[str] = None) -> Dict[str, Any]:
+        """Catalog plus freshness and health of an endpoint, without touching the network"""
+        base_url = self._base_url(base_url)
+        entry = self._entries.get(base_url)
+        fetched_at = entry["fetched_at"] if entry else None
+        return {
+            "base_url": base_url,
+            "models": entry["models"] if entry else [],
+            "fetched_at": fetched_at,
+            "stale": fetched_at is None or time.time() - fetched_at > settings.ollama_catalog_ttl,
+            "refreshing": base_url in self._refreshing,
+            "health": self._health_for(base_url) if base_url else None,
+        }
+
+    def invalidate(self, base_url: Optional[str] = None):
+        if base_url is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(self._base_url(base_url), None)
+
+    async def _refresh_loop(self):
+        while True:
+            if settings.ollama_base_url:
+                await asyncio.shield(self.refresh())
+            await asyncio.sleep(settings.ollama_catalog_refresh_interval)
+
+    def start(self):
+        """Keep the configured endpoint's catalog warm for the app's lifetime"""
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._refresh_loop())
+
+    async def aclose(self):
+        tasks = [t for t in [self._loop_task, *self._refreshing.values()] if t is not None and not t.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop_task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "endpoints": {
+                url: {"models": len(entry["models"]), "fetched_at": entry["fetched_at"]}
+                for url, entry in self._entries.items()
+            },
+            "health": self._health,
+        }
+
+
+# Singleton instance
+ollama_model_catalog = OllamaModelCatalog()
@@ -0,0 +1,115 @@
+# backend\app\services\model_limits.py
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple, Any
+from ..config import settings
+from .db_writer import db_writer
+
+# Remote lookup for a model's context window; returns None when the provider could not be reached
+LimitFetcher = Callable[[str, str], Awaitable[Optional[int]]]
+
+
+class ModelLimitCache:
+    """
+    Process-level memo of model context limits in front of the LlmModelLimit table.
+    Concurrent misses for the same model share one lookup, and stale entries are
+    refreshed in the background while the current value keeps being served.
+    """
+
+    def __init__(self):
+        self._limits: Dict[Tuple[str, str], Tuple[int, float]] = {}  # key -> (max_tokens, loaded_at)
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+        self.counters = {"hits": 0, "misses": 0, "coalesced": 0, "refreshes": 0}
+
+    def _read_db(self, provider: str, model_name: str) -> Optional[int]:
+        from ..database import SessionLocal
+        from ..models import LlmModelLimit
+
+        with SessionLocal() as db:
+            row = db.query(LlmModelLimit).filter(
+                LlmModelLimit.provider == provider,
+                LlmModelLimit.model_name == model_name
+            ).first()
+            return row.max_tokens if row else None
+
+    def _write_db(self, provider: str, model_name: str, max_tokens: int):
+        from sqlalchemy.exc import IntegrityError
+        from ..database import SessionLocal
+        from ..models import LlmModelLimit
+
+        with SessionLocal() as db:
+            # Two attempts: another writer may insert the same (provider, model) in between
+            for _ in range(2):
+                try:
+                    row = db.query(LlmModelLimit).filter(
+                        LlmModelLimit.provider == provider,
+                        LlmModelLimit.model_name == model_name
+                    ).first()
+                    if row:
+                        row.max_tokens = max_tokens
+                    else:
+                        db.add(LlmModelLimit(provider=provider, model_name=model_name, max_tokens=max_tokens))
+                    db.commit()
+                    return
+                except IntegrityError:
+                    db.rollback()
+                except Exception as e:
+                    db.rollback()
+                    print(f"Error caching model limit: {e}")
+                    return
+
+    async def _load(self, provider: str, model_name: str, fetch: LimitFetcher, fallback: int) -> int:
+        stored = await asyncio.to_thread(self._read_db, provider, model_name)
+        if stored is None:
+            fetched = await fetch(provider, model_name)
+            stored = fetched if fetched is not None else fallback
+            await db_writer.run(self._write_db, provider, model_name, stored)
+        self._limits[(provider, model_name)] = (stored, time.monotonic())
+        return stored
+
+    async def _refresh(self, provider: str, model_name: str, fetch: LimitFetcher):
+        fetched = await fetch(provider, model_name)
+        if fetched is None:
+            # Keep serving the old value; try again after another refresh interval
+            value, _ = self._limits[(provider, model_name)]
+            self._limits[(provider, model_name)] = (value, time.monotonic())
+            return
+        self._limits[(provider, model_name)] = (fetched, time.monotonic())
+        await db_writer.run(self._write_db, provider, model_name, fetched)
+        self.counters["refreshes"] += 1
+
+    def _single_flight(self, key: Tuple[str, str], factory: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.counters["coalesced"] += 1
+        return task
+
+    async def get(self, provider: str, model_name: str, fetch: LimitFetcher, fallback: int) -> int:
+        key = (provider, model_name)
+        entry = self._limits.get(key)
+        if entry is not None:
+            self.counters["hits"] += 1
+            value, loaded_at = entry
+            if time.monotonic() - loaded_at > settings.model_limit_refresh_seconds and key not in self._inflight:
+                self._single_flight(key, lambda: self._refresh(provider, model_name, fetch))
+            return value
+
+        self.counters["misses"] += 1
+        task = self._single_flight(key, lambda: self._load(provider, model_name, fetch, fallback))
+        # shield: a cancelled request must not cancel the lookup other callers are waiting on
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "entries": {f"{p}/{m}": value for (p, m), (value, _) in self._limits.items()},
+            "inflight": len(self._inflight),
+        }
+
+
+# Singleton instance
+model_limit_cache = ModelLimitCache()
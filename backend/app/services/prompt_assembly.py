@@ -0,0 +1,110 @@
+# backend\app\services\prompt_assembly.py
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from ..config import settings
+from .token_counter import token_counter
+
+
+class PromptAssembly:
+    """One participant's prompt for one message: packed blocks, final system prompt and images"""
+
+    def __init__(
+        self,
+        meeting_id: int,
+        staff_id: int,
+        content: str,
+        provider: str,
+        model: str,
+        blocks: List[Dict[str, Any]],
+        packing: Dict[str, Any],
+        system_prompt: str,
+        image_paths: List[str],
+        missing_mentions: List[str],
+    ):
+        self.meeting_id = meeting_id
+        self.staff_id = staff_id
+        self.content = content
+        self.provider = provider
+        self.model = model
+        self.blocks = blocks
+        self.packing = packing
+        self.system_prompt = system_prompt
+        self.image_paths = image_paths
+        self.missing_mentions = missing_mentions
+        self.fingerprint: Optional[Tuple] = None  # Set when stored for reuse
+        self.created_at = time.monotonic()
+        self._token_counts: Optional[Dict[str, Any]] = None
+
+    def token_counts(self) -> Dict[str, Any]:
+        """Counted with the participant's tokenizer on first use (blocks were counted while packing)"""
+        if self._token_counts is None:
+            system_tokens = token_counter.count(self.system_prompt, self.provider, self.model)
+            user_tokens = token_counter.count(self.content, self.provider, self.model)
+            image_tokens = sum(token_counter.count_image(path, self.provider) for path in self.image_paths)
+            self._token_counts = {
+                "system_prompt": system_tokens,
+                "user_content": user_tokens,
+                "images": image_tokens,
+                "total": system_tokens + user_tokens + image_tokens,
+                "tokenizer": token_counter.tokenizer_name(self.provider, self.model),
+            }
+        return self._token_counts
+
+
+class PromptAssemblyStore:
+    """
+    Short-lived assemblies from /messages/preview, handed out by opaque handle so the
+    confirmed send can reuse them. A handle only matches while its fingerprint (participant
+    settings, staff/library versions, message list version, content) is unchanged.
+    """
+
+    def __init__(self):
+        self._entries: "OrderedDict[str, PromptAssembly]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {"stored": 0, "reused": 0, "stale": 0, "expired": 0, "unknown": 0, "evictions": 0}
+
+    def _expired(self, assembly: PromptAssembly) -> bool:
+        return time.monotonic() - assembly.created_at > settings.prompt_handle_ttl_seconds
+
+    def put(self, assembly: PromptAssembly, fingerprint: Tuple) -> str:
+        handle = secrets.token_urlsafe(16)
+        assembly.fingerprint = fingerprint
+        with self._lock:
+            self._entries[handle] = assembly
+            self.counters["stored"] += 1
+            while self._entries:
+                oldest = next(iter(self._entries.values()))
+                if len(self._entries) <= settings.prompt_handle_max_entries and not self._expired(oldest):
+                    break
+                self._entries.popitem(last=False)
+                self.counters["evictions"] += 1
+        return handle
+
+    def get(self, handle: Optional[str], fingerprint: Tuple) -> Optional[PromptAssembly]:
+        """The stored assembly if it is still current, else None (the caller rebuilds)"""
+        if not handle:
+            return None
+        with self._lock:
+            assembly = self._entries.get(handle)
+            if assembly is None:
+                self.counters["unknown"] += 1
+                return None
+            if self._expired(assembly):
+                del self._entries[handle]
+                self.counters["expired"] += 1
+                return None
+            if assembly.fingerprint != fingerprint:
+                self.counters["stale"] += 1
+                return None
+            self.counters["reused"] += 1
+            return assembly
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "ttl_seconds": settings.prompt_handle_ttl_seconds, **self.counters}
+
+
+# Singleton instance
+prompt_assemblies = PromptAssemblyStore()
@@ -0,0 +1,102 @@
+# backend\app\services\prompt_cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+from ..config import settings
+from .library_resolver import library_resolver
+
+
+class PromptCache:
+    """
+    Resolved static prompt blocks (personality, expertise, knowledge base, personal
+    instructions) per staff member, so a turn only rebuilds the company and meeting
+    blocks. Entries are valid for one staff version (bumped by update_staff) and one
+    library version; each block keeps its token counts per tokenizer alongside.
+    """
+
+    def __init__(self):
+        self._entries: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self._staff_versions: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.counters = {
+            "hits": 0,
+            "misses": 0,
+            "stale": 0,
+            "evictions": 0,
+            "compile_ms_total": 0.0,
+            "assemblies": 0,
+            "assembly_ms_total": 0.0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return settings.prompt_cache_enabled
+
+    def staff_version(self, staff_id: int) -> int:
+        return self._staff_versions.get(staff_id, 0)
+
+    def bump_staff(self, staff_id: int):
+        """Called after a staff member's prompt fields change"""
+        with self._lock:
+            self._staff_versions[staff_id] = self._staff_versions.get(staff_id, 0) + 1
+            for key in [key for key in self._entries if key[0] == staff_id]:
+                del self._entries[key]
+
+    def static_blocks(
+        self, staff_id: int, source: Tuple, compile_blocks: Callable[[], Dict[str, str]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        block id -> {"content", "token_counts"}. `source` holds the raw inputs (staff fields
+        plus company name/description); keying on it too keeps a global staff member's
+        companies apart, and stops a turn that loaded the staff row just before an update from
+        pinning stale content under the new version. compile_blocks() runs on a miss.
+        """
+        key = (staff_id, source)
+        versions = (self.staff_version(staff_id), library_resolver.version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["versions"] == versions:
+                self._entries.move_to_end(key)
+                self.counters["hits"] += 1
+                return entry["blocks"]
+            self.counters["stale" if entry is not None else "misses"] += 1
+
+        started = time.perf_counter()
+        blocks = {block_id: {"content": content, "token_counts": {}} for block_id, content in compile_blocks().items()}
+        with self._lock:
+            self.counters["compile_ms_total"] += (time.perf_counter() - started) * 1000
+            self._entries[key] = {"versions": versions, "blocks": blocks}
+            self._entries.move_to_end(key)
+            while len(self._entries) > settings.prompt_cache_max_entries:
+                self._entries.popitem(last=False)
+                self.counters["evictions"] += 1
+        return blocks
+
+    def record_assembly(self, elapsed_ms: float):
+        self.counters["assemblies"] += 1
+        self.counters["assembly_ms_total"] += elapsed_ms
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.counters["hits"] + self.counters["misses"] + self.counters["stale"]
+        compiles = self.counters["misses"] + self.counters["stale"]
+        assemblies = self.counters["assemblies"]
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "library_version": library_resolver.version,
+            **self.counters,
+            "compile_ms_total": round(self.counters["compile_ms_total"], 2),
+            "assembly_ms_total": round(self.counters["assembly_ms_total"], 2),
+            "hit_ratio": round(self.counters["hits"] / lookups, 3) if lookups else 0.0,
+            "avg_compile_ms": round(self.counters["compile_ms_total"] / compiles, 3) if compiles else 0.0,
+            "avg_assembly_ms": round(self.counters["assembly_ms_total"] / assemblies, 3) if assemblies else 0.0,
+        }
+
+
+# Singleton instance
+prompt_cache = PromptCache()
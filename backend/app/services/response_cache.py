@@ -0,0 +1,155 @@
+# backend\app\services\response_cache.py
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any
+from ..config import settings
+
+try:
+    import diskcache
+except ImportError:  # The disk tier is optional
+    diskcache = None
+
+
+class ResponseCache:
+    """Exact-match cache for streamed LLM responses (in-memory LRU + optional on-disk tier)"""
+
+    def __init__(self):
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._disk = None
+        self.counters = {
+            "hits_memory": 0,
+            "hits_disk": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "stores": 0,
+            "evictions": 0,
+            "expired": 0,
+            "saved_chars": 0,
+            "saved_seconds": 0.0,
+        }
+        if settings.llm_cache_disk_dir and diskcache is not None:
+            try:
+                self._disk = diskcache.Cache(
+                    settings.llm_cache_disk_dir,
+                    size_limit=settings.llm_cache_disk_size_mb * 1024 * 1024,
+                )
+            except Exception as e:
+                print(f"WARNING: LLM disk cache disabled: {e}")
+
+    @property
+    def enabled(self) -> bool:
+        return settings.llm_cache_enabled
+
+    def ttl_for(self, provider: str) -> int:
+        return getattr(settings, f"llm_cache_ttl_{provider}", settings.llm_cache_ttl_default)
+
+    def _image_fingerprint(self, path: str) -> str:
+        try:
+            stat = os.stat(path)
+            return f"{os.path.abspath(path)}:{stat.st_mtime_ns}:{stat.st_size}"
+        except OSError:
+            return f"{path}:missing"
+
+    def make_key(
+        self,
+        prompt: str,
+        system_prompt: str,
+        provider: str,
+        model: Optional[str],
+        temperature: float,
+        image_paths: List[str],
+    ) -> str:
+        """Hash everything that influences the provider's answer"""
+        material = json.dumps(
+            [
+                provider,
+                model or "",
+                round(float(temperature), 4),
+                system_prompt,
+                prompt,
+                [self._image_fingerprint(p) for p in image_paths or []],
+            ],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[List[str]]:
+        """Return the cached chunk list, or None on a miss"""
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is not None:
+            if entry["expires_at"] <= now:
+                del self._memory[key]
+                self.counters["expired"] += 1
+                entry = None
+            else:
+                self._memory.move_to_end(key)
+                self._record_hit("hits_memory", entry)
+                return entry["chunks"]
+
+        if self._disk is not None:
+            entry = self._disk.get(key)
+            if entry is not None:
+                self._remember(key, entry)
+                self._record_hit("hits_disk", entry)
+                return entry["chunks"]
+
+        self.counters["misses"] += 1
+        return None
+
+    def set(self, key: str, provider: str, chunks: List[str], duration: float = 0.0):
+        ttl = self.ttl_for(provider)
+        if ttl <= 0:
+            return
+        entry = {
+            "chunks": list(chunks),
+            "chars": sum(len(c) for c in chunks),
+            "duration": duration,
+            "expires_at": time.time() + ttl,
+        }
+        self._remember(key, entry)
+        if self._disk is not None:
+            try:
+                self._disk.set(key, entry, expire=ttl)
+            except Exception as e:
+                print(f"WARNING: Could not write LLM response to disk cache: {e}")
+        self.counters["stores"] += 1
+
+    def record_bypass(self):
+        self.counters["bypassed"] += 1
+
+    def _remember(self, key: str, entry: Dict[str, Any]):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > settings.llm_cache_max_entries:
+            self._memory.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def _record_hit(self, counter: str, entry: Dict[str, Any]):
+        self.counters[counter] += 1
+        self.counters["saved_chars"] += entry["chars"]
+        self.counters["saved_seconds"] += entry["duration"]
+
+    def clear(self):
+        self._memory.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.counters["hits_memory"] + self.counters["hits_disk"]
+        lookups = hits + self.counters["misses"]
+        return {
+            **self.counters,
+            "saved_seconds": round(self.counters["saved_seconds"], 3),
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "disk_entries": len(self._disk) if self._disk is not None else None,
+            "enabled": self.enabled,
+        }
+
+
+# Singleton instance
+response_cache = ResponseCache()
@@ -0,0 +1,97 @@
+# backend\app\services\sse.py
+import asyncio
+import json
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, Optional
+from ..config import settings
+from .generation_jobs import JobBufferExpired
+from .stream_guard import DisconnectAwareStreamingResponse
+
+# Job event type -> transport event name
+EVENT_NAMES = {
+    "start": "speaker_start",
+    "chunk": "token",
+    "done": "speaker_end",
+    "usage": "usage",
+    "queue": "queue",
+    "error": "error",
+    "cancelled": "error",
+    "expired": "error",
+}
+
+# Yielded by with_heartbeats when the source stayed quiet for a whole interval
+HEARTBEAT = object()
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # nginx: do not buffer the stream
+}
+
+
+def event_name(event: Dict[str, Any]) -> str:
+    if event["type"] == "chunk" and event.get("error"):
+        return "error"  # Error text in place of the answer (see participant_events)
+    return EVENT_NAMES.get(event["type"], event["type"])
+
+
+def format_sse(event: Dict[str, Any], name: Optional[str] = None) -> str:
+    """One SSE frame; job events use their seq as the event id"""
+    lines = []
+    if "seq" in event:
+        lines.append(f"id: {event['seq']}")
+    lines.append(f"event: {name or event_name(event)}")
+    lines.append(f"data: {json.dumps(event)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def parse_last_event_id(value: Optional[str]) -> int:
+    try:
+        return max(0, int(value)) if value else 0
+    except ValueError:
+        return 0
+
+
+async def with_heartbeats(events: AsyncIterator[Any], interval: float) -> AsyncIterator[Any]:
+    """
+    Pass events through, yielding HEARTBEAT whenever none arrived for `interval` seconds.
+    The pending read runs in its own task so a heartbeat never cancels the source.
+    """
+    pending: Optional[asyncio.Future] = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(events.__anext__())
+            done, _ = await asyncio.wait({pending}, timeout=interval if interval > 0 else None)
+            if not done:
+                yield HEARTBEAT
+                continue
+            task, pending = pending, None
+            try:
+                event = task.result()
+            except StopAsyncIteration:
+                return
+            yield event
+    finally:
+        if pending is not None:
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+        await events.aclose()
+
+
+async def job_sse(job, after: int = 0, announce: bool = False) -> AsyncIterator[str]:
+    """SSE frames for a generation job, resuming after event id `after`"""
+    yield f"retry: {settings.sse_retry_ms}\n\n"
+    if announce:
+        yield format_sse({"job_id": job.id, "sse_url": f"/jobs/{job.id}/sse"}, name="job")
+    try:
+        async with aclosing(with_heartbeats(job.events(after), settings.sse_heartbeat_seconds)) as events:
+            async for event in events:
+                yield ": heartbeat\n\n" if event is HEARTBEAT else format_sse(event)
+    except JobBufferExpired as e:
+        yield format_sse({"type": "expired", "first_seq": e.first_seq})
+
+
+def job_sse_response(job, after: int = 0, announce: bool = False) -> DisconnectAwareStreamingResponse:
+    return DisconnectAwareStreamingResponse(
+        job_sse(job, after, announce), media_type="text/event-stream", headers=SSE_HEADERS
+    )
@@ -0,0 +1,27 @@
+# backend\app\services\stream_guard.py
+from fastapi.responses import StreamingResponse
+from .stream_telemetry import stream_telemetry
+
+
+class DisconnectAwareStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that closes its body generator as soon as the response ends.
+    Starlette stops sending when the client disconnects but leaves a generator that is
+    parked on `yield` suspended until garbage collection; closing it right away
+    cancels the upstream LLM stream and runs the generator's cleanup (partial saves).
+    """
+
+    client_disconnected = False
+
+    async def listen_for_disconnect(self, receive):
+        await super().listen_for_disconnect(receive)
+        self.client_disconnected = True
+        stream_telemetry.cancellation["client_disconnects"] += 1
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            aclose = getattr(self.body_iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
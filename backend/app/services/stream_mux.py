@@ -0,0 +1,91 @@
+# backend\app\services\stream_mux.py
+import asyncio
+from contextlib import aclosing
+from typing import AsyncIterator, Callable, Dict, Hashable, List, Optional, Tuple
+
+# Marks the end of one stream in the multiplexed output
+STREAM_END = None
+
+
+async def multiplex(
+    streams: Dict[Hashable, AsyncIterator[str]],
+) -> AsyncIterator[Tuple[Hashable, Optional[str]]]:
+    """
+    Run several streams concurrently and yield (key, chunk) as soon as any of them
+    produces one, plus (key, STREAM_END) when a stream finishes. Closing the
+    multiplexer cancels the streams that are still running.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def pump(key, stream):
+        try:
+            async with aclosing(stream):
+                async for chunk in stream:
+                    await queue.put((key, chunk, None))
+        except Exception as e:
+            await queue.put((key, None, e))
+            return
+        await queue.put((key, STREAM_END, None))
+
+    tasks = [asyncio.create_task(pump(key, stream)) for key, stream in streams.items()]
+    remaining = len(tasks)
+    try:
+        while remaining:
+            key, chunk, error = await queue.get()
+            if error is not None:
+                raise error
+            if chunk is STREAM_END:
+                remaining -= 1
+            yield key, chunk
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def chain(
+    streams: Dict[Hashable, AsyncIterator[str]],
+) -> AsyncIterator[Tuple[Hashable, Optional[str]]]:
+    """Same output shape as multiplex, but the streams run one after another"""
+    for key, stream in streams.items():
+        async with aclosing(stream):
+            async for chunk in stream:
+                yield key, chunk
+        yield key, STREAM_END
+
+
+async def ordered(
+    streams: Dict[Hashable, AsyncIterator[str]],
+    droppable: Optional[Callable[[str], bool]] = None,
+) -> AsyncIterator[Tuple[Hashable, Optional[str]]]:
+    """
+    Like multiplex, but the output follows the key order of `streams`: the current
+    stream is passed through live while later ones are buffered and flushed when
+    their turn comes. Buffered chunks matching `droppable` (e.g. stale queue hints)
+    are discarded.
+    """
+    order: List[Hashable] = list(streams)
+    buffers: Dict[Hashable, List[str]] = {key: [] for key in order}
+    finished = set()
+    turn = 0
+
+    async for key, chunk in multiplex(streams):
+        if key != order[turn]:
+            if chunk is STREAM_END:
+                finished.add(key)
+            elif not (droppable and droppable(chunk)):
+                buffers[key].append(chunk)
+            continue
+        yield key, chunk
+        if chunk is not STREAM_END:
+            continue
+        # Current stream is done: flush every buffered stream that already finished too
+        turn += 1
+        while turn < len(order):
+            current = order[turn]
+            for buffered in buffers.pop(current):
+                yield current, buffered
+            if current not in finished:
+                break
+            yield current, STREAM_END
+            turn += 1
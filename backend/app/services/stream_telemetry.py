@@ -0,0 +1,224 @@
+# backend\app\services\stream_telemetry.py
+import itertools
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Any
+from ..config import settings
+from .token_counter import token_counter
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return round(ordered[index], 1)
+
+
+class StreamRecord:
+    """Timing of one generate_stream call, fed chunk by chunk"""
+
+    def __init__(self, stream_id: int, provider: str, model: str, meeting_id, staff_id, priority: str):
+        self.id = stream_id
+        self.provider = provider
+        self.model = model
+        self.meeting_id = meeting_id
+        self.staff_id = staff_id
+        self.priority = priority
+        self.started = time.perf_counter()
+        self.started_wall = time.time()
+        self.first_chunk_at: Optional[float] = None
+        self.last_chunk_at: Optional[float] = None
+        self.chunks = 0
+        self.chars = 0
+        self.max_gap = 0.0
+        self.stalls = 0
+        self.queue_wait = 0.0
+        self.granted_at: Optional[float] = None  # Latest provider slot grant
+        self.served_by: Optional[tuple] = None  # (provider, model) that answered, set on the first token
+        self.status = "running"
+        self.duration: Optional[float] = None
+        self.tokens: Optional[int] = None
+        self._parts: List[str] = []
+
+    def chunk(self, text: str):
+        now = time.perf_counter()
+        if self.first_chunk_at is None:
+            self.first_chunk_at = now
+            if self.granted_at is not None and now - self.granted_at >= settings.stream_stall_seconds:
+                self.stalls += 1  # Provider sat on the first token
+        else:
+            gap = now - self.last_chunk_at
+            self.max_gap = max(self.max_gap, gap)
+            if gap >= settings.stream_stall_seconds:
+                self.stalls += 1
+        self.last_chunk_at = now
+        self.chunks += 1
+        self.chars += len(text)
+        self._parts.append(text)
+
+    @property
+    def ttft(self) -> Optional[float]:
+        """Seconds from the request to the first chunk, queue wait included"""
+        return self.first_chunk_at - self.started if self.first_chunk_at is not None else None
+
+    @property
+    def provider_ttft(self) -> Optional[float]:
+        """Seconds from getting a provider slot to the first chunk"""
+        return self.ttft - self.queue_wait if self.ttft is not None else None
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        if not self.tokens or self.first_chunk_at is None or self.last_chunk_at is None:
+            return None
+        generation = self.last_chunk_at - self.first_chunk_at
+        return self.tokens / generation if generation > 0 else None
+
+    def silent_for(self) -> float:
+        """Seconds since the last chunk (or the slot grant); 0 while still queued"""
+        reference = self.last_chunk_at or self.granted_at
+        return time.perf_counter() - reference if reference is not None else 0.0
+
+    def finish(self, status: str):
+        self.status = status
+        self.duration = time.perf_counter() - self.started
+        self.tokens = token_counter.count("".join(self._parts), self.provider, self.model) if self._parts else 0
+        self._parts = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        def ms(value):
+            return round(value * 1000, 1) if value is not None else None
+
+        return {
+            "id": self.id,
+            "provider": self.provider,
+            "model": self.model,
+            "meeting_id": self.meeting_id,
+            "staff_id": self.staff_id,
+            "priority": self.priority,
+            "status": self.status,
+            "started_at": self.started_wall,
+            "queue_wait_ms": ms(self.queue_wait),
+            "ttft_ms": ms(self.ttft),
+            "provider_ttft_ms": ms(self.provider_ttft),
+            "max_gap_ms": ms(self.max_gap),
+            "duration_ms": ms(self.duration),
+            "chunks": self.chunks,
+            "chars": self.chars,
+            "tokens": self.tokens,
+            "tokens_per_second": round(self.tokens_per_second, 1) if self.tokens_per_second else None,
+            "stalls": self.stalls,
+        }
+
+
+class StreamTelemetry:
+    """Per provider/model aggregates, recent streams and live stall detection"""
+
+    SAMPLES = ("queue_wait_ms", "ttft_ms", "provider_ttft_ms", "max_gap_ms", "duration_ms", "tokens_per_second")
+
+    def __init__(self):
+        self._ids = itertools.count(1)
+        self._active: Dict[int, StreamRecord] = {}
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=settings.stream_telemetry_recent)
+        self._models: Dict[str, Dict[str, Any]] = {}
+        self.cancellation = {"client_disconnects": 0, "streams": 0, "partial_tokens": 0, "estimated_tokens_saved": 0}
+
+    def start(self, provider: str, model: str, meeting_id=None, staff_id=None, priority: str = "interactive") -> StreamRecord:
+        record = StreamRecord(next(self._ids), provider, model, meeting_id, staff_id, priority)
+        self._active[record.id] = record
+        return record
+
+    def _bucket(self, key: str) -> Dict[str, Any]:
+        bucket = self._models.get(key)
+        if bucket is None:
+            bucket = self._models[key] = {
+                "counts": {"ok": 0, "error": 0, "cancelled": 0, "cached": 0, "stalled": 0},
+                "tokens": 0,
+                "chars": 0,
+                "ok_tokens": 0,
+                "estimated_tokens_saved": 0,
+                "samples": {name: deque(maxlen=settings.stream_telemetry_window) for name in self.SAMPLES},
+            }
+        return bucket
+
+    def finish(self, record: StreamRecord, status: str, provider: Optional[str] = None, model: Optional[str] = None):
+        """Close a record; provider/model name what actually answered (e.g. after failover)"""
+        self._active.pop(record.id, None)
+        record.provider = provider or record.provider
+        record.model = model or record.model
+        record.finish(status)
+        data = record.to_dict()
+        self._recent.append(data)
+
+        bucket = self._bucket(f"{record.provider}/{record.model}")
+        bucket["counts"][status] = bucket["counts"].get(status, 0) + 1
+        if record.stalls:
+            bucket["counts"]["stalled"] += 1
+            print(f"WARNING: Stream {record.id} ({record.provider}/{record.model}) stalled "
+                  f"{record.stalls}x, longest gap {data['max_gap_ms']} ms")
+        if status == "cached":
+            return  # Replays say nothing about provider performance
+        if status == "ok":
+            bucket["ok_tokens"] += record.tokens or 0
+        elif status == "cancelled":
+            self._record_cancellation(bucket, record)
+        bucket["tokens"] += record.tokens or 0
+        bucket["chars"] += record.chars
+        for name in self.SAMPLES:
+            if data[name] is not None:
+                bucket["samples"][name].append(data[name])
+
+    def _record_cancellation(self, bucket: Dict[str, Any], record: StreamRecord):
+        """Tokens the provider did not have to generate, estimated from this model's average complete answer"""
+        partial = record.tokens or 0
+        completed = bucket["counts"]["ok"]
+        saved = max(0, round(bucket["ok_tokens"] / completed) - partial) if completed else 0
+        bucket["estimated_tokens_saved"] += saved
+        self.cancellation["streams"] += 1
+        self.cancellation["partial_tokens"] += partial
+        self.cancellation["estimated_tokens_saved"] += saved
+
+    def active(self) -> List[Dict[str, Any]]:
+        streams = []
+        for record in self._active.values():
+            data = record.to_dict()
+            data["silent_ms"] = round(record.silent_for() * 1000, 1)
+            data["stalled"] = record.silent_for() >= settings.stream_stall_seconds
+            streams.append(data)
+        return streams
+
+    def recent(self, meeting_id: Optional[int] = None, staff_id: Optional[int] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        matches = [
+            r for r in reversed(self._recent)
+            if (meeting_id is None or r["meeting_id"] == meeting_id) and (staff_id is None or r["staff_id"] == staff_id)
+        ]
+        return matches[:limit]
+
+    def stats(self) -> Dict[str, Any]:
+        models = {}
+        for key, bucket in self._models.items():
+            summary = {
+                **bucket["counts"],
+                "tokens": bucket["tokens"],
+                "chars": bucket["chars"],
+                "estimated_tokens_saved": bucket["estimated_tokens_saved"],
+            }
+            for name, samples in bucket["samples"].items():
+                values = list(samples)
+                summary[name] = {
+                    "p50": _percentile(values, 50),
+                    "p95": _percentile(values, 95),
+                    "avg": round(sum(values) / len(values), 1) if values else None,
+                }
+            models[key] = summary
+        return {
+            "stall_threshold_ms": settings.stream_stall_seconds * 1000,
+            "models": models,
+            "cancellation": dict(self.cancellation),
+            "active": self.active(),
+        }
+
+
+# Singleton instance
+stream_telemetry = StreamTelemetry()
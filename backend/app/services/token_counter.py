@@ -0,0 +1,155 @@
+# backend\app\services\token_counter.py
+import asyncio
+import hashlib
+import math
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Set
+from ..config import settings
+from .image_pipeline import image_pipeline
+
+try:
+    import tiktoken
+except ImportError:  # Fall back to the estimator
+    tiktoken = None
+
+
+class TokenCounter:
+    """Counts prompt tokens per provider/model with tiktoken, falling back to a calibrated estimate"""
+
+    # Closest tiktoken vocabulary per model family (checked in order, first match wins)
+    MODEL_ENCODINGS = [
+        ("gpt-4o", "o200k_base"),
+        ("gpt-4", "cl100k_base"),
+        ("gpt-3.5", "cl100k_base"),
+        ("gemini", "o200k_base"),
+        ("llama3", "cl100k_base"),
+        ("llama-3", "cl100k_base"),
+    ]
+    PROVIDER_ENCODINGS = {"gemini": "o200k_base", "ollama": "cl100k_base"}
+
+    # Average characters per token of plain-text words, used by the estimator
+    CHARS_PER_TOKEN = {"gemini": 4.2, "ollama": 3.8}
+    PIECE_PATTERN = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+    def __init__(self):
+        self._encodings: Dict[str, Any] = {}
+        self._loading: Set[str] = set()
+        self._memo: "OrderedDict[str, int]" = OrderedDict()
+        self.counters = {"hits": 0, "misses": 0}
+
+    def _encoding_name(self, provider: str, model: Optional[str]) -> Optional[str]:
+        model_lower = (model or "").lower()
+        for prefix, encoding in self.MODEL_ENCODINGS:
+            if model_lower.startswith(prefix):
+                return encoding
+        return self.PROVIDER_ENCODINGS.get(provider)
+
+    def _load(self, name: str):
+        # tiktoken downloads vocabularies on first use; remember failures so we only try once
+        try:
+            self._encodings[name] = tiktoken.get_encoding(name)
+        except Exception as e:
+            print(f"WARNING: tiktoken encoding '{name}' unavailable, using estimator: {e}")
+            self._encodings[name] = None
+        finally:
+            self._loading.discard(name)
+
+    def _get_encoding(self, name: Optional[str]):
+        if not name or tiktoken is None or not settings.token_counter_use_tiktoken:
+            return None
+        if name not in self._encodings:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self._load(name)
+            else:
+                # Never load on the event loop: estimate until a worker thread has it
+                if name not in self._loading:
+                    self._loading.add(name)
+                    loop.run_in_executor(None, self._load, name)
+                return None
+        return self._encodings[name]
+
+    def warm(self):
+        """Load every known encoding (blocking; the app lifespan runs it in a thread)"""
+        if tiktoken is None or not settings.token_counter_use_tiktoken:
+            return
+        names = {encoding for _, encoding in self.MODEL_ENCODINGS} | set(self.PROVIDER_ENCODINGS.values())
+        pending = sorted(names - set(self._encodings) - self._loading)
+        self._loading.update(pending)
+        for name in pending:
+            self._load(name)
+
+    def tokenizer_name(self, provider: str, model: Optional[str] = None) -> str:
+        name = self._encoding_name(provider, model)
+        if self._get_encoding(name) is not None:
+            return f"tiktoken:{name}"
+        return f"estimate:{provider}"
+
+    def estimate(self, text: str, provider: str = "gemini") -> int:
+        """Calibrated estimate: words split by length, punctuation and non-ASCII characters count separately"""
+        chars_per_token = self.CHARS_PER_TOKEN.get(provider, 4.0)
+        count = 0
+        for piece in self.PIECE_PATTERN.findall(text):
+            if piece.isascii():
+                count += max(1, math.ceil(len(piece) / chars_per_token))
+            else:
+                count += len(piece)
+        return count
+
+    def count(self, text: str, provider: str = "gemini", model: Optional[str] = None) -> int:
+        """Token count for text, memoized by content hash and tokenizer"""
+        if not text:
+            return 0
+        tokenizer = self.tokenizer_name(provider, model)
+        key = f"{tokenizer}:{hashlib.sha1(text.encode('utf-8')).hexdigest()}"
+        cached = self._memo.get(key)
+        if cached is not None:
+            self._memo.move_to_end(key)
+            self.counters["hits"] += 1
+            return cached
+
+        encoding = self._get_encoding(self._encoding_name(provider, model))
+        if encoding is not None:
+            tokens = len(encoding.encode(text, disallowed_special=()))
+        else:
+            tokens = self.estimate(text, provider)
+
+        self.counters["misses"] += 1
+        self._memo[key] = tokens
+        while len(self._memo) > settings.token_counter_cache_size:
+            self._memo.popitem(last=False)
+        return tokens
+
+    def count_image(self, path: str, provider: str = "gemini") -> int:
+        """Token cost of an image as billed by the provider, at the size image_pipeline sends"""
+        if provider != "gemini":
+            return settings.image_tokens_ollama
+        size = image_pipeline.sent_size(path, provider)
+        if size is None:
+            return 258
+        width, height = size
+        # Gemini: small images cost a flat 258 tokens, larger ones are tiled into 768x768 crops
+        if width <= 384 and height <= 384:
+            return 258
+        return math.ceil(width / 768) * math.ceil(height / 768) * 258
+
+    def annotate_blocks(
+        self, blocks: List[Dict[str, Any]], provider: str, model: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Add a "tokens" count to every prompt block (in place) and return the blocks"""
+        for block in blocks:
+            block["tokens"] = self.count(block["content"], provider, model)
+        return blocks
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "memo_entries": len(self._memo),
+            "encodings": {name: enc is not None for name, enc in self._encodings.items()},
+        }
+
+
+# Singleton instance
+token_counter = TokenCounter()
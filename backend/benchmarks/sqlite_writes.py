@@ -0,0 +1,127 @@
+# backend/benchmarks/sqlite_writes.py
+"""
+Write throughput of the SQLite profiles under concurrent streaming-style commits.
+
+Each writer saves messages one commit at a time with its own session (like
+save_staff_message) while a reader keeps loading the meeting's history. Runs against a
+throwaway database file:
+
+    python backend/benchmarks/sqlite_writes.py --writers 8 --messages 200
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.database import Base, make_engine  # noqa: E402
+from app.models import Company, Meeting, MeetingMessage  # noqa: E402
+from app.services.db_writer import DbWriter  # noqa: E402
+
+
+def setup(tuned: bool):
+    handle, path = tempfile.mkstemp(suffix=".db")
+    os.close(handle)
+    engine = make_engine(f"sqlite:///{path}", tuned=tuned)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        company = Company(name="Bench")
+        db.add(company)
+        db.flush()
+        meeting = Meeting(company_id=company.id, title="Bench")
+        db.add(meeting)
+        db.commit()
+        meeting_id = meeting.id
+    return engine, Session, meeting_id, path
+
+
+def save(Session, meeting_id: int, n: int, errors: list):
+    try:
+        with Session() as db:
+            db.add(MeetingMessage(
+                meeting_id=meeting_id, sender_type="staff", sender_name="Bench", content="x" * 400 + str(n),
+            ))
+            db.commit()
+    except OperationalError as e:  # "database is locked"
+        errors.append(str(e))
+
+
+def reader(Session, meeting_id: int, stop: threading.Event):
+    while not stop.is_set():
+        with Session() as db:
+            db.query(MeetingMessage).filter(MeetingMessage.meeting_id == meeting_id).order_by(
+                MeetingMessage.id.desc()
+            ).limit(50).all()
+
+
+def run_threads(Session, meeting_id: int, writers: int, messages: int, errors: list):
+    threads = [
+        threading.Thread(target=lambda: [save(Session, meeting_id, i, errors) for i in range(messages)])
+        for _ in range(writers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+async def run_single_writer(Session, meeting_id: int, writers: int, messages: int, errors: list):
+    writer = DbWriter()
+
+    async def stream():
+        for i in range(messages):
+            await asyncio.sleep(0)  # A token arrives, then the turn saves
+            await writer.run(save, Session, meeting_id, i, errors)
+
+    await asyncio.gather(*(stream() for _ in range(writers)))
+    writer.shutdown()
+
+
+def scenario(name: str, tuned: bool, single_writer: bool, writers: int, messages: int):
+    engine, Session, meeting_id, path = setup(tuned)
+    errors: list = []
+    stop = threading.Event()
+    read_thread = threading.Thread(target=reader, args=(Session, meeting_id, stop))
+    read_thread.start()
+    started = time.perf_counter()
+    try:
+        if single_writer:
+            settings.db_single_writer = True
+            asyncio.run(run_single_writer(Session, meeting_id, writers, messages, errors))
+        else:
+            run_threads(Session, meeting_id, writers, messages, errors)
+    finally:
+        elapsed = time.perf_counter() - started
+        stop.set()
+        read_thread.join()
+        engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    written = writers * messages - len(errors)
+    print(f"{name:<28} {written / elapsed:>9.1f} commits/s  {elapsed:>7.2f}s  locked errors: {len(errors)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--messages", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{args.writers} writers x {args.messages} commits, one concurrent reader")
+    scenario("default (rollback journal)", tuned=False, single_writer=False, writers=args.writers, messages=args.messages)
+    scenario("tuned (WAL, NORMAL)", tuned=True, single_writer=False, writers=args.writers, messages=args.messages)
+    scenario("tuned + single writer", tuned=True, single_writer=True, writers=args.writers, messages=args.messages)
+
+
+if __name__ == "__main__":
+    main()
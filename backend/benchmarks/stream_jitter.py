@@ -0,0 +1,132 @@
+# backend/benchmarks/stream_jitter.py
+"""
+Event-loop jitter seen by token streams while DB-heavy requests run.
+
+A ticker stands in for a token stream: it wakes every --tick-ms and records how late
+it was. Meanwhile --requests concurrent "turns" load meeting history, knowledge and
+mentions, once with the sync Session called from the coroutine (the old route code) and
+once through the async session. Runs against a throwaway database file:
+
+    python backend/benchmarks/stream_jitter.py --messages 20000 --requests 200
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from sqlalchemy.ext.asyncio import async_sessionmaker  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.database import Base, make_async_engine, make_engine  # noqa: E402
+from app.models import Company, Knowledge, Meeting, MeetingMessage  # noqa: E402
+from app.services.memory_service import memory_service  # noqa: E402
+from app.services.mention_parser import mention_parser  # noqa: E402
+
+TEXT = "What did we decide about @logo and @img1 for the launch?"
+
+
+def seed(url: str, messages: int):
+    engine = make_engine(url)
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        company = Company(name="Bench")
+        db.add(company)
+        db.flush()
+        meeting = Meeting(company_id=company.id, title="Bench")
+        db.add(meeting)
+        db.flush()
+        db.add_all(Knowledge(company_id=company.id, title=f"K{i}", content="fact " * 100) for i in range(50))
+        db.add_all(
+            MeetingMessage(meeting_id=meeting.id, sender_type="staff", sender_name="Bench", content="x" * 600)
+            for _ in range(messages)
+        )
+        db.commit()
+        ids = company.id, meeting.id
+    engine.dispose()
+    return ids
+
+
+async def ticker(tick: float, stop: asyncio.Event, lateness: list):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(tick)
+        lateness.append((time.perf_counter() - started - tick) * 1000)
+
+
+async def measure(name: str, turn, requests: int, concurrency: int, tick: float):
+    stop = asyncio.Event()
+    lateness: list = []
+    ticking = asyncio.create_task(ticker(tick, stop, lateness))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited():
+        async with semaphore:
+            await turn()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(limited() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticking
+    lateness.sort()
+    p99 = lateness[int(len(lateness) * 0.99) - 1] if lateness else 0.0
+    print(
+        f"{name:<14} {requests / elapsed:>7.1f} turns/s   tick lateness p50 {statistics.median(lateness):6.2f} ms"
+        f"  p99 {p99:7.2f} ms  max {lateness[-1]:7.2f} ms"
+    )
+
+
+async def main_async(args):
+    handle, path = tempfile.mkstemp(suffix=".db")
+    os.close(handle)
+    url = f"sqlite:///{path}"
+    company_id, meeting_id = seed(url, args.messages)
+    engine = make_engine(url)
+    async_engine = make_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://"))
+    SyncSession = sessionmaker(bind=engine)
+    AsyncSession = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def sync_turn():
+        with SyncSession() as db:  # Blocks the loop for every query
+            memory_service.get_meeting_history(db, meeting_id)
+            memory_service.get_company_knowledge_context(db, company_id)
+            mention_parser.resolve_all_mentions(TEXT, meeting_id, company_id, db)
+        await asyncio.sleep(0)
+
+    async def async_turn():
+        async with AsyncSession() as db:
+            await memory_service.aget_meeting_history(db, meeting_id)
+            await memory_service.aget_company_knowledge_context(db, company_id)
+            await mention_parser.aresolve_all_mentions(TEXT, meeting_id, company_id, db)
+
+    settings.meeting_context_cache_enabled = False  # Every turn reads history from the database
+    tick = args.tick_ms / 1000
+    print(f"{args.messages} messages, {args.requests} turns ({args.concurrency} at a time), {args.tick_ms} ms ticks")
+    await measure("idle", lambda: asyncio.sleep(0), args.requests, args.concurrency, tick)
+    await measure("sync Session", sync_turn, args.requests, args.concurrency, tick)
+    await measure("AsyncSession", async_turn, args.requests, args.concurrency, tick)
+
+    await async_engine.dispose()
+    engine.dispose()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--tick-ms", type=float, default=5.0)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -109,6 +109,9 @@ export default function CreateMeetingModal({
                           >
                             <option value="gemini">Gemini</option>
                             <option value="ollama">Ollama</option>
+                            {providers?.providers?.includes("mock") && (
+                              <option value="mock">Mock (offline)</option>
+                            )}
                           </select>
                         </div>
 
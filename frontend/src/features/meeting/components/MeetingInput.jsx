@@ -131,7 +131,7 @@ export default function MeetingInput({
   };
 
   const handlePreviewSend = async ({ systemPrompt, userContent }) => {
-    await handleSendPreviewedMessage(systemPrompt, userContent);
+    await handleSendPreviewedMessage(systemPrompt, userContent, previewData?.prompt_handle);
   };
 
   return (
@@ -116,9 +116,19 @@ export default function PromptPreviewModal({
     setSystemPrompt(enabledParts.join("\n"));
   };
 
-  const systemTokens = estimateTokenCount(systemPrompt);
-  const userTokens = estimateTokenCount(userContent);
-  const imageTokens = estimateTokenCount("", imageUrls);
+  // Prefer the backend's tokenizer counts; fall back to estimates once the text is edited
+  const serverCounts = previewData?.token_counts;
+  const systemTokens =
+    serverCounts && systemPrompt === previewData.system_prompt
+      ? serverCounts.system_prompt
+      : estimateTokenCount(systemPrompt);
+  const userTokens =
+    serverCounts && userContent === previewData.user_content
+      ? serverCounts.user_content
+      : estimateTokenCount(userContent);
+  const imageTokens = serverCounts
+    ? serverCounts.images
+    : estimateTokenCount("", imageUrls);
   const totalTokens = systemTokens + userTokens + imageTokens;
   const isOverLimit = totalTokens > maxTokens;
 
@@ -271,7 +281,7 @@ export default function PromptPreviewModal({
                       {block.label}
                     </div>
                     <div className="text-[10px] uppercase font-mono mt-0.5">
-                      {estimateTokenCount(block.content)} tokens
+                      {block.tokens ?? estimateTokenCount(block.content)} tokens
                     </div>
                   </div>
                 </button>
@@ -56,10 +56,10 @@ export function useMeetingChat(
     }
   };
 
-  const handleSendPreviewedMessage = async (sysPromptOverride, userContentOverride) => {
+  const handleSendPreviewedMessage = async (sysPromptOverride, userContentOverride, promptHandle = null) => {
     if (!userContentOverride.trim() || !selectedStaffId) return;
     setInputMessage("");
-    await streamMessage(userContentOverride, selectedStaffId, sysPromptOverride, userContentOverride);
+    await streamMessage(userContentOverride, selectedStaffId, sysPromptOverride, userContentOverride, promptHandle);
   };
 
   const handleStopGeneration = () => {
@@ -2,13 +2,16 @@ import { useState, useRef } from "react";
 import { useMeetingStore } from "../../../stores/meetingStore";
 import { useStaffStore } from "../../../stores/staffStore";
 
+// Queue position markers sent while the backend waits for an LLM slot (queue_hints=true)
+const QUEUE_HINT = /\x1eQUEUE:(\d+)\x1e/g;
+
 export function useStreamingChat(meetingId, setImagesRefreshTrigger) {
     const { addMessage, updateMessage, selectMeeting } = useMeetingStore();
     const { staff } = useStaffStore();
     const [isStreaming, setIsStreaming] = useState(false);
     const abortControllerRef = useRef(null);
 
-    const streamMessage = async (inputMessage, selectedStaffId, systemPromptOverride = null, userContentOverride = null) => {
+    const streamMessage = async (inputMessage, selectedStaffId, systemPromptOverride = null, userContentOverride = null, promptHandle = null) => {
         if (!inputMessage.trim() || !selectedStaffId) return;
 
         const userMessage = {
@@ -43,9 +46,10 @@ export function useStreamingChat(meetingId, setImagesRefreshTrigger) {
             const bodyPayload = { content: inputMessage, sender_name: "User" };
             if (systemPromptOverride) bodyPayload.custom_system_prompt = systemPromptOverride;
             if (userContentOverride) bodyPayload.custom_user_content = userContentOverride;
+            if (promptHandle) bodyPayload.prompt_handle = promptHandle; // Reuse the previewed prompt
 
             const response = await fetch(
-                `/api/meetings/${meetingId}/messages?staff_id=${selectedStaffId}`,
+                `/api/meetings/${meetingId}/messages?staff_id=${selectedStaffId}&queue_hints=true`,
                 {
                     method: "POST",
                     headers: { "Content-Type": "application/json" },
@@ -69,10 +73,27 @@ export function useStreamingChat(meetingId, setImagesRefreshTrigger) {
                 created_at: new Date().toISOString(),
             };
 
+            let carry = ""; // Start of a queue marker split across reads
+
             while (true) {
                 const { done, value } = await reader.read();
-                if (done) break;
-                const chunk = decoder.decode(value);
+                const raw = carry + (done ? decoder.decode() : decoder.decode(value, { stream: true }));
+                const hints = [...raw.matchAll(QUEUE_HINT)];
+                let chunk = raw.replace(QUEUE_HINT, "");
+                const partial = done ? -1 : chunk.lastIndexOf("\x1e");
+                carry = partial === -1 ? "" : chunk.slice(partial);
+                if (partial !== -1) chunk = chunk.slice(0, partial);
+                if (!chunk) {
+                    if (hints.length > 0 && isFirstChunk) {
+                        const position = hints[hints.length - 1][1];
+                        updateMessage({
+                            ...thinkingMessage,
+                            content: `_Waiting for the model (position ${position} in queue)..._`,
+                        });
+                    }
+                    if (done) break;
+                    continue;
+                }
                 streamedContent += chunk;
                 staffMessage.content = streamedContent;
 
@@ -86,6 +107,7 @@ export function useStreamingChat(meetingId, setImagesRefreshTrigger) {
                 } else {
                     updateMessage({ ...staffMessage, id: thinkingMessageId });
                 }
+                if (done) break;
             }
             setIsStreaming(false);
             if (setImagesRefreshTrigger) setImagesRefreshTrigger(Date.now());
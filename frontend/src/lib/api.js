@@ -53,7 +53,7 @@ export const meetingsApi = {
   create: (companyId, data) =>
     api.post(`/meetings/companies/${companyId}/meetings`, data),
   delete: (id) => api.delete(`/meetings/${id}`),
-  getMessages: (id) => api.get(`/meetings/${id}/messages`),
+  getMessages: (id, params) => api.get(`/meetings/${id}/messages`, { params }),
   sendMessage: (meetingId, staffId, data) =>
     api.post(`/meetings/${meetingId}/messages?staff_id=${staffId}`, data),
   updateMessage: (messageId, data) =>
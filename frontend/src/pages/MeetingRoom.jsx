@@ -244,6 +244,9 @@ export default function MeetingRoom() {
               >
                 <option value="gemini">Gemini</option>
                 <option value="ollama">Ollama</option>
+                {providers?.providers?.includes("mock") && (
+                  <option value="mock">Mock (offline)</option>
+                )}
               </select>
             </div>
 
@@ -0,0 +1,38 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+# Import the real application once, from a scratch directory so the uploads
+# folder and SQLite file it creates don't land in the repo.
+_cwd = os.getcwd()
+os.chdir(tempfile.mkdtemp(prefix="myvco-tests-"))
+try:
+    import app.main  # noqa: F401
+finally:
+    os.chdir(_cwd)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_make_collect_report(collector):
+    """Undo sys.modules stubs installed at import time by standalone test modules"""
+    saved = dict(sys.modules)
+    yield
+    if isinstance(collector, pytest.Module):
+        for name, module in saved.items():
+            if sys.modules.get(name) is not module:
+                sys.modules[name] = module
+
+
+@pytest.fixture(autouse=True)
+def fresh_meeting_context_cache():
+    """Meeting ids repeat across the tests' scratch databases; cached history must not leak between them"""
+    from app.services.meeting_context import meeting_context_cache
+
+    meeting_context_cache.clear()
+    yield
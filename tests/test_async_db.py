@@ -0,0 +1,96 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.database import Base, async_url, make_async_engine, make_engine
+from app.models import Company, CompanyAsset, Knowledge, Meeting, MeetingImage, MeetingMessage
+from app.services.memory_service import memory_service
+from app.services.mention_parser import mention_parser
+
+
+class TestAsyncUrl(unittest.TestCase):
+    def test_maps_sync_drivers_to_async_ones(self):
+        self.assertEqual(async_url("sqlite:///./app.db"), "sqlite+aiosqlite:///./app.db")
+        self.assertEqual(async_url("postgresql://u:p@h/db"), "postgresql+asyncpg://u:p@h/db")
+        self.assertEqual(async_url("postgresql+psycopg2://u:p@h/db"), "postgresql+asyncpg://u:p@h/db")
+
+
+class TestAsyncQueries(unittest.TestCase):
+    def setUp(self):
+        handle, path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        self.addCleanup(lambda: [os.remove(path + s) for s in ("", "-wal", "-shm") if os.path.exists(path + s)])
+        engine = make_engine(f"sqlite:///{path}")
+        self.addCleanup(engine.dispose)
+        Base.metadata.create_all(engine)
+        self.Session = sessionmaker(bind=engine)
+        self.async_url = f"sqlite+aiosqlite:///{path}"
+        patcher = patch.object(settings, "meeting_context_cache_enabled", False)  # Compare the database reads
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        with self.Session() as db:
+            company = Company(name="Acme")
+            db.add(company)
+            db.flush()
+            meeting = Meeting(company_id=company.id, title="Sync")
+            db.add(meeting)
+            db.flush()
+            db.add_all(
+                MeetingMessage(meeting_id=meeting.id, sender_type="user", sender_name=f"U{i}", content=f"m{i}")
+                for i in range(5)
+            )
+            db.add_all(Knowledge(company_id=company.id, title=f"K{i}", content=f"fact {i}") for i in range(3))
+            db.add(MeetingImage(meeting_id=meeting.id, image_path="uploads/one.png", display_order=1))
+            db.add(CompanyAsset(company_id=company.id, asset_name="logo", display_name="Logo", file_path="/assets/logo.png"))
+            db.commit()
+            self.company_id, self.meeting_id = company.id, meeting.id
+
+    def run_async(self, fn):
+        async def run():
+            async_engine = make_async_engine(self.async_url)
+            try:
+                async with async_sessionmaker(async_engine, expire_on_commit=False)() as db:
+                    return await fn(db)
+            finally:
+                await async_engine.dispose()
+
+        return asyncio.run(run())
+
+    def test_history_and_knowledge_match_the_sync_path(self):
+        with self.Session() as db:
+            history = memory_service.get_meeting_history(db, self.meeting_id, limit=3)
+            knowledge = memory_service.get_company_knowledge_context(db, self.company_id)
+
+        async def load(db):
+            return (
+                await memory_service.aget_meeting_history(db, self.meeting_id, limit=3),
+                await memory_service.aget_company_knowledge_context(db, self.company_id),
+            )
+
+        self.assertEqual(self.run_async(load), (history, knowledge))
+        self.assertEqual(history, ["U2: m2", "U3: m3", "U4: m4"])
+
+    def test_mentions_resolve_like_the_sync_path(self):
+        text = "Compare @img1 with @logo, @img7 and @missing"
+        with patch("app.services.mention_parser.os.path.exists", return_value=True):
+            with self.Session() as db:
+                expected = mention_parser.resolve_all_mentions(text, self.meeting_id, self.company_id, db)
+            resolved = self.run_async(
+                lambda db: mention_parser.aresolve_all_mentions(text, self.meeting_id, self.company_id, db)
+            )
+
+        self.assertEqual(resolved, expected)
+        paths, missing = resolved
+        self.assertEqual([os.path.basename(p) for p in paths], ["one.png", "logo.png"])
+        self.assertEqual(missing, ["@img7", "@missing"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from unittest.mock import patch
+
+from app.config import settings
+from app.services.context_packer import ContextPacker, TRUNCATION_MARKER
+from app.services.llm_service import LLMService
+
+
+def block(block_id, content, enabled=True):
+    return {"id": block_id, "label": block_id, "content": content, "enabled": enabled}
+
+
+class TestContextPacker(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(settings, "token_counter_use_tiktoken", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.packer = ContextPacker()
+
+    def test_everything_fits(self):
+        blocks = [block("personality", "You are Ann."), block("expertise", "Your Expertise: python")]
+        report = self.packer.pack(blocks, 1000)
+        self.assertEqual(report["dropped"], [])
+        self.assertEqual(report["truncated"], [])
+        self.assertEqual([b["packing"]["status"] for b in blocks], ["kept", "kept"])
+
+    def test_lowest_priority_block_is_truncated_then_dropped(self):
+        big = "word " * 400
+        blocks = [block("knowledge_base", big), block("personality", "You are Ann.")]
+        with patch.object(settings, "context_block_priority", "personality,knowledge_base"):
+            report = self.packer.pack(blocks, 100)
+            self.assertEqual(report["truncated"], ["knowledge_base"])
+            self.assertTrue(blocks[0]["content"].endswith(TRUNCATION_MARKER))
+            self.assertLessEqual(report["used"], 100)
+
+            blocks = [block("knowledge_base", big), block("personality", "You are Ann.")]
+            report = self.packer.pack(blocks, 20)
+            self.assertEqual(report["dropped"], ["knowledge_base"])
+            self.assertFalse(blocks[0]["enabled"])
+
+    def test_meeting_history_keeps_newest_messages(self):
+        service = LLMService()
+        history = [f"User: message number {i} " + "filler " * 20 for i in range(30)]
+        blocks = service.build_structured_prompt_blocks(
+            staff_name="Ann", role="Eng", personality="", expertise=[], company_context="",
+            meeting_context=None, meeting_history=history,
+        )
+        with patch.object(settings, "context_block_priority", "meeting_context"):
+            report = service.pack_prompt_blocks(blocks, 300, "gemini")
+        meeting = next(b for b in blocks if b["id"] == "meeting_context")
+        self.assertIn("meeting_context", report["truncated"])
+        self.assertIn("message number 29", meeting["content"])
+        self.assertNotIn("message number 0 ", meeting["content"])
+        self.assertGreater(meeting["packing"]["messages_dropped"], 0)
+        self.assertNotIn("segments", meeting)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.database import Base, make_engine
+from app.models import Company, Department, Meeting, MeetingImage, MeetingMessage, MeetingParticipant, Staff
+from app.routers.companies import delete_company
+from app.services.db_writer import DbWriter
+
+
+class TestDbWriter(unittest.TestCase):
+    def test_single_writer_runs_writes_one_at_a_time_off_the_loop(self):
+        patcher = patch.object(settings, "db_single_writer", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        writer = DbWriter()
+        self.addCleanup(writer.shutdown)
+        active, overlaps, threads = [0], [], set()
+
+        def write(n):
+            active[0] += 1
+            overlaps.append(active[0])
+            threads.add(threading.get_ident())
+            threading.Event().wait(0.005)
+            active[0] -= 1
+            return n
+
+        async def run():
+            return await asyncio.gather(*(writer.run(write, n) for n in range(5)))
+
+        self.assertEqual(asyncio.run(run()), [0, 1, 2, 3, 4])
+        self.assertEqual(max(overlaps), 1)
+        self.assertEqual(len(threads), 1)
+        self.assertNotIn(threading.get_ident(), threads)
+        self.assertEqual(writer.stats()["writes"], 5)
+
+    def test_errors_propagate_to_the_caller(self):
+        writer = DbWriter()
+        self.addCleanup(writer.shutdown)
+
+        def fail():
+            raise sqlite3.OperationalError("database is locked")
+
+        with self.assertRaises(sqlite3.OperationalError):
+            asyncio.run(writer.run(fail))
+
+
+class TestSqliteProfile(unittest.TestCase):
+    def test_tuned_engine_applies_pragmas(self):
+        handle, path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        engine = make_engine(f"sqlite:///{path}")
+        self.addCleanup(lambda: [os.remove(path + s) for s in ("", "-wal", "-shm") if os.path.exists(path + s)])
+        self.addCleanup(engine.dispose)
+        with engine.connect() as conn:
+            pragma = lambda name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+            self.assertEqual(pragma("journal_mode"), "wal")
+            self.assertEqual(pragma("synchronous"), 1)  # NORMAL
+            self.assertEqual(pragma("busy_timeout"), settings.sqlite_busy_timeout_ms)
+            self.assertEqual(pragma("foreign_keys"), 1)
+
+    def test_company_delete_leaves_no_orphans_under_the_tuned_profile(self):
+        handle, path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        engine = make_engine(f"sqlite:///{path}")
+        self.addCleanup(lambda: [os.remove(path + s) for s in ("", "-wal", "-shm") if os.path.exists(path + s)])
+        self.addCleanup(engine.dispose)
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+
+        with Session() as db:
+            acme, other = Company(name="Acme"), Company(name="Other")
+            department = Department(company=acme, name="Eng")
+            ada = Staff(name="Ada", role="CTO", department=department, companies=[acme, other])
+            bob = Staff(name="Bob", role="Dev", department=department, companies=[acme])
+            own, elsewhere = Meeting(company=acme, title="Own"), Meeting(company=other, title="Elsewhere")
+            db.add_all([acme, other, department, ada, bob, own, elsewhere])
+            db.flush()
+            # Both spoke in the other company's meeting; Bob was a participant there too
+            db.add_all([
+                MeetingMessage(meeting_id=elsewhere.id, staff_id=ada.id, sender_type="staff", sender_name="Ada", content="hi"),
+                MeetingMessage(meeting_id=elsewhere.id, staff_id=bob.id, sender_type="staff", sender_name="Bob", content="yo"),
+                MeetingParticipant(meeting_id=elsewhere.id, staff_id=bob.id, llm_provider="mock", llm_model="mock"),
+            ])
+            message = MeetingMessage(meeting_id=own.id, staff_id=bob.id, sender_type="staff", sender_name="Bob", content="x")
+            db.add(message)
+            db.flush()
+            db.add(MeetingImage(meeting_id=own.id, message_id=message.id, image_path="uploads/a.png", display_order=1))
+            db.commit()
+            acme_id, ada_id, bob_id = acme.id, ada.id, bob.id
+
+        with Session() as db:
+            self.assertEqual(delete_company(acme_id, db), {"message": "Company deleted successfully"})
+        with engine.connect() as conn:
+            self.assertEqual(conn.exec_driver_sql("PRAGMA foreign_key_check").all(), [])
+        with Session() as db:
+            self.assertIsNone(db.get(Company, acme_id))
+            self.assertIsNone(db.get(Staff, bob_id))
+            ada = db.get(Staff, ada_id)
+            self.assertIsNone(ada.department_id)
+            self.assertEqual([c.name for c in ada.companies], ["Other"])
+            authors = {m.sender_name: m.staff_id for m in db.query(MeetingMessage)}
+            self.assertEqual(authors, {"Ada": ada_id, "Bob": None})
+            self.assertEqual(db.query(MeetingParticipant).count(), 0)
+            self.assertEqual(db.query(MeetingImage).count(), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+
+from app.config import settings
+from app.services.generation_jobs import GenerationJobManager, JobBufferExpired
+
+
+async def source(texts, delay=0.0, fail=None):
+    yield {"type": "start", "staff_id": 1, "name": "Ada"}
+    for text in texts:
+        await asyncio.sleep(delay)
+        yield {"type": "chunk", "staff_id": 1, "content": text}
+    if fail:
+        raise RuntimeError(fail)
+    yield {"type": "done", "staff_id": 1, "message_id": 42}
+
+
+async def collect(job, after=0):
+    return [event async for event in job.events(after)]
+
+
+class TestGenerationJobs(unittest.TestCase):
+    def setUp(self):
+        self.manager = GenerationJobManager()
+
+    def test_events_are_numbered_with_char_offsets(self):
+        async def run():
+            job = self.manager.create(source(["Hel", "lo"]), "message", 7, [1])
+            return job, await collect(job)
+
+        job, events = asyncio.run(run())
+        self.assertEqual([e["seq"] for e in events], [1, 2, 3, 4])
+        self.assertEqual([(e["offset"], e["content"]) for e in events if e["type"] == "chunk"], [(0, "Hel"), (3, "lo")])
+        self.assertEqual(job.status, "completed")
+        self.assertEqual(job.message_ids, {1: 42})
+
+    def test_reattach_after_seq_and_follow_live(self):
+        async def run():
+            job = self.manager.create(source(["a", "b", "c"], delay=0.01), "message", 7, [1])
+            first = []
+            async for event in job.events():
+                first.append(event)
+                if len(first) == 2:
+                    break  # Connection dropped
+            rest = await collect(job, after=first[-1]["seq"])
+            return first, rest
+
+        first, rest = asyncio.run(run())
+        self.assertEqual([e["seq"] for e in first + rest], [1, 2, 3, 4, 5])
+
+    def test_bounded_buffer_reports_expired_offsets(self):
+        patcher = patch.object(settings, "generation_job_buffer_events", 3)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        async def run():
+            job = self.manager.create(source(["a", "b", "c", "d"]), "message", 7, [1])
+            await job.task
+            return job, await collect(job, after=3)
+
+        job, events = asyncio.run(run())
+        self.assertEqual(job.first_seq, 4)
+        self.assertEqual([e["seq"] for e in events], [4, 5, 6])
+        with self.assertRaises(JobBufferExpired):
+            asyncio.run(collect(job, after=0))
+
+    def test_cancel_and_failure_end_subscriptions(self):
+        async def run():
+            slow = self.manager.create(source(["a"] * 50, delay=0.01), "ask_all", 7, [1])
+            await asyncio.sleep(0.03)
+            self.assertTrue(self.manager.cancel(slow))
+            cancelled = await collect(slow)
+            failing = self.manager.create(source(["a"], fail="boom"), "message", 7, [1])
+            failed = await collect(failing)
+            return slow, cancelled, failing, failed
+
+        slow, cancelled, failing, failed = asyncio.run(run())
+        self.assertEqual(slow.status, "cancelled")
+        self.assertEqual(cancelled[-1]["type"], "cancelled")
+        self.assertEqual(failing.status, "failed")
+        self.assertEqual(failed[-1]["type"], "error")
+        self.assertEqual(self.manager.stats()["cancelled"], 1)
+
+    def test_finished_jobs_expire_after_ttl(self):
+        async def run():
+            job = self.manager.create(source(["a"]), "message", 7, [1])
+            await job.task
+            return job
+
+        job = asyncio.run(run())
+        self.assertIs(self.manager.get(job.id), job)
+        job.finished_at = time.time() - settings.generation_job_ttl - 1
+        self.assertIsNone(self.manager.get(job.id))
+        self.assertEqual(self.manager.stats()["expired"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
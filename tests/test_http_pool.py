@@ -0,0 +1,81 @@
+import asyncio
+import unittest
+
+from app.services.http_pool import HttpClientPool
+
+
+class TestHttpClientPool(unittest.TestCase):
+    def test_client_is_reused_per_base_url(self):
+        async def run():
+            pool = HttpClientPool()
+            first = pool.get_client("http://ollama.local/")
+            second = pool.get_client("http://ollama.local")
+            other = pool.get_client("http://other.local")
+            await pool.aclose()
+            return first, second, other
+
+        first, second, other = asyncio.run(run())
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertTrue(first.is_closed)
+
+    def test_rebuild_closes_stale_clients(self):
+        async def run():
+            pool = HttpClientPool()
+            pool.RETIRE_POLL_SECONDS = 0.01
+            old = pool.get_client("http://old.local")
+            await pool.rebuild("http://new.local/")
+            stats = pool.stats()
+            await asyncio.sleep(0.05)
+            closed_before_shutdown = old.is_closed
+            await pool.aclose()
+            return closed_before_shutdown, stats
+
+        closed_before_shutdown, stats = asyncio.run(run())
+        self.assertTrue(closed_before_shutdown)
+        self.assertEqual(list(stats), ["http://new.local"])
+        self.assertEqual(stats["http://new.local"]["open_connections"], 0)
+
+    def test_rebuild_lets_in_flight_streams_finish(self):
+        async def run():
+            release = asyncio.Event()
+
+            async def handle(reader, writer):
+                await reader.readuntil(b"\r\n\r\n")
+                writer.write(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n3\r\none\r\n")
+                await writer.drain()
+                await release.wait()
+                writer.write(b"3\r\ntwo\r\n0\r\n\r\n")
+                await writer.drain()
+                writer.close()
+
+            server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            pool = HttpClientPool()
+            pool.RETIRE_POLL_SECONDS = 0.01
+            old = pool.get_client(f"http://127.0.0.1:{port}")
+            chunks = []
+            async with old.stream("GET", "/api/generate") as response:
+                stream = response.aiter_text()
+                chunks.append(await stream.__anext__())
+                await pool.rebuild("http://new.local")
+                await asyncio.sleep(0.05)
+                open_mid_stream = not old.is_closed
+                release.set()
+                async for chunk in stream:
+                    chunks.append(chunk)
+            await asyncio.sleep(0.05)
+            closed_after = old.is_closed
+            await pool.aclose()
+            server.close()
+            await server.wait_closed()
+            return open_mid_stream, "".join(chunks), closed_after
+
+        open_mid_stream, body, closed_after = asyncio.run(run())
+        self.assertTrue(open_mid_stream)
+        self.assertEqual(body, "onetwo")
+        self.assertTrue(closed_after)
+
+
+if __name__ == '__main__':
+    unittest.main()
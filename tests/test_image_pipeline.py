@@ -0,0 +1,80 @@
+import asyncio
+import base64
+import io
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import PIL.Image
+
+from app.config import settings
+from app.services.image_pipeline import ImagePipeline
+
+
+class TestImagePipeline(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.pipeline = ImagePipeline()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def make_image(self, name, size, mode="RGB"):
+        path = os.path.join(self.tmpdir.name, name)
+        PIL.Image.new(mode, size, color=(200, 30, 30, 128)[:len(mode)]).save(path)
+        return path
+
+    def test_downscales_and_caches_base64(self):
+        path = self.make_image("big.png", (3000, 1500))
+        max_dim = self.pipeline.max_dim_for("ollama")
+
+        encoded, errors = asyncio.run(self.pipeline.load_for_ollama([path]))
+        self.assertEqual(errors, [])
+        decoded = PIL.Image.open(io.BytesIO(base64.b64decode(encoded[0])))
+        self.assertEqual(max(decoded.size), max_dim)
+        self.assertEqual(decoded.format, "JPEG")
+
+        again, _ = asyncio.run(self.pipeline.load_for_ollama([path]))
+        self.assertIs(again[0], encoded[0])
+        self.assertEqual(self.pipeline.counters["hits"], 1)
+        self.assertEqual(self.pipeline.counters["misses"], 1)
+
+    def test_sent_size_matches_the_processed_image(self):
+        path = self.make_image("odd.png", (3001, 1999))
+        predicted = self.pipeline.sent_size(path, "gemini")  # From the header only
+        images, _ = asyncio.run(self.pipeline.load([path], "gemini", "pil"))
+        self.assertEqual(predicted, images[0].size)
+        self.assertEqual(self.pipeline.sent_size(path, "gemini"), images[0].size)
+        self.assertIsNone(self.pipeline.sent_size("/nope/missing.png", "gemini"))
+
+    def test_alpha_is_kept_as_png(self):
+        path = self.make_image("logo.png", (3000, 3000), mode="RGBA")
+        images, _ = asyncio.run(self.pipeline.load([path], "gemini", "pil"))
+        self.assertEqual(images[0].mime_type, "image/png")
+        self.assertEqual(images[0].pil_image.mode, "RGBA")
+
+    def test_path_hashes_are_evicted_with_the_images(self):
+        paths = [self.make_image(f"{i}.png", (64, 64 + i)) for i in range(3)]
+        with patch.object(settings, "image_cache_max_mb", 0):
+            for path in paths:
+                asyncio.run(self.pipeline.load([path], "gemini", "base64"))
+        self.assertEqual(self.pipeline.stats()["entries"], 1)
+        self.assertEqual(self.pipeline.stats()["paths"], 1)
+        self.assertIsNone(self.pipeline.content_hash(paths[0]))
+        self.assertIsNotNone(self.pipeline.content_hash(paths[2]))
+
+        # A rewritten file replaces its old hash instead of adding one
+        PIL.Image.new("RGB", (32, 32)).save(paths[2])
+        asyncio.run(self.pipeline.load([paths[2]], "gemini", "base64"))
+        self.assertEqual(self.pipeline.stats()["paths"], 1)
+
+    def test_missing_files_are_reported_not_raised(self):
+        good = self.make_image("ok.jpg", (10, 10))
+        images, errors = asyncio.run(self.pipeline.load_for_gemini([good, "/nope/missing.png"]))
+        self.assertEqual(len(images), 1)
+        self.assertEqual(errors[0][0], "/nope/missing.png")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import LibraryItem
+from app.services.library_resolver import LibraryResolver, library_resolver
+from app.services.llm_service import llm_service
+
+
+class TestLibraryResolver(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        self.db = sessionmaker(bind=engine)()
+        self.addCleanup(self.db.close)
+        self.queries = []
+        event.listen(engine, "before_cursor_execute", lambda *args: self.queries.append(args[2]))
+        self.db.add_all([
+            LibraryItem(slug="tone", name="Tone", content="Be kind."),
+            LibraryItem(slug="manifesto", name="Manifesto", content="We ship. @tone"),
+            LibraryItem(slug="ping", name="Ping", content="see @pong"),
+            LibraryItem(slug="pong", name="Pong", content="see @ping"),
+            LibraryItem(slug="paths", name="Paths", content=r"C:\new\table"),
+        ])
+        self.db.commit()
+        self.queries.clear()
+        self.resolver = LibraryResolver()
+
+    def test_expands_known_slugs_and_leaves_the_rest(self):
+        text = self.resolver.resolve("Follow @tone, email me@nowhere or @tones", self.db)
+        self.assertEqual(text, "Follow \n[Start of Tone]\nBe kind.\n[End of Tone]\n, email me@nowhere or @tones")
+        self.assertIn(r"C:\new\table", self.resolver.resolve("@paths", self.db))
+
+    def test_nested_references_expand_and_cycles_stop(self):
+        text = self.resolver.resolve("@manifesto", self.db)
+        self.assertIn("We ship. \n[Start of Tone]\nBe kind.", text)
+
+        text = self.resolver.resolve("@ping", self.db)
+        self.assertEqual(text.count("[Start of Ping]"), 1)
+        self.assertEqual(text.count("[Start of Pong]"), 1)
+        self.assertIn("see @ping", text)
+        self.assertGreater(self.resolver.counters["cycles"], 0)
+
+        text = self.resolver.resolve("@pong", self.db)  # The memoized @ping block must not nest pong twice
+        self.assertEqual(text.count("[Start of Pong]"), 1)
+        self.assertIn("see @pong", text)
+
+    def test_index_loads_once_until_invalidated(self):
+        for _ in range(5):
+            self.resolver.resolve("@manifesto and @tone", self.db)
+        self.assertEqual(len(self.queries), 1)
+        self.assertGreater(self.resolver.counters["memo_hits"], 0)
+
+        self.db.query(LibraryItem).filter(LibraryItem.slug == "tone").update({"content": "Be brief."})
+        self.db.commit()
+        self.resolver.invalidate()
+        self.assertIn("Be brief.", self.resolver.resolve("@manifesto", self.db))
+        self.assertEqual(self.resolver.version, 1)
+
+    def test_resolve_dependencies_uses_the_shared_resolver(self):
+        library_resolver.invalidate()  # The singleton may hold another test's index
+        self.addCleanup(library_resolver.invalidate)
+        self.assertEqual(llm_service.resolve_dependencies("@tone", None), "@tone")
+        self.assertIn("Be kind.", llm_service.resolve_dependencies("@tone", self.db))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from app.config import settings
+from app.services.llm_resilience import CircuitBreaker, FirstChunkRace, LLMProviderError, llm_resilience
+from app.services.llm_scheduler import llm_scheduler
+from app.services.llm_service import LLMService
+
+
+class FakeProviders:
+    """Scripted provider behaviour: a list of outcomes per (provider, model), consumed per call"""
+
+    def __init__(self, script):
+        self.script = script
+        self.calls = []
+
+    async def stream(self, provider, model, request, notices):
+        self.calls.append((provider, model))
+        outcome = self.script[(provider, model)].pop(0)
+        if isinstance(outcome, tuple):  # (delay, text)
+            await asyncio.sleep(outcome[0])
+            outcome = outcome[1]
+        if isinstance(outcome, Exception):
+            raise outcome
+        for word in outcome.split(" "):
+            yield word + " "
+
+
+class TestResilientGeneration(unittest.TestCase):
+    def setUp(self):
+        for name, value in [
+            ("llm_retry_attempts", 2),
+            ("llm_retry_base_delay", 0.0),
+            ("llm_fallback_provider", ""),
+            ("llm_hedge_after_ms", 0),
+            ("llm_breaker_failure_threshold", 3),
+            ("llm_cache_enabled", False),
+        ]:
+            patcher = patch.object(settings, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch.object(llm_resilience, "_breakers", {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.service = LLMService()
+
+    def run_stream(self, script, **kwargs):
+        fake = FakeProviders(script)
+
+        async def run():
+            with patch.object(self.service, "_generate_provider_stream", fake.stream):
+                return "".join([c async for c in self.service.generate_stream("hi", "sys", **kwargs)])
+
+        return asyncio.run(run()), fake.calls
+
+    def test_retries_transient_errors_before_first_token(self):
+        text, calls = self.run_stream(
+            {("ollama", "llama3"): [LLMProviderError("ollama", "Ollama HTTP Error 503: busy"), "all good"]},
+            provider="ollama", model="llama3",
+        )
+        self.assertEqual(text.strip(), "all good")
+        self.assertEqual(len(calls), 2)
+
+    def test_fails_over_to_participant_fallback(self):
+        text, calls = self.run_stream(
+            {
+                ("ollama", "llama3"): [LLMProviderError("ollama", "Ollama API Error: model not found", retryable=False)],
+                ("gemini", "gemini-2.5-flash"): ["fallback answer"],
+            },
+            provider="ollama", model="llama3", fallbacks=[("gemini", "gemini-2.5-flash")],
+        )
+        self.assertEqual(text.strip(), "fallback answer")
+        self.assertEqual(calls, [("ollama", "llama3"), ("gemini", "gemini-2.5-flash")])
+
+    def test_exhausted_targets_report_last_error(self):
+        error = LLMProviderError("ollama", "Ollama HTTP Error 500: boom")
+        text, calls = self.run_stream({("ollama", "llama3"): [error, error, error]}, provider="ollama", model="llama3")
+        self.assertEqual(text, "Ollama HTTP Error 500: boom")
+        self.assertEqual(len(calls), 3)
+        # Three consecutive retryable failures open the breaker
+        self.assertEqual(llm_resilience.breaker("ollama").state, "open")
+
+    def test_hedge_wins_over_slow_primary(self):
+        with patch.object(settings, "llm_hedge_after_ms", 20):
+            text, calls = self.run_stream(
+                {("gemini", "gemini-2.5-flash"): [(1.0, "slow primary"), "fast hedge"]},
+                provider="gemini", model="gemini-2.5-flash",
+            )
+        self.assertEqual(text.strip(), "fast hedge")
+        self.assertEqual(len(calls), 2)
+
+    def test_hedge_win_gives_back_the_primary_slot(self):
+        fake = FakeProviders({("gemini", "gemini-2.5-flash"): [(1.0, "slow primary"), "fast hedge answer"]})
+        running = []
+
+        async def stream(*args):
+            async for chunk in fake.stream(*args):
+                running.append(llm_scheduler.stats()["running"].get("gemini", 0))
+                yield chunk
+
+        async def run():
+            with patch.object(self.service, "_generate_provider_stream", stream):
+                return "".join([c async for c in self.service.generate_stream(
+                    "hi", "sys", provider="gemini", model="gemini-2.5-flash"
+                )])
+
+        with patch.object(settings, "llm_hedge_after_ms", 20):
+            self.assertEqual(asyncio.run(run()).strip(), "fast hedge answer")
+        # The first hedge chunk decides the race while both slots are held; the rest streams on one
+        self.assertEqual(running, [2, 1, 1])
+        self.assertEqual(llm_scheduler.stats()["running"], {})
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_half_open_allows_single_probe(self):
+        breaker = CircuitBreaker("ollama")
+        with patch.object(settings, "llm_breaker_failure_threshold", 1), patch.object(settings, "llm_breaker_cooldown", 0):
+            breaker.record_failure()
+            self.assertEqual(breaker.state, "open")
+            self.assertTrue(breaker.allow())
+            self.assertEqual(breaker.state, "half_open")
+            self.assertFalse(breaker.allow())
+            breaker.record_success()
+            self.assertEqual(breaker.state, "closed")
+
+    def test_race_raises_when_primary_fails_without_hedge(self):
+        async def failing():
+            raise LLMProviderError("gemini", "nope")
+            yield  # pragma: no cover
+
+        async def run():
+            await FirstChunkRace(failing(), lambda: failing(), 10).run()
+
+        with self.assertRaises(LLMProviderError):
+            asyncio.run(run())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from app.config import settings
+from app.services.llm_scheduler import (
+    LLMScheduler,
+    PRIORITY_BACKGROUND,
+    is_queue_hint,
+    queue_hint,
+)
+
+
+class TestLLMScheduler(unittest.TestCase):
+    def setUp(self):
+        for name, value in [
+            ("llm_concurrency_ollama", 1),
+            ("llm_model_concurrency", "gemini/gemini-2.5-pro=1"),
+            ("llm_scheduler_background_max_wait", 0),
+        ]:
+            patcher = patch.object(settings, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.scheduler = LLMScheduler()
+
+    def grant_order(self, tickets):
+        """Release granted tickets one at a time and record the order slots were handed out"""
+        order = []
+        pending = list(tickets)
+        while pending:
+            granted = [t for t in pending if t.granted.is_set()]
+            self.assertEqual(len(granted), 1)
+            order.append(granted[0])
+            pending.remove(granted[0])
+            self.scheduler.release(granted[0])
+        return order
+
+    def test_provider_limit_and_round_robin_between_meetings(self):
+        async def scenario():
+            s = self.scheduler
+            first = s.submit("ollama", "llama3", meeting_id=1)
+            a2 = s.submit("ollama", "llama3", meeting_id=1)
+            a3 = s.submit("ollama", "llama3", meeting_id=1)
+            b1 = s.submit("ollama", "llama3", meeting_id=2)
+            self.assertEqual(s.position(a2), 1)
+            self.assertEqual(s.position(b1), 3)
+            return first, a2, a3, b1
+
+        first, a2, a3, b1 = asyncio.run(scenario())
+        # Meeting 2 gets the next slot even though meeting 1 queued earlier
+        self.assertEqual(self.grant_order([first, a2, a3, b1]), [first, b1, a2, a3])
+
+    def test_interactive_work_goes_before_background(self):
+        async def scenario():
+            s = self.scheduler
+            running = s.submit("ollama", "llama3", meeting_id=1)
+            summary = s.submit("ollama", "llama3", meeting_id=2, priority=PRIORITY_BACKGROUND)
+            chat = s.submit("ollama", "llama3", meeting_id=3)
+            return running, summary, chat
+
+        running, summary, chat = asyncio.run(scenario())
+        self.assertEqual(self.grant_order([running, summary, chat]), [running, chat, summary])
+        stats = self.scheduler.stats()
+        self.assertEqual(stats["granted"], 3)
+        self.assertEqual(stats["running"], {})
+
+    def test_model_limit_and_cancellation(self):
+        async def scenario():
+            s = self.scheduler
+            pro = s.submit("gemini", "gemini-2.5-pro")
+            pro_waiting = s.submit("gemini", "gemini-2.5-pro")
+            flash = s.submit("gemini", "gemini-2.5-flash")
+            self.assertTrue(flash.granted.is_set())
+            self.assertFalse(pro_waiting.granted.is_set())
+            self.assertFalse(await s.wait(pro_waiting, 0.01))
+            s.release(pro_waiting)
+            s.release(pro)
+            s.release(flash)
+            return s.stats()
+
+        stats = asyncio.run(scenario())
+        self.assertEqual(stats["cancelled"], 1)
+        self.assertEqual(stats["queued"], {})
+        self.assertEqual(stats["running"], {})
+
+    def test_fair_keys_are_forgotten_once_idle(self):
+        async def scenario():
+            s = self.scheduler
+            for meeting_id in range(50):
+                s.release(s.submit("ollama", "llama3", meeting_id=meeting_id))
+            running = s.submit("ollama", "llama3", meeting_id=1)
+            waiting = s.submit("ollama", "llama3", meeting_id=2)
+            cancelled = s.submit("ollama", "llama3", meeting_id=3)
+            self.assertEqual(set(s._last_served), {"meeting:1"})
+            s.release(cancelled)
+            s.release(running)
+            s.release(waiting)
+            return s._last_served
+
+        self.assertEqual(asyncio.run(scenario()), {})
+
+    def test_queue_hint_marker(self):
+        self.assertTrue(is_queue_hint(queue_hint(3)))
+        self.assertFalse(is_queue_hint("position 3"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.database import Base
+from app.models import Company, Meeting, MeetingMessage
+from app.services.meeting_context import MeetingContextCache
+from app.services.memory_service import memory_service
+
+START = datetime(2024, 1, 1)
+
+
+class TestMeetingContextCache(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        self.db = sessionmaker(bind=engine)()
+        self.addCleanup(self.db.close)
+        self.queries = []
+        event.listen(engine, "before_cursor_execute", lambda *args: self.queries.append(args[2]))
+
+        company = Company(name="Acme")
+        self.db.add(company)
+        self.db.flush()
+        meeting = Meeting(company_id=company.id, title="Sync")
+        self.db.add(meeting)
+        self.db.commit()
+        self.meeting_id = meeting.id
+
+        self.cache = MeetingContextCache()
+        for patcher in (
+            patch("app.services.memory_service.meeting_context_cache", self.cache),
+            patch.object(settings, "context_history_max_messages", 4),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def message(self, i, sender="U"):
+        message = MeetingMessage(
+            meeting_id=self.meeting_id,
+            sender_type="user",
+            sender_name=sender,
+            content=f"m{i}",
+            created_at=START + timedelta(seconds=i),
+        )
+        self.db.add(message)
+        self.db.commit()
+        self.cache.add(message)
+        return message
+
+    def history(self, limit=None):
+        return memory_service.get_meeting_history(self.db, self.meeting_id, limit)
+
+    def test_second_read_comes_from_memory(self):
+        for i in range(6):
+            self.message(i)
+        self.assertEqual(self.history(), ["U: m2", "U: m3", "U: m4", "U: m5"])
+        self.queries.clear()
+
+        self.assertEqual(self.history(), ["U: m2", "U: m3", "U: m4", "U: m5"])
+        self.assertEqual(self.history(limit=2), ["U: m4", "U: m5"])
+        self.assertEqual(self.queries, [])
+        self.assertEqual(self.cache.stats()["hit_ratio"], 0.667)
+
+    def test_writes_keep_the_buffer_current(self):
+        messages = [self.message(i) for i in range(3)]
+        self.history()
+        self.message(3)
+        self.message(4)
+        messages[2].content = "edited"
+        self.db.commit()
+        self.cache.update(messages[2])
+        self.queries.clear()
+
+        self.assertEqual(self.history(), ["U: m1", "U: edited", "U: m3", "U: m4"])
+        self.assertEqual(self.queries, [])
+
+        # Resend from m3: the buffer no longer holds the whole meeting, so it reloads
+        self.db.query(MeetingMessage).filter(MeetingMessage.created_at > messages[2].created_at + timedelta(seconds=1)).delete()
+        self.db.commit()
+        self.cache.remove_after(self.meeting_id, messages[2].created_at + timedelta(seconds=1))
+        self.queries.clear()
+        self.assertEqual(self.history(), ["U: m0", "U: m1", "U: edited", "U: m3"])
+        self.assertEqual(len(self.queries), 1)
+
+    def test_load_racing_a_write_is_not_kept(self):
+        self.message(0)
+        load = self.cache.begin_load(self.meeting_id)
+        rows = self.db.execute(memory_service._history_query(self.meeting_id, 4)).all()
+        self.message(1)
+        self.cache.finish_load(load, rows, 4)
+
+        self.assertEqual(self.cache.stats()["discarded_loads"], 1)
+        self.assertEqual(self.history(), ["U: m0", "U: m1"])
+
+    def test_meetings_are_evicted_within_limits(self):
+        with patch.object(settings, "meeting_context_cache_max_meetings", 2):
+            for meeting_id in (1, 2, 3):
+                load = self.cache.begin_load(meeting_id)
+                self.cache.finish_load(load, [(START, meeting_id, "U", "hi")], 4)
+            self.assertIsNone(self.cache.history(1, 1))
+            self.assertEqual(self.cache.history(3, 1), ["U: hi"])
+
+        with patch.object(settings, "meeting_context_cache_max_mb", 0):
+            self.cache.finish_load(self.cache.begin_load(4), [(START, 4, "U", "hi")], 4)
+        stats = self.cache.stats()
+        self.assertEqual((stats["meetings"], stats["memory_mb"], stats["evictions"]), (0, 0.0, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import patch
+
+from app.config import settings
+from app.services.meeting_events import (
+    MESSAGE_CREATED,
+    RESYNC,
+    STATUS_CHANGED,
+    TOKEN,
+    MeetingEventBus,
+    MeetingSubscription,
+)
+from app.services import meeting_events as meeting_events_module
+
+
+class TestMeetingEventBus(unittest.TestCase):
+    def setUp(self):
+        self.bus = MeetingEventBus()
+
+    def listen(self, since, publish, count):
+        """Subscribe, run `publish` once subscribed and return the first `count` events"""
+        async def run():
+            self.bus.start()
+            events = []
+
+            async def consume():
+                async for event in self.bus.subscribe(1, since=since):
+                    events.append(event)
+                    if len(events) == count:
+                        return
+
+            task = asyncio.create_task(consume())
+            await asyncio.sleep(0)
+            await publish()
+            await asyncio.wait_for(task, 1)
+            return events
+
+        return asyncio.run(run())
+
+    def test_publish_from_worker_thread_reaches_subscribers(self):
+        async def publish():
+            thread = threading.Thread(target=self.bus.publish, args=(1, STATUS_CHANGED, {"status": "ended"}))
+            thread.start()
+            thread.join()
+
+        [event] = self.listen(0, publish, 1)
+        self.assertEqual(event["type"], STATUS_CHANGED)
+        self.assertEqual(event["seq"], 1)
+
+    def test_tokens_are_ephemeral_but_tracked_for_snapshots(self):
+        async def publish():
+            self.bus.publish(1, TOKEN, {"staff_id": 3, "name": "Ada", "content": "Hel"})
+            self.bus.publish(1, TOKEN, {"staff_id": 3, "name": "Ada", "content": "lo"})
+            self.assertEqual(self.bus._channel(1).streaming[3]["text"], "Hello")
+            self.bus.publish(1, MESSAGE_CREATED, {"id": 9, "staff_id": 3, "sender_type": "staff"})
+
+        events = self.listen(0, publish, 3)
+        self.assertEqual([e["type"] for e in events], [TOKEN, TOKEN, MESSAGE_CREATED])
+        self.assertNotIn("seq", events[0])
+        self.assertEqual(events[2]["seq"], 1)
+        self.assertEqual(self.bus._channel(1).streaming, {})
+        self.assertEqual(list(self.bus._channel(1).replay), [events[2]])
+
+    def test_reconnect_gets_only_missed_events(self):
+        async def setup():
+            self.bus.start()
+            for status in ("a", "b", "c"):
+                self.bus.publish(1, STATUS_CHANGED, {"status": status})
+
+        asyncio.run(setup())
+        self.assertEqual([e["seq"] for e in self.bus.deltas_since(1, 1)], [2, 3])
+        self.assertEqual(self.bus.deltas_since(1, 3), [])
+        self.assertIsNone(self.bus.deltas_since(1, 7))  # From another server run
+
+    def test_replay_window_is_bounded(self):
+        patcher = patch.object(settings, "meeting_events_replay", 2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        async def setup():
+            self.bus.start()
+            for status in ("a", "b", "c", "d"):
+                self.bus.publish(1, STATUS_CHANGED, {"status": status})
+
+        asyncio.run(setup())
+        self.assertIsNone(self.bus.deltas_since(1, 1))  # Needs a snapshot
+        self.assertEqual([e["seq"] for e in self.bus.deltas_since(1, 2)], [3, 4])
+
+    def test_idle_channels_are_dropped(self):
+        clock = patch.object(meeting_events_module.time, "monotonic", return_value=1000.0)
+        clock.start()
+        self.addCleanup(clock.stop)
+
+        async def publish_to(*meeting_ids):
+            self.bus.start()
+            for meeting_id in meeting_ids:
+                self.bus.publish(meeting_id, STATUS_CHANGED, {"status": "active"})
+
+        asyncio.run(publish_to(1, 1, 2))
+        self.assertEqual(self.bus.deltas_since(3, 0), [])
+        self.assertEqual(self.bus.stats()["channels"], 2)  # Lookups don't create channels
+
+        meeting_events_module.time.monotonic.return_value += settings.meeting_events_idle_seconds + 1
+        asyncio.run(publish_to(4))
+        self.assertEqual(set(self.bus._channels), {4})
+        self.assertEqual(self.bus.counters["channels_dropped"], 2)
+
+        # A recreated channel counts on, so a cursor from before the drop gets a snapshot
+        asyncio.run(publish_to(1))
+        self.assertEqual(self.bus._channels[1].seq, 3)
+        self.assertIsNone(self.bus.deltas_since(1, 1))
+        self.assertEqual(self.bus.deltas_since(1, 2)[0]["data"], {"status": "active"})
+
+    def test_drop_waits_for_listeners_and_streams(self):
+        async def run():
+            self.bus.start()
+            self.bus.publish(1, STATUS_CHANGED, {"status": "ended"})
+            self.bus.publish(2, TOKEN, {"staff_id": 3, "name": "Ada", "content": "Hel"})
+            self.bus._channel(3).subscribers.add(MeetingSubscription())
+            for meeting_id in (1, 2, 3):
+                self.bus.drop(meeting_id)
+
+        asyncio.run(run())
+        self.assertEqual(set(self.bus._channels), {2, 3})
+
+    def test_slow_subscriber_is_told_to_resync(self):
+        patcher = patch.object(settings, "meeting_events_queue_size", 2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        async def run():
+            subscription = MeetingSubscription()
+            for seq in range(3):
+                subscription.put({"seq": seq, "type": STATUS_CHANGED})
+            return subscription
+
+        subscription = asyncio.run(run())
+        self.assertEqual(subscription.queue.qsize(), 1)
+        self.assertEqual(subscription.queue.get_nowait()["type"], RESYNC)
+        self.assertEqual(subscription.lagged, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+from contextlib import contextmanager
+from datetime import datetime
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Company, Meeting, MeetingParticipant, Staff
+from app.services.meeting_queries import list_meetings, meeting_detail
+
+
+class TestMeetingQueries(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        self.addCleanup(self.db.close)
+        company = Company(name="Acme")
+        self.staff = [Staff(name=f"S{i}", role="Analyst") for i in range(3)]
+        self.db.add_all([company, *self.staff])
+        self.db.flush()
+        self.company_id = company.id
+
+    def add_meetings(self, count, status="active"):
+        for i in range(count):
+            meeting = Meeting(
+                company_id=self.company_id, title=f"M{i}", status=status,
+                summary="long summary", created_at=datetime(2024, 1, 1 + i % 28),
+            )
+            self.db.add(meeting)
+            self.db.flush()
+            for staff in self.staff:
+                self.db.add(MeetingParticipant(meeting_id=meeting.id, staff_id=staff.id))
+        self.db.commit()
+
+    @contextmanager
+    def count_queries(self):
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(self.engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(self.engine, "before_cursor_execute", record)
+
+    def test_listing_uses_constant_number_of_queries(self):
+        self.add_meetings(2)
+        with self.count_queries() as few:
+            list_meetings(self.db, self.company_id)
+        self.add_meetings(20)
+        with self.count_queries() as many:
+            result = list_meetings(self.db, self.company_id)
+        self.assertEqual(len(result), 22)
+        self.assertEqual(len(few), len(many))
+        self.assertEqual(len(many), 2)
+        self.assertEqual([p.staff_name for p in result[0]["participants"]], ["S0", "S1", "S2"])
+
+    def test_filters_pagination_and_summary_option(self):
+        self.add_meetings(5)
+        self.add_meetings(2, status="ended")
+        ended = list_meetings(self.db, self.company_id, status="ended")
+        self.assertEqual(len(ended), 2)
+        page = list_meetings(self.db, self.company_id, skip=1, limit=2, include_summary=False)
+        self.assertEqual([m["title"] for m in page], ["M1", "M2"])
+        self.assertIsNone(page[0]["summary"])
+        since = list_meetings(self.db, self.company_id, created_after=datetime(2024, 1, 4))
+        self.assertEqual([m["title"] for m in since], ["M3", "M4"])
+
+    def test_detail_includes_context_settings(self):
+        self.add_meetings(1)
+        meeting = self.db.query(Meeting).first()
+        with self.count_queries() as statements:
+            detail = meeting_detail(self.db, meeting)
+        self.assertEqual(len(statements), 1)
+        self.assertTrue(detail["participants"][0].context_settings["personality"])
+
+
+if __name__ == "__main__":
+    unittest.main()
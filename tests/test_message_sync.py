@@ -0,0 +1,86 @@
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Company, Meeting, MeetingMessage
+from app.services.message_sync import (
+    etag_matches,
+    message_delta,
+    message_page,
+    messages_etag,
+    messages_version,
+)
+
+
+class TestMessageSync(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        self.db = sessionmaker(bind=engine)()
+        self.addCleanup(self.db.close)
+        company = Company(name="Acme")
+        self.db.add(company)
+        self.db.flush()
+        meeting = Meeting(company_id=company.id, title="Sync")
+        self.db.add(meeting)
+        self.db.flush()
+        self.meeting_id = meeting.id
+        start = datetime(2024, 1, 1)
+        for i in range(1, 8):
+            self.db.add(MeetingMessage(
+                id=i, meeting_id=meeting.id, sender_type="user", sender_name="User",
+                content=f"m{i}", created_at=start + timedelta(minutes=i),
+            ))
+        self.db.commit()
+
+    def ids(self, messages):
+        return [m.id for m in messages]
+
+    def test_tail_and_older_pages(self):
+        page, more = message_page(self.db, self.meeting_id, limit=3)
+        self.assertEqual((self.ids(page), more), ([5, 6, 7], True))
+        page, more = message_page(self.db, self.meeting_id, before=5, limit=3)
+        self.assertEqual((self.ids(page), more), ([2, 3, 4], True))
+        page, more = message_page(self.db, self.meeting_id, before=2, limit=3)
+        self.assertEqual((self.ids(page), more), ([1], False))
+
+    def test_forward_pages(self):
+        page, more = message_page(self.db, self.meeting_id, after=3, limit=2)
+        self.assertEqual((self.ids(page), more), ([4, 5], True))
+        page, more = message_page(self.db, self.meeting_id, after=5, limit=2)
+        self.assertEqual((self.ids(page), more), ([6, 7], False))
+
+    def test_no_params_returns_everything(self):
+        page, more = message_page(self.db, self.meeting_id)
+        self.assertEqual((self.ids(page), more), (list(range(1, 8)), False))
+
+    def test_delta_includes_new_and_edited_messages(self):
+        self.db.get(MeetingMessage, 2).content = "edited"
+        self.db.commit()
+        self.db.add(MeetingMessage(
+            meeting_id=self.meeting_id, sender_type="user", sender_name="User", content="m8",
+        ))
+        self.db.commit()
+        messages, more = message_delta(self.db, self.meeting_id, since_id=7)
+        self.assertEqual((self.ids(messages), more), ([2, 8], False))
+        self.assertIsNotNone(messages[0].updated_at)
+
+    def test_etag_changes_with_edits(self):
+        version = messages_version(self.db, self.meeting_id)
+        etag = messages_etag(self.meeting_id, version, limit=3)
+        self.assertTrue(etag_matches(etag, etag))
+        self.assertTrue(etag_matches(f'"other", {etag[2:]}', etag))
+        self.assertNotEqual(etag, messages_etag(self.meeting_id, version, limit=4))
+
+        self.db.get(MeetingMessage, 1).content = "edited"
+        self.db.commit()
+        changed = messages_etag(self.meeting_id, messages_version(self.db, self.meeting_id), limit=3)
+        self.assertFalse(etag_matches(etag, changed))
+        self.assertFalse(etag_matches(None, changed))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from sqlalchemy import create_engine, event
+
+from app import models  # noqa: F401 - registers the tables
+from app.database import Base
+from app.migrations import LATEST_VERSION, MIGRATIONS, run_migrations
+
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        self.addCleanup(os.remove, self.path)
+        self.engine = create_engine(f"sqlite:///{self.path}")
+        self.addCleanup(self.engine.dispose)
+
+    def sql(self, statement, *params):
+        with sqlite3.connect(self.path) as conn:
+            return conn.execute(statement, params).fetchall()
+
+    def indexes(self, table):
+        return {row[1] for row in self.sql(f"PRAGMA index_list({table})")}
+
+    def make_legacy_db(self):
+        """A database from before the runner: no new columns, indexes or uniqueness"""
+        Base.metadata.create_all(self.engine)
+        for index in ("ix_meeting_messages_meeting_created", "ix_knowledge_company_created",
+                      "uq_llm_model_limits_provider_model"):
+            self.sql(f"DROP INDEX {index}")
+        self.sql("ALTER TABLE meeting_messages DROP COLUMN updated_at")
+        for max_tokens in (1000, 2000):
+            self.sql(
+                "INSERT INTO llm_model_limits (provider, model_name, max_tokens) VALUES ('mock', 'mock', ?)",
+                max_tokens,
+            )
+
+    def test_upgrades_legacy_database(self):
+        self.make_legacy_db()
+        self.assertEqual(run_migrations(self.engine), [v for v, _, _ in MIGRATIONS])
+
+        self.assertIn("ix_meeting_messages_meeting_created", self.indexes("meeting_messages"))
+        self.assertIn("ix_knowledge_company_created", self.indexes("knowledge"))
+        self.assertIn("uq_llm_model_limits_provider_model", self.indexes("llm_model_limits"))
+        self.assertIn("updated_at", [row[1] for row in self.sql("PRAGMA table_info(meeting_messages)")])
+        self.assertEqual(self.sql("SELECT max_tokens FROM llm_model_limits"), [(2000,)])
+        self.assertEqual(self.sql("PRAGMA user_version"), [(LATEST_VERSION,)])
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.sql("INSERT INTO llm_model_limits (provider, model_name, max_tokens) VALUES ('mock', 'mock', 1)")
+
+    def test_moves_staff_company_links_into_company_staff(self):
+        self.make_legacy_db()
+        # Before many-to-many staff, each staff row pointed at one company
+        self.sql("ALTER TABLE staff ADD COLUMN company_id INTEGER REFERENCES companies (id)")
+        self.sql("INSERT INTO companies (id, name) VALUES (1, 'Acme')")
+        self.sql("INSERT INTO meetings (id, company_id, title) VALUES (1, 1, 'Sync')")
+        self.sql(
+            "INSERT INTO staff (id, company_id, name, role, knowledge_base, is_active) "
+            "VALUES (1, 1, 'Ada', 'CTO', 'kb', 1), (2, NULL, 'Bob', 'CFO', NULL, 1)"
+        )
+        self.sql("INSERT INTO meeting_participants (meeting_id, staff_id, llm_provider, llm_model) VALUES (1, 1, 'mock', 'mock')")
+
+        run_migrations(self.engine)
+
+        self.assertEqual(self.sql("SELECT company_id, staff_id FROM company_staff"), [(1, 1)])
+        columns = [row[1] for row in self.sql("PRAGMA table_info(staff)")]
+        self.assertNotIn("company_id", columns)
+        self.assertIn("knowledge_base", columns)
+        self.assertEqual(self.sql("SELECT id, name, knowledge_base FROM staff ORDER BY id"), [(1, "Ada", "kb"), (2, "Bob", None)])
+        self.assertIn("ix_staff_name", self.indexes("staff"))
+        self.assertEqual(self.sql("SELECT staff_id FROM meeting_participants"), [(1,)])
+        self.assertEqual(self.sql("PRAGMA foreign_key_check"), [])
+
+    def test_fresh_database_only_records_steps(self):
+        Base.metadata.create_all(self.engine)
+        run_migrations(self.engine)
+        recorded = [row[0] for row in self.sql("SELECT version FROM schema_migrations ORDER BY version")]
+        self.assertEqual(recorded, [v for v, _, _ in MIGRATIONS])
+
+    def test_up_to_date_check_is_one_statement(self):
+        Base.metadata.create_all(self.engine)
+        run_migrations(self.engine)
+        statements = []
+        event.listen(self.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        self.assertEqual(run_migrations(self.engine), [])
+        self.assertEqual(statements, ["PRAGMA user_version"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from app.config import settings
+from app.services.llm_service import llm_service
+from app.services.mock_provider import MOCK_ERROR, MockLLMProvider, MockProfile
+
+
+class TestMockProvider(unittest.TestCase):
+    def setUp(self):
+        for name, value in [
+            ("mock_llm_enabled", True),
+            ("mock_llm_ttft_ms", 0.0),
+            ("mock_llm_tokens_per_second", 0.0),
+            ("mock_llm_reply_tokens", 10),
+            ("mock_llm_chunk_tokens", 3),
+            ("mock_llm_error_rate", 0.0),
+            ("mock_llm_script_path", ""),
+        ]:
+            patcher = patch.object(settings, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.provider = MockLLMProvider()
+
+    def collect(self, prompt, model=None):
+        async def run():
+            return [chunk async for chunk in self.provider.stream(prompt, "system", model)]
+        return asyncio.run(run())
+
+    def test_replies_are_deterministic_and_chunked(self):
+        first = self.collect("hello")
+        self.assertEqual(first, self.collect("hello"))
+        self.assertEqual(len(first), 4)  # 10 words in chunks of 3
+        self.assertEqual(len("".join(first).split()), 10)
+
+    def test_model_string_overrides_profile(self):
+        profile = MockProfile("mock?ttft_ms=50&chunk_tokens=5&unknown=1")
+        self.assertEqual(profile.ttft_ms, 50.0)
+        self.assertEqual(profile.chunk_tokens, 5)
+        self.assertEqual(len(self.collect("hello", "mock?chunk_tokens=10")), 1)
+
+    def test_error_rate_injects_failures(self):
+        with patch.object(settings, "mock_llm_error_rate", 1.0):
+            chunks = self.collect("hello")
+        self.assertEqual(chunks[-1], MOCK_ERROR)
+        self.assertNotIn(MOCK_ERROR, chunks[:-1])
+
+    def test_scripted_replies(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "script.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump([{"match": "budget", "reply": "Budget is fine."}, "Default answer."], f)
+            with patch.object(settings, "mock_llm_script_path", path):
+                self.assertEqual(self.provider.reply_for("what about the budget?"), "Budget is fine.")
+                self.assertEqual(self.provider.reply_for("anything else"), "Default answer.")
+
+    def test_generate_stream_routes_to_mock(self):
+        async def run():
+            return [c async for c in llm_service.generate_stream("hi", "sys", provider="mock", model="mock")]
+
+        self.assertEqual(len("".join(asyncio.run(run())).split()), 10)
+        with patch.object(settings, "mock_llm_enabled", False):
+            self.assertTrue(asyncio.run(run())[0].startswith("Error: Mock provider is disabled"))
+
+
+if __name__ == "__main__":
+    unittest.main()
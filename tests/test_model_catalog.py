@@ -0,0 +1,83 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+from app.config import settings
+from app.services.model_catalog import OllamaModelCatalog
+
+TAGS = {
+    "models": [{
+        "name": "llama3:8b",
+        "size": 4661224676,
+        "digest": "abc123",
+        "details": {"family": "llama", "parameter_size": "8.0B", "quantization_level": "Q4_0", "format": "gguf"},
+    }]
+}
+
+
+class FakePool:
+    def __init__(self, handler):
+        self.handler = handler
+
+    def get_client(self, base_url=None):
+        return httpx.AsyncClient(base_url=base_url, transport=httpx.MockTransport(self.handler))
+
+
+class TestOllamaModelCatalog(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.fail = False
+        for name, value in [("ollama_base_url", "http://ollama.local"), ("ollama_catalog_cold_wait", 1.0)]:
+            patcher = patch.object(settings, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch("app.services.model_catalog.http_client_pool", FakePool(self.handler))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.catalog = OllamaModelCatalog()
+
+    def handler(self, request):
+        self.calls.append(request.url.path)
+        if self.fail:
+            return httpx.Response(503)
+        if request.url.path == "/api/show":
+            return httpx.Response(200, json={"model_info": {"llama.context_length": 8192}})
+        return httpx.Response(200, json=TAGS)
+
+    def test_cold_load_includes_metadata(self):
+        models = asyncio.run(self.catalog.get_models())
+        self.assertEqual(models[0]["name"], "llama3:8b")
+        self.assertEqual(models[0]["quantization"], "Q4_0")
+        self.assertEqual(models[0]["context_length"], 8192)
+        self.assertTrue(self.catalog.snapshot()["health"]["healthy"])
+
+    def test_fresh_entries_do_not_hit_the_network(self):
+        async def scenario():
+            await self.catalog.get_models()
+            return await self.catalog.get_model_names()
+
+        self.assertEqual(asyncio.run(scenario()), ["llama3:8b"])
+        self.assertEqual(self.calls, ["/api/tags", "/api/show"])
+        self.assertEqual(self.catalog.counters["hits"], 1)
+
+    def test_stale_entries_are_served_while_revalidating(self):
+        async def scenario():
+            await self.catalog.get_models()
+            self.fail = True
+            with patch.object(settings, "ollama_catalog_ttl", -1):
+                stale = await self.catalog.get_model_names()
+            await asyncio.sleep(0.05)
+            return stale
+
+        self.assertEqual(asyncio.run(scenario()), ["llama3:8b"])
+        health = self.catalog.snapshot()["health"]
+        self.assertFalse(health["healthy"])
+        self.assertEqual(health["consecutive_failures"], 1)
+        # Context length is memoized by digest, so the failing refresh only retried /api/tags
+        self.assertEqual(self.calls.count("/api/show"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from app.config import settings
+from app.services.model_limits import ModelLimitCache
+
+
+class TestModelLimitCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = ModelLimitCache()
+        self.stored = {}
+        self.cache._read_db = lambda provider, model: self.stored.get((provider, model))
+        self.cache._write_db = lambda provider, model, value: self.stored.__setitem__((provider, model), value)
+        self.fetches = 0
+
+    async def _fetch(self, provider, model):
+        self.fetches += 1
+        await asyncio.sleep(0.01)
+        return 4096
+
+    def test_concurrent_misses_share_one_fetch(self):
+        async def scenario():
+            return await asyncio.gather(*[self.cache.get("ollama", "llama3", self._fetch, 8192) for _ in range(5)])
+
+        self.assertEqual(asyncio.run(scenario()), [4096] * 5)
+        self.assertEqual(self.fetches, 1)
+        self.assertEqual(self.cache.counters["coalesced"], 4)
+        self.assertEqual(self.stored[("ollama", "llama3")], 4096)
+
+    def test_database_row_skips_provider(self):
+        self.stored[("gemini", "gemini-2.0-flash")] = 1048576
+        value = asyncio.run(self.cache.get("gemini", "gemini-2.0-flash", self._fetch, 32768))
+        self.assertEqual(value, 1048576)
+        self.assertEqual(self.fetches, 0)
+
+    def test_failed_fetch_uses_fallback(self):
+        async def failing(provider, model):
+            return None
+
+        self.assertEqual(asyncio.run(self.cache.get("ollama", "missing", failing, 8192)), 8192)
+
+    def test_stale_entry_is_served_while_refreshing(self):
+        async def scenario():
+            await self.cache.get("ollama", "llama3", self._fetch, 8192)
+            with patch.object(settings, "model_limit_refresh_seconds", -1):
+                stale = await self.cache.get("ollama", "llama3", self._fetch, 8192)
+            await asyncio.sleep(0.05)
+            return stale
+
+        self.assertEqual(asyncio.run(scenario()), 4096)
+        self.assertEqual(self.fetches, 2)
+        self.assertEqual(self.cache.counters["refreshes"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from unittest.mock import patch
+
+from app.config import settings
+from app.services import prompt_assembly as prompt_assembly_module
+from app.services.prompt_assembly import PromptAssembly, PromptAssemblyStore
+
+
+def assembly(content="hi"):
+    return PromptAssembly(
+        meeting_id=1,
+        staff_id=2,
+        content=content,
+        provider="mock",
+        model="mock",
+        blocks=[{"id": "personality", "content": "You are Ada", "enabled": True}],
+        packing={"budget": 100, "used": 3, "dropped": [], "truncated": []},
+        system_prompt="You are Ada",
+        image_paths=[],
+        missing_mentions=[],
+    )
+
+
+class TestPromptAssemblyStore(unittest.TestCase):
+    def test_handle_is_reused_only_while_the_fingerprint_matches(self):
+        store = PromptAssemblyStore()
+        built = assembly()
+        handle = store.put(built, ("v1",))
+
+        self.assertIs(store.get(handle, ("v1",)), built)
+        self.assertIsNone(store.get(handle, ("v2",)))
+        self.assertIsNone(store.get("unknown", ("v1",)))
+        self.assertIsNone(store.get(None, ("v1",)))
+        self.assertEqual(
+            {k: store.stats()[k] for k in ("reused", "stale", "unknown")},
+            {"reused": 1, "stale": 1, "unknown": 1},
+        )
+
+    def test_handles_expire_and_are_bounded(self):
+        store = PromptAssemblyStore()
+        with patch.object(settings, "prompt_handle_max_entries", 2), \
+                patch.object(prompt_assembly_module.time, "monotonic", return_value=1000.0):
+            handles = [store.put(assembly(str(i)), ("v",)) for i in range(3)]
+            self.assertIsNone(store.get(handles[0], ("v",)))
+            self.assertIsNotNone(store.get(handles[2], ("v",)))
+
+        with patch.object(prompt_assembly_module.time, "monotonic", return_value=1000.0 + settings.prompt_handle_ttl_seconds + 1):
+            self.assertIsNone(store.get(handles[2], ("v",)))
+        self.assertEqual(store.stats()["expired"], 1)
+        self.assertEqual(store.stats()["evictions"], 1)
+
+    def test_token_counts_are_computed_once(self):
+        built = assembly()
+        with patch("app.services.prompt_assembly.token_counter.count", return_value=5) as count:
+            first = built.token_counts()
+            self.assertIs(built.token_counts(), first)
+        self.assertEqual(count.call_count, 2)
+        self.assertEqual(first["total"], 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
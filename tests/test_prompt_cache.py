@@ -0,0 +1,92 @@
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import LibraryItem
+from app.services.library_resolver import library_resolver
+from app.services.llm_service import llm_service
+from app.services.prompt_cache import PromptCache
+from app.services.token_counter import token_counter
+
+
+class TestPromptCache(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        self.db = sessionmaker(bind=engine)()
+        self.addCleanup(self.db.close)
+        self.db.add(LibraryItem(slug="tone", name="Tone", content="Be kind."))
+        self.db.commit()
+
+        self.cache = PromptCache()
+        patcher = patch("app.services.llm_service.prompt_cache", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        library_resolver.invalidate()  # The singleton may hold another test's index
+        self.addCleanup(library_resolver.invalidate)
+
+    def blocks(self, staff_id=7, meeting_history=None, **overrides):
+        fields = dict(
+            staff_name="Ada",
+            role="CTO",
+            personality="Calm. @tone",
+            expertise=["Python", "Go"],
+            company_context="Acme builds rockets.",
+            meeting_context=None,
+            company_name="Acme",
+            company_description="Rockets",
+            system_prompt="Answer briefly.",
+            knowledge_base="Uses @tone",
+            db=self.db,
+            meeting_history=meeting_history or ["User: hi"],
+            staff_id=staff_id,
+        )
+        fields.update(overrides)
+        return llm_service.build_structured_prompt_blocks(**fields)
+
+    def test_cached_blocks_match_an_uncached_build(self):
+        uncached = self.blocks(staff_id=None)
+        self.blocks()
+        cached = self.blocks(meeting_history=["User: hi", "Ada: hello"])
+
+        self.assertEqual(self.cache.counters["hits"], 1)
+        for before, after in zip(uncached[:4], cached[:4]):
+            self.assertEqual(before["content"], after["content"])
+            self.assertEqual(before["enabled"], after["enabled"])
+        self.assertIn("Be kind.", cached[0]["content"])
+        self.assertIn("Ada: hello", cached[-1]["content"])
+
+    def test_staff_and_library_versions_invalidate(self):
+        self.blocks()
+        self.cache.bump_staff(7)
+        self.assertIn("Be brief.", self.blocks(personality="Be brief.")[0]["content"])
+
+        self.db.query(LibraryItem).update({"content": "Be bold."})
+        self.db.commit()
+        library_resolver.invalidate()
+        self.assertIn("Be bold.", self.blocks(personality="Be brief. @tone")[0]["content"])
+        self.assertEqual(self.cache.counters["hits"], 0)
+
+    def test_token_counts_are_reused_by_the_packer(self):
+        blocks = self.blocks()
+        llm_service.pack_prompt_blocks(blocks, 10_000, "gemini")
+        self.assertTrue(all("token_counts" not in block for block in blocks))
+        first = {block["id"]: block["tokens"] for block in blocks}
+
+        blocks = self.blocks()
+        with patch.object(token_counter, "count", wraps=token_counter.count) as count:
+            llm_service.pack_prompt_blocks(blocks, 10_000, "gemini")
+        counted = {call.args[0] for call in count.call_args_list}
+        self.assertNotIn(blocks[0]["content"], counted)
+        self.assertEqual({block["id"]: block["tokens"] for block in blocks}, first)
+
+        stats = self.cache.stats()
+        self.assertEqual(stats["hit_ratio"], 0.5)
+        self.assertEqual(stats["assemblies"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from app.config import settings
+from app.services.llm_resilience import LLMProviderError
+from app.services.llm_service import LLMService
+from app.services.response_cache import ResponseCache, response_cache
+from app.services.stream_telemetry import stream_telemetry
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResponseCache()
+
+    def test_key_depends_on_every_input(self):
+        base = self.cache.make_key("hi", "sys", "gemini", "flash", 0.7, [])
+        self.assertEqual(base, self.cache.make_key("hi", "sys", "gemini", "flash", 0.7, []))
+        self.assertNotEqual(base, self.cache.make_key("hi", "sys", "ollama", "flash", 0.7, []))
+        self.assertNotEqual(base, self.cache.make_key("hi", "sys", "gemini", "flash", 0.2, []))
+        self.assertNotEqual(base, self.cache.make_key("hi", "other", "gemini", "flash", 0.7, []))
+
+    def test_lru_eviction(self):
+        with patch.object(settings, "llm_cache_max_entries", 2):
+            self.cache.set("a", "gemini", ["1"])
+            self.cache.set("b", "gemini", ["2"])
+            self.cache.get("a")
+            self.cache.set("c", "gemini", ["3"])
+        self.assertEqual(self.cache.get("a"), ["1"])
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.counters["evictions"], 1)
+
+    def test_ttl_expiry(self):
+        with patch("app.services.response_cache.time.time", return_value=1000.0):
+            self.cache.set("a", "ollama", ["x"])
+        with patch("app.services.response_cache.time.time", return_value=1000.0 + settings.llm_cache_ttl_ollama + 1):
+            self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.counters["expired"], 1)
+
+
+class TestGenerateStreamCaching(unittest.TestCase):
+    def setUp(self):
+        response_cache.clear()
+        self.service = LLMService()
+        self.calls = 0
+
+        async def fake_provider(*args, **kwargs):
+            self.calls += 1
+            for chunk in ["Hel", "lo"]:
+                yield chunk
+
+        self.service._generate_provider_stream = fake_provider
+
+    def collect(self, **kwargs):
+        async def run():
+            return [c async for c in self.service.generate_stream("q", "sys", "gemini", "m", **kwargs)]
+        return asyncio.run(run())
+
+    def test_hit_replays_same_chunks(self):
+        self.assertEqual(self.collect(), ["Hel", "lo"])
+        self.assertEqual(self.collect(), ["Hel", "lo"])
+        self.assertEqual(self.calls, 1)
+
+    def test_bypass_flag_skips_cache(self):
+        self.collect()
+        self.collect(use_cache=False)
+        self.assertEqual(self.calls, 2)
+
+    def test_errors_are_not_cached(self):
+        async def failing(*args, **kwargs):
+            self.calls += 1
+            raise LLMProviderError("gemini", "Error generating Gemini response: quota", retryable=False)
+            yield  # pragma: no cover
+
+        self.service._generate_provider_stream = failing
+        self.assertEqual(self.collect(), ["Error generating Gemini response: quota"])
+        self.collect()
+        self.assertEqual(self.calls, 2)
+
+    def test_answers_that_mention_errors_are_cached(self):
+        async def answer(*args, **kwargs):
+            self.calls += 1
+            for chunk in ["Looks fine. ", "Errors in the report ", "are minor."]:
+                yield chunk
+
+        self.service._generate_provider_stream = answer
+        self.collect()
+        self.assertEqual(stream_telemetry.recent(limit=1)[0]["status"], "ok")
+        self.assertEqual(self.collect(), ["Looks fine. ", "Errors in the report ", "are minor."])
+        self.assertEqual(self.calls, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from app.config import settings
+from app.services.generation_jobs import GenerationJobManager
+from app.routers.meetings import participant_events
+from app.services import stream_mux
+from app.services.llm_resilience import ErrorChunk
+from app.services.sse import HEARTBEAT, event_name, format_sse, job_sse, parse_last_event_id, with_heartbeats
+
+
+async def slow(items, delay):
+    for item in items:
+        await asyncio.sleep(delay)
+        yield item
+
+
+async def collect(stream):
+    return [item async for item in stream]
+
+
+class TestSSEFormatting(unittest.TestCase):
+    def test_job_events_become_typed_frames_with_ids(self):
+        frame = format_sse({"seq": 7, "type": "chunk", "staff_id": 1, "content": "Hi"})
+        self.assertEqual(
+            frame,
+            'id: 7\nevent: token\ndata: {"seq": 7, "type": "chunk", "staff_id": 1, "content": "Hi"}\n\n',
+        )
+        self.assertIn("event: speaker_end\n", format_sse({"seq": 8, "type": "done", "staff_id": 1}))
+
+    def test_flagged_error_text_is_an_error_event(self):
+        frame = format_sse({"seq": 3, "type": "chunk", "content": "Error generating Gemini response: quota", "error": True})
+        self.assertIn("event: error\n", frame)
+        # Answers may start with the word; only the flag set for ErrorChunk counts
+        self.assertIn("event: token\n", format_sse({"seq": 4, "type": "chunk", "content": "Error handling is"}))
+
+    def test_participant_events_flag_typed_errors_only(self):
+        async def answer():
+            yield "Error handling is fine. "
+            yield ErrorChunk("Error: gemini is temporarily unavailable")
+
+        events = asyncio.run(collect(participant_events({1: answer()}, {1: "Ada"}, {}, stream_mux.chain)))
+        chunks = [event for event in events if event["type"] == "chunk"]
+        self.assertEqual([event_name(event) for event in chunks], ["token", "error"])
+
+    def test_last_event_id_parsing(self):
+        self.assertEqual(parse_last_event_id("12"), 12)
+        self.assertEqual(parse_last_event_id(None), 0)
+        self.assertEqual(parse_last_event_id("garbage"), 0)
+        self.assertEqual(parse_last_event_id("-4"), 0)
+
+
+class TestHeartbeats(unittest.TestCase):
+    def test_heartbeats_do_not_disturb_the_source(self):
+        items = asyncio.run(collect(with_heartbeats(slow(["a", "b"], 0.05), 0.02)))
+        self.assertEqual([i for i in items if i is not HEARTBEAT], ["a", "b"])
+        self.assertGreaterEqual(items.count(HEARTBEAT), 2)
+
+    def test_no_heartbeats_when_disabled(self):
+        items = asyncio.run(collect(with_heartbeats(slow(["a"], 0.02), 0)))
+        self.assertEqual(items, ["a"])
+
+
+class TestJobSSE(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(settings, "sse_heartbeat_seconds", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_resumes_after_last_event_id(self):
+        async def source():
+            yield {"type": "start", "staff_id": 1, "name": "Ada"}
+            for text in ("a", "b", "c"):
+                yield {"type": "chunk", "staff_id": 1, "content": text}
+            yield {"type": "done", "staff_id": 1, "message_id": 5}
+
+        async def run():
+            job = GenerationJobManager().create(source(), "message", 1, [1])
+            first = await collect(job_sse(job, announce=True))
+            resumed = await collect(job_sse(job, after=3))
+            return first, resumed
+
+        first, resumed = asyncio.run(run())
+        self.assertTrue(first[0].startswith("retry: "))
+        self.assertIn("event: job\n", first[1])
+        self.assertEqual([f.split("\n")[0] for f in resumed[1:]], ["id: 4", "id: 5"])
+
+
+if __name__ == "__main__":
+    unittest.main()
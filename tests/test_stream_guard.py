@@ -0,0 +1,93 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from app.services.stream_guard import DisconnectAwareStreamingResponse
+from app.services.stream_telemetry import StreamTelemetry
+
+
+class TestDisconnectAwareStreamingResponse(unittest.TestCase):
+    def serve(self, body, disconnect_after, stall_send=False):
+        """Run the response against a fake ASGI client that goes away after `disconnect_after` seconds"""
+        telemetry = StreamTelemetry()
+        sent = []
+
+        async def receive():
+            await asyncio.sleep(disconnect_after)
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+            if stall_send and message["type"] == "http.response.body":
+                await asyncio.Event().wait()  # Client stopped reading
+
+        async def run():
+            with patch("app.services.stream_guard.stream_telemetry", telemetry):
+                response = DisconnectAwareStreamingResponse(body, media_type="text/plain")
+                await response({"type": "http", "asgi": {"spec_version": "2.3"}}, receive, send)
+                return response
+
+        response = asyncio.run(asyncio.wait_for(run(), 2))
+        return response, sent, telemetry
+
+    def test_closes_generator_parked_on_yield(self):
+        events = []
+
+        async def body():
+            try:
+                yield "first"
+                events.append("resumed")
+                yield "second"
+            finally:
+                events.append("closed")
+
+        stream = body()
+        response, sent, telemetry = self.serve(stream, disconnect_after=0.05, stall_send=True)
+        self.assertTrue(response.client_disconnected)
+        self.assertEqual(events, ["closed"])
+        self.assertIsNone(stream.ag_frame)  # Finished now, not left for garbage collection
+        self.assertEqual(telemetry.cancellation["client_disconnects"], 1)
+
+    def test_completed_stream_is_not_a_disconnect(self):
+        async def body():
+            yield "a"
+            yield "b"
+
+        response, sent, telemetry = self.serve(body(), disconnect_after=5)
+        self.assertFalse(response.client_disconnected)
+        self.assertEqual([m.get("body") for m in sent if m["type"] == "http.response.body"], [b"a", b"b", b""])
+        self.assertEqual(telemetry.cancellation["client_disconnects"], 0)
+
+
+class TestCancellationMetrics(unittest.TestCase):
+    def test_estimates_tokens_saved_from_complete_answers(self):
+        telemetry = StreamTelemetry()
+        for _ in range(2):
+            record = telemetry.start("ollama", "llama3")
+            record.chunk("word " * 100)
+            telemetry.finish(record, "ok")
+        complete_tokens = record.tokens
+
+        record = telemetry.start("ollama", "llama3")
+        record.chunk("word " * 10)
+        telemetry.finish(record, "cancelled")
+
+        cancellation = telemetry.stats()["cancellation"]
+        self.assertEqual(cancellation["streams"], 1)
+        self.assertEqual(cancellation["partial_tokens"], record.tokens)
+        self.assertEqual(cancellation["estimated_tokens_saved"], complete_tokens - record.tokens)
+        self.assertEqual(
+            telemetry.stats()["models"]["ollama/llama3"]["estimated_tokens_saved"], complete_tokens - record.tokens
+        )
+
+    def test_no_estimate_without_history(self):
+        telemetry = StreamTelemetry()
+        record = telemetry.start("gemini", "m")
+        record.chunk("partial")
+        telemetry.finish(record, "cancelled")
+        self.assertEqual(telemetry.cancellation["estimated_tokens_saved"], 0)
+        self.assertEqual(telemetry.cancellation["streams"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import asyncio
+import unittest
+
+from app.services.stream_mux import STREAM_END, chain, multiplex, ordered
+
+
+async def timed(chunks):
+    """Yield (delay, text) pairs"""
+    for delay, text in chunks:
+        await asyncio.sleep(delay)
+        yield text
+
+
+async def collect(events):
+    return [event async for event in events]
+
+
+class TestMultiplex(unittest.TestCase):
+    def test_interleaves_by_arrival(self):
+        streams = {
+            "slow": timed([(0.03, "s1"), (0.03, "s2")]),
+            "fast": timed([(0.01, "f1"), (0.01, "f2")]),
+        }
+        events = asyncio.run(collect(multiplex(streams)))
+        self.assertEqual(
+            events,
+            [("fast", "f1"), ("fast", "f2"), ("fast", STREAM_END), ("slow", "s1"), ("slow", "s2"), ("slow", STREAM_END)],
+        )
+
+    def test_closing_cancels_running_streams(self):
+        cancelled = []
+
+        async def endless():
+            try:
+                while True:
+                    await asyncio.sleep(0.01)
+                    yield "x"
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        async def run():
+            events = multiplex({"a": endless()})
+            await events.__anext__()
+            await events.aclose()
+
+        asyncio.run(run())
+        self.assertEqual(cancelled, [True])
+
+    def test_chain_runs_streams_one_after_another(self):
+        streams = {
+            "slow": timed([(0.03, "s1")]),
+            "fast": timed([(0.01, "f1")]),
+        }
+        events = asyncio.run(collect(chain(streams)))
+        self.assertEqual(events, [("slow", "s1"), ("slow", STREAM_END), ("fast", "f1"), ("fast", STREAM_END)])
+
+
+class TestOrdered(unittest.TestCase):
+    def test_buffers_later_streams_until_their_turn(self):
+        streams = {
+            "first": timed([(0.03, "a1"), (0.03, "a2")]),
+            "second": timed([(0.01, "b1"), (0.01, "hint"), (0.01, "b2")]),
+            "third": timed([]),
+        }
+        events = asyncio.run(collect(ordered(streams, droppable=lambda c: c == "hint")))
+        self.assertEqual(
+            events,
+            [
+                ("first", "a1"), ("first", "a2"), ("first", STREAM_END),
+                ("second", "b1"), ("second", "b2"), ("second", STREAM_END),
+                ("third", STREAM_END),
+            ],
+        )
+
+    def test_current_stream_is_passed_through_live(self):
+        streams = {
+            "first": timed([(0.01, "a1"), (0.05, "a2")]),
+            "second": timed([(0.02, "b1"), (0.05, "b2")]),
+        }
+        events = asyncio.run(collect(ordered(streams)))
+        self.assertEqual([key for key, _ in events], ["first"] * 3 + ["second"] * 3)
+        self.assertEqual(events[3:], [("second", "b1"), ("second", "b2"), ("second", STREAM_END)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+
+from app.config import settings
+from app.services.llm_resilience import llm_resilience
+from app.services.llm_service import LLMService
+from app.services.stream_telemetry import StreamTelemetry, _percentile
+
+
+class TestStreamRecord(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(settings, "stream_stall_seconds", 0.05)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.telemetry = StreamTelemetry()
+
+    def test_ttft_excludes_queue_wait_for_provider_ttft(self):
+        record = self.telemetry.start("ollama", "llama3", meeting_id=1, staff_id=2)
+        record.queue_wait = 0.02
+        record.granted_at = time.perf_counter()
+        time.sleep(0.03)
+        record.chunk("hello ")
+        record.chunk("world")
+        self.telemetry.finish(record, "ok")
+
+        self.assertGreaterEqual(record.ttft, 0.03)
+        self.assertAlmostEqual(record.provider_ttft, record.ttft - 0.02)
+        self.assertEqual(record.chunks, 2)
+        self.assertGreater(record.tokens, 0)
+        self.assertEqual(record.stalls, 0)
+
+    def test_counts_stalls_and_reports_them_per_model(self):
+        record = self.telemetry.start("gemini", "gemini-2.5-flash")
+        record.chunk("a")
+        time.sleep(0.06)
+        record.chunk("b")
+        self.telemetry.finish(record, "ok")
+
+        self.assertEqual(record.stalls, 1)
+        self.assertGreaterEqual(record.max_gap, 0.05)
+        counts = self.telemetry.stats()["models"]["gemini/gemini-2.5-flash"]
+        self.assertEqual(counts["ok"], 1)
+        self.assertEqual(counts["stalled"], 1)
+
+    def test_active_streams_show_silence_only_after_the_slot_is_granted(self):
+        record = self.telemetry.start("ollama", "llama3")
+        self.assertFalse(self.telemetry.active()[0]["stalled"])  # Still queued
+        record.granted_at = time.perf_counter() - 0.1
+        self.assertTrue(self.telemetry.active()[0]["stalled"])
+        self.telemetry.finish(record, "cancelled")
+        self.assertEqual(self.telemetry.active(), [])
+
+    def test_cached_replays_do_not_skew_latency_samples(self):
+        record = self.telemetry.start("gemini", "m")
+        record.chunk("replayed")
+        self.telemetry.finish(record, "cached")
+        summary = self.telemetry.stats()["models"]["gemini/m"]
+        self.assertEqual(summary["cached"], 1)
+        self.assertIsNone(summary["ttft_ms"]["p50"])
+
+    def test_failover_is_attributed_to_the_serving_model(self):
+        record = self.telemetry.start("ollama", "llama3", meeting_id=7)
+        record.chunk("x")
+        self.telemetry.finish(record, "ok", "gemini", "gemini-2.5-flash")
+        self.assertIn("gemini/gemini-2.5-flash", self.telemetry.stats()["models"])
+        self.assertEqual(self.telemetry.recent(meeting_id=7)[0]["provider"], "gemini")
+        self.assertEqual(self.telemetry.recent(meeting_id=8), [])
+
+    def test_percentile(self):
+        values = [float(v) for v in range(1, 101)]
+        self.assertEqual(_percentile(values, 50), 50.0)
+        self.assertEqual(_percentile(values, 95), 95.0)
+        self.assertIsNone(_percentile([], 50))
+
+
+class FakeProvider:
+    async def stream(self, provider, model, request, notices):
+        for word in ("one", "two", "three"):
+            await asyncio.sleep(0.01)
+            yield word + " "
+
+
+class TestGenerateStreamTelemetry(unittest.TestCase):
+    def setUp(self):
+        for name, value in [("llm_cache_enabled", False), ("llm_fallback_provider", ""), ("llm_hedge_after_ms", 0)]:
+            patcher = patch.object(settings, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        telemetry = StreamTelemetry()
+        patcher = patch("app.services.llm_service.stream_telemetry", telemetry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(llm_resilience, "_breakers", {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.telemetry = telemetry
+        self.service = LLMService()
+
+    def consume(self, limit=None, **kwargs):
+        async def run():
+            parts = []
+            with patch.object(self.service, "_generate_provider_stream", FakeProvider().stream):
+                stream = self.service.generate_stream("hi", "sys", **kwargs)
+                async for chunk in stream:
+                    parts.append(chunk)
+                    if limit and len(parts) == limit:
+                        break
+                await stream.aclose()
+            return parts
+
+        return asyncio.run(run())
+
+    def test_records_completed_stream(self):
+        self.consume(provider="ollama", model="llama3", meeting_id=3, staff_id=9)
+        [recent] = self.telemetry.recent(staff_id=9)
+        self.assertEqual(recent["status"], "ok")
+        self.assertEqual(recent["chunks"], 3)
+        self.assertEqual(recent["meeting_id"], 3)
+        self.assertIsNotNone(recent["ttft_ms"])
+        self.assertEqual(self.telemetry.stats()["models"]["ollama/llama3"]["ok"], 1)
+
+    def test_records_abandoned_stream_as_cancelled(self):
+        self.consume(limit=1, provider="ollama", model="llama3")
+        self.assertEqual(self.telemetry.recent()[0]["status"], "cancelled")
+        self.assertEqual(self.telemetry.active(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+import PIL.Image
+
+from app.config import settings
+from app.services.token_counter import TokenCounter
+
+
+class TestTokenCounter(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(settings, "token_counter_use_tiktoken", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.counter = TokenCounter()
+
+    def test_estimator_is_used_without_tiktoken(self):
+        self.assertEqual(self.counter.tokenizer_name("gemini", "gemini-2.5-flash"), "estimate:gemini")
+        self.assertEqual(self.counter.count("", "gemini"), 0)
+        # "Hello" -> 2 pieces of ~4 chars, "," and "!" -> 1 each, "world" -> 2
+        self.assertEqual(self.counter.count("Hello, world!", "gemini"), 6)
+
+    def test_counts_are_memoized_by_content(self):
+        self.counter.count("same text", "ollama", "llama3")
+        self.counter.count("same text", "ollama", "llama3")
+        self.assertEqual(self.counter.counters, {"hits": 1, "misses": 1})
+
+    def test_encodings_never_load_on_the_event_loop(self):
+        loaded_on = []
+
+        class FakeEncoding:
+            def encode(self, text, disallowed_special=()):
+                return text.split()
+
+        def get_encoding(name):
+            loaded_on.append(threading.current_thread() is threading.main_thread())
+            return FakeEncoding()
+
+        async def run():
+            first = self.counter.tokenizer_name("ollama", "llama3")
+            self.counter.count("one two three", "ollama", "llama3")
+            while "cl100k_base" not in self.counter._encodings:
+                await asyncio.sleep(0.01)
+            return first, self.counter.tokenizer_name("ollama", "llama3")
+
+        with patch.object(settings, "token_counter_use_tiktoken", True), \
+                patch("app.services.token_counter.tiktoken.get_encoding", side_effect=get_encoding):
+            before, after = asyncio.run(run())
+            self.assertEqual((before, after), ("estimate:ollama", "tiktoken:cl100k_base"))
+            self.assertEqual(loaded_on, [False])
+
+            self.counter.warm()
+            self.assertEqual(set(self.counter._encodings), {"cl100k_base", "o200k_base"})
+            self.assertEqual(self.counter.count("one two three", "gemini"), 3)
+
+    def test_annotate_blocks(self):
+        blocks = [{"id": "a", "content": "one two three"}, {"id": "b", "content": ""}]
+        self.counter.annotate_blocks(blocks, "gemini")
+        self.assertGreater(blocks[0]["tokens"], 0)
+        self.assertEqual(blocks[1]["tokens"], 0)
+
+    def test_gemini_image_tiling(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            small = os.path.join(tmpdir, "small.png")
+            large = os.path.join(tmpdir, "large.png")
+            PIL.Image.new("RGB", (300, 300)).save(small)
+            PIL.Image.new("RGB", (1600, 800)).save(large)
+            self.assertEqual(self.counter.count_image(small, "gemini"), 258)
+            self.assertEqual(self.counter.count_image(large, "gemini"), 3 * 2 * 258)
+            self.assertEqual(self.counter.count_image(large, "ollama"), settings.image_tokens_ollama)
+
+    def test_large_images_are_priced_at_the_size_sent(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "scan.png")
+            PIL.Image.new("RGB", (4000, 2000)).save(path)
+            with patch.object(settings, "image_max_dim_gemini", 2048):
+                # Downscaled to 2048x1024 before sending: 3x2 tiles, not the original's 6x3
+                self.assertEqual(self.counter.count_image(path, "gemini"), 3 * 2 * 258)
+
+
+if __name__ == '__main__':
+    unittest.main()